@@ -0,0 +1,31 @@
+-- 009_stats_materialized_view.sql
+-- Precomputed registry statistics for /api/stats.
+-- One row per (state, source, facility_type, validation level) combination,
+-- so the API sums K small rows instead of scanning pharmacy_locations.
+
+begin;
+
+-- ---------------------------------------------------------------------------
+-- Materialized view: mv_pharmacy_stats
+-- ---------------------------------------------------------------------------
+
+create materialized view if not exists mv_pharmacy_stats as
+select
+    state,
+    coalesce(primary_source, 'Unknown')     as primary_source,
+    facility_type::text                     as facility_type,
+    current_validation_level::text          as current_validation_level,
+    count(*)::bigint                        as cnt
+from pharmacy_locations
+-- group by the selected expressions, so a NULL source and a literal
+-- 'Unknown' source fold into one row and the unique index below holds
+group by 1, 2, 3, 4;
+
+-- required for REFRESH MATERIALIZED VIEW CONCURRENTLY
+create unique index if not exists uq_mv_pharmacy_stats
+    on mv_pharmacy_stats (state, primary_source, facility_type, current_validation_level);
+
+comment on materialized view mv_pharmacy_stats is
+    'Pharmacy counts by state/source/type/level. Refreshed after bulk imports, regulator promotions, and (in the background) API writes.';
+
+commit;
@@ -0,0 +1,21 @@
+-- 010_list_filter_indexes.sql
+-- Indexes backing the /api/pharmacies and /api/geojson filters.
+-- The API compares state/lga case-insensitively with lower(col) = lower($1),
+-- which a plain btree on the raw column cannot serve.
+-- Name search (name ILIKE '%q%') is already covered by
+-- idx_pharmacy_locations_name_trgm from 001_core_schema.sql.
+
+begin;
+
+create index if not exists idx_pharmacy_locations_state_lower
+    on pharmacy_locations (lower(state));
+create index if not exists idx_pharmacy_locations_lga_lower
+    on pharmacy_locations (lower(state), lower(lga));
+create index if not exists idx_pharmacy_locations_source
+    on pharmacy_locations (primary_source);
+
+-- default list ordering (ORDER BY state, name) can walk this index
+create index if not exists idx_pharmacy_locations_state_name
+    on pharmacy_locations (state, name);
+
+commit;
@@ -0,0 +1,30 @@
+-- 011_contact_public_value.sql
+-- Redacted form of each contact, computed once at write time.
+-- Public-tier reads select contact_value_public instead of masking every
+-- row per request. The expressions mirror auth.redact_phone() and
+-- auth.redact_email() so DB and JSON fallback responses agree:
+--   phone: +2348012345678  -> +234****5678
+--   email: user@example.ng -> u***@example.ng
+
+begin;
+
+alter table contacts
+    add column if not exists contact_value_public text
+    generated always as (
+        case
+            when contact_value = '' then null
+            when contact_type = 'email' then
+                case
+                    when strpos(contact_value, '@') = 0 then '***'
+                    else left(split_part(contact_value, '@', 1), 1)
+                         || '***@' || substr(contact_value, strpos(contact_value, '@') + 1)
+                end
+            when length(contact_value) <= 4 then '****'
+            else left(contact_value, 4) || '****' || right(contact_value, 4)
+        end
+    ) stored;
+
+comment on column contacts.contact_value_public is
+    'Masked contact_value served to the public API tier (phone: first 4 + **** + last 4; email: first char + ***@domain).';
+
+commit;
@@ -2,20 +2,28 @@
 
 from .name_similarity import (
     compute_name_similarity,
+    compute_name_similarity_matrix,
     normalize_name,
+    make_name_scorer,
     quick_name_score,
     names_are_similar,
+    group_similar_names,
 )
 from .geo_proximity import (
     Coordinate,
     compute_geo_proximity,
     haversine_km,
+    haversine_km_batch,
     find_nearby_candidates,
+    build_geo_index,
+    find_nearby_candidates_indexed,
 )
 from .composite_scorer import (
     MatchResult,
+    PreparedRecord,
     ScorerConfig,
     compute_match,
+    prepare_record,
     score_candidate_pairs,
     normalize_phone,
     phone_match_score,
@@ -24,16 +32,24 @@ from .composite_scorer import (
 
 __all__ = [
     "compute_name_similarity",
+    "compute_name_similarity_matrix",
     "normalize_name",
+    "make_name_scorer",
     "quick_name_score",
     "names_are_similar",
+    "group_similar_names",
     "Coordinate",
     "compute_geo_proximity",
     "haversine_km",
+    "haversine_km_batch",
     "find_nearby_candidates",
+    "build_geo_index",
+    "find_nearby_candidates_indexed",
     "MatchResult",
+    "PreparedRecord",
     "ScorerConfig",
     "compute_match",
+    "prepare_record",
     "score_candidate_pairs",
     "normalize_phone",
     "phone_match_score",
@@ -15,16 +15,21 @@ Dependencies:
 
 from __future__ import annotations
 
+import os
 import re
 from dataclasses import dataclass, field
+from functools import lru_cache
 from pathlib import Path
-from typing import Any
+from typing import Any, NamedTuple
 
 import yaml
 
-from .name_similarity import compute_name_similarity
+from .name_similarity import compute_normalized_name_similarity, normalize_name
 from .geo_proximity import compute_geo_proximity
 
+# libyaml-backed loader when PyYAML was built with it (~10x faster parse)
+_YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 
 # ---------------------------------------------------------------------------
 # Defaults (overridden by merge_rules.yaml at runtime)
@@ -56,8 +61,8 @@ _DEFAULT_GEO = {
 
 _PHONE_STRIP = re.compile(r"[^0-9]")
 
-# Nigerian mobile prefixes after stripping country code
-_NG_MOBILE_RE = re.compile(r"^(?:\+?234|0)?(\d{10})$")
+# Nigerian forms once stripped to digits: 10-digit local, 0 + 10, 234 + 10
+_NG_PREFIX_BY_LEN = {10: "", 11: "0", 13: "234"}
 
 
 def normalize_phone(phone: str | None) -> str | None:
@@ -72,9 +77,10 @@ def normalize_phone(phone: str | None) -> str | None:
     if not phone:
         return None
     digits = _PHONE_STRIP.sub("", phone)
-    m = _NG_MOBILE_RE.match(digits)
-    if m:
-        return m.group(1)
+    # digits-only, so a length + prefix check replaces a second regex pass
+    prefix = _NG_PREFIX_BY_LEN.get(len(digits))
+    if prefix is not None and digits.startswith(prefix):
+        return digits[-10:]
     # If it doesn't match Nigerian pattern, return stripped digits as-is
     return digits if digits else None
 
@@ -88,9 +94,11 @@ def phone_match_score(phone_a: str | None, phone_b: str | None) -> float | None:
         0.0  — normalised numbers differ
         None — one or both phones missing (indeterminate)
     """
-    norm_a = normalize_phone(phone_a)
-    norm_b = normalize_phone(phone_b)
+    return _phone_match(normalize_phone(phone_a), normalize_phone(phone_b))
+
 
+def _phone_match(norm_a: str | None, norm_b: str | None) -> float | None:
+    """phone_match_score on numbers already passed through normalize_phone."""
     if norm_a is None or norm_b is None:
         return None
 
@@ -120,24 +128,33 @@ def external_id_overlap_score(
     A single matching regulator ID (PCN, NHIA, NAFDAC) is strong enough
     to drive an auto-merge on its own, handled via override rules.
     """
-    if not ids_a or not ids_b:
-        return None
+    return _external_id_overlap(
+        _normalize_external_ids(ids_a),
+        _normalize_external_ids(ids_b),
+    )
+
+
+# Identifier types whose match alone justifies an auto-merge
+_REGULATOR_ID_TYPES = frozenset({"pcn_registration", "nhia_facility", "nafdac_license"})
+
+
+def _normalize_external_ids(ids: dict[str, str] | None) -> dict[str, str]:
+    """Identifier values stripped and casefolded once, ready for == comparison."""
+    if not ids:
+        return {}
+    return {id_type: value.strip().casefold() for id_type, value in ids.items()}
 
-    common_types = set(ids_a.keys()) & set(ids_b.keys())
+
+def _external_id_overlap(norm_a: dict[str, str], norm_b: dict[str, str]) -> float | None:
+    """external_id_overlap_score on dicts from _normalize_external_ids."""
+    common_types = norm_a.keys() & norm_b.keys()
     if not common_types:
         return None
 
-    matches = 0
-    conflicts = 0
     for id_type in common_types:
-        if ids_a[id_type].strip().upper() == ids_b[id_type].strip().upper():
-            matches += 1
-        else:
-            conflicts += 1
-
-    if conflicts > 0:
-        # Any conflicting regulator ID is a strong negative signal
-        return 0.0
+        if norm_a[id_type] != norm_b[id_type]:
+            # Any conflicting regulator ID is a strong negative signal
+            return 0.0
 
     # All common types matched
     return 1.0
@@ -148,7 +165,14 @@ def external_id_overlap_score(
 # ---------------------------------------------------------------------------
 
 
-@dataclass
+@lru_cache(maxsize=8)
+def _load_yaml_cached(path: str, mtime_ns: int, size: int) -> dict[str, Any]:
+    """Parse a YAML file; keyed on mtime and size so edits are picked up."""
+    with open(path, "r") as f:
+        return yaml.load(f, Loader=_YamlLoader) or {}
+
+
+@dataclass(slots=True)
 class ScorerConfig:
     """Loaded scorer configuration from merge_rules.yaml."""
 
@@ -160,9 +184,15 @@ class ScorerConfig:
 
     @classmethod
     def from_yaml(cls, path: str | Path) -> "ScorerConfig":
-        """Load configuration from a YAML file."""
-        with open(path, "r") as f:
-            raw = yaml.safe_load(f)
+        """
+        Load configuration from a YAML file.
+
+        The parsed YAML is memoized per (absolute path, mtime, size); each
+        call still builds a fresh ScorerConfig, so callers may mutate it.
+        """
+        path = os.path.abspath(path)
+        st = os.stat(path)
+        raw = _load_yaml_cached(path, st.st_mtime_ns, st.st_size)
 
         weights = raw.get("weights", {})
         thresholds_raw = raw.get("thresholds", {})
@@ -199,9 +229,13 @@ class ScorerConfig:
 # ---------------------------------------------------------------------------
 
 
-@dataclass
+@dataclass(slots=True)
 class MatchResult:
-    """Detailed result of comparing two pharmacy records."""
+    """
+    Detailed result of comparing two pharmacy records.
+
+    Slotted: one is built per candidate pair, so no per-instance __dict__.
+    """
 
     record_a_id: str
     record_b_id: str
@@ -242,6 +276,77 @@ def _classify(confidence: float, thresholds: dict[str, float]) -> str:
     return "no_match"
 
 
+def _state_blocked(id_a: str, id_b: str) -> MatchResult:
+    """Result for a pair rejected by the same-state blocking rule."""
+    return MatchResult(
+        record_a_id=id_a,
+        record_b_id=id_b,
+        name_score=0.0,
+        geo_score=None,
+        geo_distance_km=None,
+        phone_score=None,
+        external_id_score=None,
+        lga_boost_applied=False,
+        match_confidence=0.0,
+        decision="no_match",
+        signals_used=[],
+        override_reason="different_state_blocked",
+    )
+
+
+class PreparedRecord(NamedTuple):
+    """A pharmacy record with every per-record normalisation done once."""
+
+    pharmacy_id: str
+    name: str                     # normalize_name(facility_name)
+    phone: str | None             # normalize_phone(phone)
+    external_ids: dict[str, str]  # _normalize_external_ids(external_identifiers)
+    latitude: float | None
+    longitude: float | None
+    state: str                    # stripped, lowercased
+    lga: str                      # stripped, lowercased
+
+
+def prepare_record(record: dict[str, Any]) -> PreparedRecord:
+    """Normalise the fields compute_match compares, for reuse across pairs."""
+    return PreparedRecord(
+        pharmacy_id=record.get("pharmacy_id", "unknown"),
+        name=normalize_name(record.get("facility_name", "")),
+        phone=normalize_phone(record.get("phone")),
+        external_ids=_normalize_external_ids(record.get("external_identifiers")),
+        latitude=record.get("latitude"),
+        longitude=record.get("longitude"),
+        state=_record_state(record),
+        lga=(record.get("lga") or "").strip().lower(),
+    )
+
+
+def _record_state(record: dict[str, Any]) -> str:
+    return (record.get("state") or "").strip().lower()
+
+
+def _check_state_block(
+    record_a: dict[str, Any],
+    record_b: dict[str, Any],
+    config: ScorerConfig,
+) -> MatchResult | None:
+    """
+    Blocking rule: different states → no match.
+
+    Runs on the raw records, before prepare_record, so a blocked pair
+    costs no name, phone or external-ID normalisation.
+    """
+    if config.same_state_required:
+        state_a = _record_state(record_a)
+        state_b = _record_state(record_b)
+        if state_a and state_b and state_a != state_b:
+            return _state_blocked(
+                record_a.get("pharmacy_id", "unknown"),
+                record_b.get("pharmacy_id", "unknown"),
+            )
+    return None
+
+
 def compute_match(
     record_a: dict[str, Any],
     record_b: dict[str, Any],
@@ -265,49 +370,39 @@ def compute_match(
     """
     if config is None:
         config = ScorerConfig()
+    blocked = _check_state_block(record_a, record_b, config)
+    if blocked is not None:
+        return blocked
+    return _match_prepared(prepare_record(record_a), prepare_record(record_b), config)
 
-    id_a = record_a.get("pharmacy_id", "unknown")
-    id_b = record_b.get("pharmacy_id", "unknown")
 
-    # ------------------------------------------------------------------
-    # Blocking rule: different states → no match (skip expensive scoring)
-    # ------------------------------------------------------------------
-    if config.same_state_required:
-        state_a = (record_a.get("state") or "").strip().lower()
-        state_b = (record_b.get("state") or "").strip().lower()
-        if state_a and state_b and state_a != state_b:
-            return MatchResult(
-                record_a_id=id_a,
-                record_b_id=id_b,
-                name_score=0.0,
-                geo_score=None,
-                geo_distance_km=None,
-                phone_score=None,
-                external_id_score=None,
-                lga_boost_applied=False,
-                match_confidence=0.0,
-                decision="no_match",
-                signals_used=[],
-                override_reason="different_state_blocked",
-            )
+def _match_prepared(
+    rec_a: PreparedRecord,
+    rec_b: PreparedRecord,
+    config: ScorerConfig,
+) -> MatchResult:
+    """
+    compute_match on records already passed through prepare_record.
+
+    Callers apply _check_state_block first, on the raw records.
+    """
+    id_a = rec_a.pharmacy_id
+    id_b = rec_b.pharmacy_id
 
     # ------------------------------------------------------------------
     # Signal 1: Name similarity
     # ------------------------------------------------------------------
-    name_result = compute_name_similarity(
-        record_a.get("facility_name", ""),
-        record_b.get("facility_name", ""),
-    )
+    name_result = compute_normalized_name_similarity(rec_a.name, rec_b.name)
     name_score = name_result["composite"]
 
     # ------------------------------------------------------------------
     # Signal 2: Geo proximity
     # ------------------------------------------------------------------
     geo_result = compute_geo_proximity(
-        record_a.get("latitude"),
-        record_a.get("longitude"),
-        record_b.get("latitude"),
-        record_b.get("longitude"),
+        rec_a.latitude,
+        rec_a.longitude,
+        rec_b.latitude,
+        rec_b.longitude,
         match_radius_km=config.geo["match_radius_km"],
         decay_radius_km=config.geo["decay_radius_km"],
     )
@@ -317,31 +412,21 @@ def compute_match(
     # ------------------------------------------------------------------
     # Signal 3: Phone matching
     # ------------------------------------------------------------------
-    phone_score = phone_match_score(
-        record_a.get("phone"),
-        record_b.get("phone"),
-    )
+    phone_score = _phone_match(rec_a.phone, rec_b.phone)
 
     # ------------------------------------------------------------------
     # Signal 4: External ID overlap
     # ------------------------------------------------------------------
-    ext_id_score = external_id_overlap_score(
-        record_a.get("external_identifiers"),
-        record_b.get("external_identifiers"),
-    )
+    ids_a = rec_a.external_ids
+    ids_b = rec_b.external_ids
+    ext_id_score = _external_id_overlap(ids_a, ids_b)
 
     # ------------------------------------------------------------------
     # Override: exact regulator ID match → auto-merge
     # ------------------------------------------------------------------
     if ext_id_score == 1.0:
-        ids_a = record_a.get("external_identifiers", {})
-        ids_b = record_b.get("external_identifiers", {})
-        regulator_types = {"pcn_registration", "nhia_facility", "nafdac_license"}
-        common_reg = regulator_types & set(ids_a.keys()) & set(ids_b.keys())
-        matching_reg = [
-            t for t in common_reg
-            if ids_a[t].strip().upper() == ids_b[t].strip().upper()
-        ]
+        # a 1.0 score means every shared type already matched
+        matching_reg = sorted(_REGULATOR_ID_TYPES & ids_a.keys() & ids_b.keys())
         if matching_reg:
             return MatchResult(
                 record_a_id=id_a,
@@ -426,9 +511,7 @@ def compute_match(
     # LGA boost: small bonus when records share the same LGA
     # ------------------------------------------------------------------
     lga_boost = False
-    lga_a = (record_a.get("lga") or "").strip().lower()
-    lga_b = (record_b.get("lga") or "").strip().lower()
-    if lga_a and lga_b and lga_a == lga_b:
+    if rec_a.lga and rec_a.lga == rec_b.lga:
         composite = min(1.0, composite + config.same_lga_boost)
         lga_boost = True
 
@@ -464,7 +547,37 @@ def score_candidate_pairs(
 
     Returns a list of MatchResult objects sorted by match_confidence
     descending.
+
+    The config is resolved once for the whole batch. A cross-state pair is
+    rejected on the raw records, before any normalisation; every other
+    record is normalised once (prepare_record) however many pairs it
+    appears in. Records are cached by pharmacy_id, so records sharing an
+    id are treated as the same record (e.g. a per-pair copy of one dict);
+    id-less records fall back to object identity.
     """
-    results = [compute_match(a, b, config) for a, b in pairs]
+    if config is None:
+        config = ScorerConfig()
+
+    # pharmacy_id (or id(rec) for id-less records) -> (rec, prepared); the
+    # identity entries hold rec so its id cannot be reused mid-batch
+    prepared: dict[Any, tuple[dict[str, Any], PreparedRecord]] = {}
+
+    def _prepared(rec: dict[str, Any]) -> PreparedRecord:
+        pid = rec.get("pharmacy_id")
+        key = ("pharmacy_id", pid) if pid else ("object", id(rec))
+        cached = prepared.get(key)
+        if cached is not None and (pid or cached[0] is rec):
+            return cached[1]
+        prep = prepare_record(rec)
+        prepared[key] = (rec, prep)
+        return prep
+
+    results: list[MatchResult] = []
+    for a, b in pairs:
+        blocked = _check_state_block(a, b, config)
+        if blocked is None:
+            results.append(_match_prepared(_prepared(a), _prepared(b), config))
+        else:
+            results.append(blocked)
     results.sort(key=lambda r: r.match_confidence, reverse=True)
     return results
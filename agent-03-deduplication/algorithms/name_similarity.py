@@ -6,6 +6,9 @@ Computes similarity scores between pharmacy/PPMV names using Levenshtein
 distance and token-sort ratio, with normalizations tuned for common
 Nigerian pharmacy naming patterns.
 
+normalize_name is memoized process-wide (NORMALIZE_CACHE_SIZE entries), so
+a facility that appears in many candidate pairs is normalised once.
+
 Dependencies:
     pip install rapidfuzz
 """
@@ -14,6 +17,8 @@ from __future__ import annotations
 
 import re
 import unicodedata
+from collections.abc import Callable
+from functools import lru_cache
 
 from rapidfuzz import fuzz
 from rapidfuzz.distance import Levenshtein
@@ -82,14 +87,26 @@ _ABBREVIATIONS: dict[str, str] = {
     "univ": "university",
 }
 
+# Accent stripping for Latin-1 and Latin Extended-A/B, built once from NFKD
+# so the table agrees with the generic path it short-circuits
+_ACCENT_MAP: dict[int, str] = {}
+for _cp in range(0xA0, 0x250):
+    _folded = "".join(
+        c for c in unicodedata.normalize("NFKD", chr(_cp)) if not unicodedata.combining(c)
+    )
+    if _folded != chr(_cp):
+        _ACCENT_MAP[_cp] = _folded
+del _cp, _folded
+
 _NOISE_RE = re.compile(
     "|".join(_STRIP_SUFFIXES + _STRIP_FACILITY_WORDS),
     re.IGNORECASE,
 )
-_MULTI_SPACE = re.compile(r"\s+")
+NORMALIZE_CACHE_SIZE = 131_072
 _NON_ALNUM = re.compile(r"[^a-z0-9\s]")
 
 
+@lru_cache(maxsize=NORMALIZE_CACHE_SIZE)
 def normalize_name(name: str) -> str:
     """
     Normalize a pharmacy name for comparison.
@@ -105,16 +122,11 @@ def normalize_name(name: str) -> str:
     if not name:
         return ""
 
-    # Unicode normalise — strip combining marks (accents)
-    text = unicodedata.normalize("NFKD", name)
-    text = "".join(c for c in text if not unicodedata.combining(c))
-
-    text = text.lower().strip()
+    text = name if name.isascii() else _strip_accents(name)
 
-    # Expand abbreviations (whole-word only)
-    tokens = text.split()
-    tokens = [_ABBREVIATIONS.get(t, t) for t in tokens]
-    text = " ".join(tokens)
+    # Lowercase and expand abbreviations (whole-word only); the split also
+    # trims the ends
+    text = " ".join([_ABBREVIATIONS.get(t, t) for t in text.lower().split()])
 
     # Strip noise patterns
     text = _NOISE_RE.sub(" ", text)
@@ -122,10 +134,18 @@ def normalize_name(name: str) -> str:
     # Remove remaining punctuation
     text = _NON_ALNUM.sub(" ", text)
 
-    # Collapse whitespace
-    text = _MULTI_SPACE.sub(" ", text).strip()
+    # Collapse whitespace and trim in one C-level split/join
+    return " ".join(text.split())
 
-    return text
+
+def _strip_accents(text: str) -> str:
+    """NFKD-fold text and drop combining marks, via _ACCENT_MAP where possible."""
+    text = text.translate(_ACCENT_MAP)
+    if text.isascii():
+        return text
+    # Codepoints outside the table (other scripts, stray combining marks)
+    text = unicodedata.normalize("NFKD", text)
+    return "".join(c for c in text if not unicodedata.combining(c))
 
 
 # ---------------------------------------------------------------------------
@@ -139,13 +159,12 @@ def levenshtein_similarity(a: str, b: str) -> float:
 
     Returns a value in [0.0, 1.0] where 1.0 means identical.
     """
-    if not a and not b:
+    if a == b:
         return 1.0
     if not a or not b:
         return 0.0
-    max_len = max(len(a), len(b))
-    dist = Levenshtein.distance(a, b)
-    return 1.0 - (dist / max_len)
+    # 1 - distance / max(len) in a single C call
+    return Levenshtein.normalized_similarity(a, b)
 
 
 def token_sort_similarity(a: str, b: str) -> float:
@@ -158,7 +177,7 @@ def token_sort_similarity(a: str, b: str) -> float:
 
     Returns a value in [0.0, 1.0].
     """
-    if not a and not b:
+    if a == b:
         return 1.0
     if not a or not b:
         return 0.0
@@ -174,7 +193,7 @@ def token_set_similarity(a: str, b: str) -> float:
 
     Returns a value in [0.0, 1.0].
     """
-    if not a and not b:
+    if a == b:
         return 1.0
     if not a or not b:
         return 0.0
@@ -216,14 +235,36 @@ def compute_name_similarity(
         - levenshtein: float [0–1]
         - token_sort: float [0–1]
         - token_set: float [0–1]
+          (a component with zero weight is skipped and reported as 0.0)
         - composite: weighted average float [0–1]
     """
-    norm_a = normalize_name(name_a)
-    norm_b = normalize_name(name_b)
+    return compute_normalized_name_similarity(
+        normalize_name(name_a),
+        normalize_name(name_b),
+        levenshtein_weight=levenshtein_weight,
+        token_sort_weight=token_sort_weight,
+        token_set_weight=token_set_weight,
+    )
+
+
+def compute_normalized_name_similarity(
+    norm_a: str,
+    norm_b: str,
+    *,
+    levenshtein_weight: float = 0.35,
+    token_sort_weight: float = 0.40,
+    token_set_weight: float = 0.25,
+) -> dict[str, float]:
+    """
+    compute_name_similarity for names already passed through normalize_name.
 
-    lev = levenshtein_similarity(norm_a, norm_b)
-    tsort = token_sort_similarity(norm_a, norm_b)
-    tset = token_set_similarity(norm_a, norm_b)
+    Lets batch callers normalise each record's name once rather than once
+    per pair it appears in.  A component whose weight is zero is not
+    computed and is reported as 0.0.
+    """
+    lev = levenshtein_similarity(norm_a, norm_b) if levenshtein_weight else 0.0
+    tsort = token_sort_similarity(norm_a, norm_b) if token_sort_weight else 0.0
+    tset = token_set_similarity(norm_a, norm_b) if token_set_weight else 0.0
 
     composite = (
         levenshtein_weight * lev
@@ -241,14 +282,86 @@ def compute_name_similarity(
     }
 
 
+def compute_name_similarity_matrix(
+    names_a: list[str],
+    names_b: list[str],
+    *,
+    levenshtein_weight: float = 0.35,
+    token_sort_weight: float = 0.40,
+    token_set_weight: float = 0.25,
+) -> list[list[float]]:
+    """
+    Composite name similarity for every (name_a, name_b) combination.
+
+    Returns a len(names_a) x len(names_b) list of rows, where
+    matrix[i][j] equals compute_name_similarity(names_a[i],
+    names_b[j])["composite"].  Each name is normalised once, and rows for
+    names_a entries that normalise identically are computed once.
+    """
+    norm_b = [normalize_name(name) for name in names_b]
+    rows: dict[str, list[float]] = {}
+    matrix: list[list[float]] = []
+    for name in names_a:
+        norm_a = normalize_name(name)
+        row = rows.get(norm_a)
+        if row is None:
+            row = rows[norm_a] = [
+                compute_normalized_name_similarity(
+                    norm_a,
+                    nb,
+                    levenshtein_weight=levenshtein_weight,
+                    token_sort_weight=token_sort_weight,
+                    token_set_weight=token_set_weight,
+                )["composite"]
+                for nb in norm_b
+            ]
+        matrix.append(list(row))
+    return matrix
+
+
 # ---------------------------------------------------------------------------
 # Convenience helpers
 # ---------------------------------------------------------------------------
 
 
+def make_name_scorer(
+    *,
+    levenshtein_weight: float = 0.35,
+    token_sort_weight: float = 0.40,
+    token_set_weight: float = 0.25,
+) -> Callable[[str, str], float]:
+    """
+    Build a composite-only scorer with the weights fixed up front.
+
+    The returned function takes two raw names and equals
+    compute_name_similarity(a, b, **weights)["composite"], but calls only
+    the scorers with a nonzero weight and builds no result dict — for hot
+    loops that score many pairs with one weight vector.
+    """
+    terms = tuple(
+        (weight, scorer)
+        for weight, scorer in (
+            (levenshtein_weight, levenshtein_similarity),
+            (token_sort_weight, token_sort_similarity),
+            (token_set_weight, token_set_similarity),
+        )
+        if weight
+    )
+
+    def score(name_a: str, name_b: str) -> float:
+        norm_a = normalize_name(name_a)
+        norm_b = normalize_name(name_b)
+        return round(sum(weight * scorer(norm_a, norm_b) for weight, scorer in terms), 4)
+
+    return score
+
+
+_default_scorer = make_name_scorer()
+
+
 def quick_name_score(name_a: str, name_b: str) -> float:
     """Return only the composite name similarity score (0.0–1.0)."""
-    return compute_name_similarity(name_a, name_b)["composite"]
+    return _default_scorer(name_a, name_b)
 
 
 def names_are_similar(
@@ -256,5 +369,67 @@ def names_are_similar(
     name_b: str,
     threshold: float = 0.70,
 ) -> bool:
-    """Return True if the two names exceed the similarity threshold."""
-    return quick_name_score(name_a, name_b) >= threshold
+    """
+    Return True if the two names exceed the similarity threshold.
+
+    Rejects early, without running any scorer, when the normalised lengths
+    alone cap the composite below the threshold.
+    """
+    return _normalized_names_similar(normalize_name(name_a), normalize_name(name_b), threshold)
+
+
+def _normalized_names_similar(norm_a: str, norm_b: str, threshold: float) -> bool:
+    if norm_a and norm_b and _length_bound(len(norm_a), len(norm_b)) < threshold:
+        return False
+    return compute_normalized_name_similarity(norm_a, norm_b)["composite"] >= threshold
+
+
+def _length_bound(len_a: int, len_b: int) -> float:
+    """
+    Upper bound on the default-weight composite from string lengths alone.
+
+    Levenshtein similarity is at most min/max (the length gap costs edits),
+    token-sort's Indel ratio at most 2*min/(len_a+len_b), and token-set can
+    reach 1.0 for a subset.  The slack covers the composite's 4dp rounding.
+    """
+    shorter, longer = sorted((len_a, len_b))
+    return (
+        0.35 * shorter / longer
+        + 0.40 * 2 * shorter / (shorter + longer)
+        + 0.25
+        + 5e-5
+    )
+
+
+def group_similar_names(names: list[str], threshold: float = 0.70) -> list[int]:
+    """
+    Cluster names into connected components of names_are_similar pairs.
+
+    Returns one group label per input name, numbered 0, 1, ... in order of
+    first appearance.  Grouping is transitive: if A~B and B~C then A, B and
+    C share a label even when A and C alone fall below the threshold.
+
+    Names are compared by their normalised form, each distinct form once,
+    and pairs already joined through another name are not re-scored.
+    """
+    norms = list(dict.fromkeys(normalize_name(name) for name in names))
+    parent = list(range(len(norms)))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]  # path halving
+            i = parent[i]
+        return i
+
+    for i, norm_a in enumerate(norms):
+        for j in range(i + 1, len(norms)):
+            root_a, root_b = find(i), find(j)
+            if root_a != root_b and _normalized_names_similar(norm_a, norms[j], threshold):
+                parent[root_b] = root_a
+
+    index = {norm: i for i, norm in enumerate(norms)}
+    labels: dict[int, int] = {}
+    return [
+        labels.setdefault(find(index[normalize_name(name)]), len(labels))
+        for name in names
+    ]
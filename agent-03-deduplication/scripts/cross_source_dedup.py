@@ -89,11 +89,12 @@ _bootstrap_imports()
 
 from agent_03_dedup.algorithms.composite_scorer import (  # noqa: E402
     ScorerConfig,
-    compute_match,
+    score_candidate_pairs,
 )
 from agent_03_dedup.algorithms.geo_proximity import (  # noqa: E402
     Coordinate,
-    find_nearby_candidates,
+    build_geo_index,
+    find_nearby_candidates_indexed,
 )
 
 
@@ -163,8 +164,8 @@ def find_cross_source_candidates(
     """
     Find candidate pairs from different sources within a state.
 
-    For each record, find nearby records from other sources using
-    bounding-box + Haversine filtering. Only generates each pair once.
+    For each record, find nearby records from other sources using a grid
+    index + Haversine filtering. Only generates each pair once.
     """
     by_source = group_by_source(state_records)
     sources = sorted(by_source.keys())
@@ -179,7 +180,7 @@ def find_cross_source_candidates(
     for i, src_a in enumerate(sources):
         for src_b in sources[i + 1:]:
             records_a = by_source[src_a]
-            records_b = by_source[src_b]
+            index_b = build_geo_index(by_source[src_b])
 
             for rec_a in records_a:
                 lat_a = rec_a.get("latitude")
@@ -190,9 +191,9 @@ def find_cross_source_candidates(
 
                 target = Coordinate(latitude=float(lat_a), longitude=float(lon_a))
 
-                nearby = find_nearby_candidates(
+                nearby = find_nearby_candidates_indexed(
                     target,
-                    records_b,
+                    index_b,
                     radius_km=search_radius_km,
                 )
 
@@ -206,7 +207,7 @@ def find_cross_source_candidates(
                         continue
                     seen_pairs.add(pair_key)
 
-                    # Clean up augmented fields from find_nearby_candidates
+                    # Clean up augmented fields from find_nearby_candidates_indexed
                     clean_b = {k: v for k, v in rec_b.items() if not k.startswith("_")}
                     pairs.append((rec_a, clean_b))
 
@@ -412,9 +413,8 @@ def main():
     reviews: list[dict] = []
     no_matches = 0
 
-    for rec_a, rec_b in all_candidates:
-        result = compute_match(rec_a, rec_b, config)
-
+    # Each record is normalised once per run; clean_b copies share its pharmacy_id
+    for result in score_candidate_pairs(all_candidates, config):
         if result.decision == "auto_merge":
             auto_merges.append(result.to_dict())
         elif result.decision == "review":
@@ -389,6 +389,14 @@ def main():
             cur.execute("SELECT count(*) FROM pharmacy_locations")
             total = cur.fetchone()[0]
         logger.info("Total pharmacy_locations: %d", total)
+
+        # /api/stats reads the precomputed view (009); bring it up to date
+        with conn.cursor() as cur:
+            cur.execute("SELECT to_regclass('mv_pharmacy_stats') IS NOT NULL")
+            if cur.fetchone()[0]:
+                cur.execute("REFRESH MATERIALIZED VIEW CONCURRENTLY mv_pharmacy_stats")
+                logger.info("Refreshed mv_pharmacy_stats")
+        conn.commit()
         logger.info("=" * 60)
 
     except Exception:
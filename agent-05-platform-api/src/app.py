@@ -25,6 +25,7 @@ from .auth import auth_middleware
 from .helpers import ROOT, load_all_canonical
 from .rate_limiter import rate_limit_middleware
 from .routes import audit, export, fhir, health, pharmacies, queue, regulator, sms, sms_webhooks_at, verification
+from .webhook_auth import webhook_secret_middleware
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
 logger = logging.getLogger(__name__)
@@ -46,9 +47,11 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Auth + rate limiting middleware (order matters: auth first, then rate limit)
+# Auth + rate limiting middleware (order matters: auth first, then rate limit,
+# then the SMS webhook secret check so bad callbacks never get their body read)
 # Starlette middleware executes in reverse registration order,
-# so we register rate_limit first (runs second) then auth (runs first).
+# so we register webhook_secret first (runs last) and auth last (runs first).
+app.middleware("http")(webhook_secret_middleware)
 app.middleware("http")(rate_limit_middleware)
 app.middleware("http")(auth_middleware)
 
@@ -87,6 +90,9 @@ async def startup():
         _ensure_verification_tasks_table()
         _ensure_regulator_staging_tables()
         _ensure_sms_campaigns_tables()
+        _ensure_stats_view()
+        _ensure_list_filter_indexes()
+        _ensure_contact_public_value()
     else:
         logger.info("Running in JSON FALLBACK mode")
 
@@ -195,3 +201,76 @@ def _ensure_sms_campaigns_tables():
             logger.warning("008_sms_campaigns.sql not found at %s", sql_path)
     except Exception as e:
         logger.warning("Could not ensure sms_campaigns tables: %s", e)
+
+
+def _ensure_stats_view():
+    """Run 009_stats_materialized_view.sql if the view doesn't exist yet."""
+    try:
+        with db.get_conn() as conn:
+            with conn.cursor() as cur:
+                cur.execute(
+                    "SELECT EXISTS (SELECT FROM pg_matviews WHERE matviewname = 'mv_pharmacy_stats')"
+                )
+                exists = cur.fetchone()[0]
+                if exists:
+                    return
+
+        sql_path = ROOT / "agent-01-data-architecture" / "sql" / "009_stats_materialized_view.sql"
+        if sql_path.exists():
+            with db.get_conn() as conn:
+                with conn.cursor() as cur:
+                    cur.execute(sql_path.read_text())
+            logger.info("Applied 009_stats_materialized_view.sql migration")
+        else:
+            logger.warning("009_stats_materialized_view.sql not found at %s", sql_path)
+    except Exception as e:
+        logger.warning("Could not ensure mv_pharmacy_stats view: %s", e)
+
+
+def _ensure_list_filter_indexes():
+    """Run 010_list_filter_indexes.sql if the indexes don't exist yet."""
+    try:
+        with db.get_conn() as conn:
+            with conn.cursor() as cur:
+                cur.execute(
+                    "SELECT EXISTS (SELECT FROM pg_indexes WHERE indexname = 'idx_pharmacy_locations_state_lower')"
+                )
+                exists = cur.fetchone()[0]
+                if exists:
+                    return
+
+        sql_path = ROOT / "agent-01-data-architecture" / "sql" / "010_list_filter_indexes.sql"
+        if sql_path.exists():
+            with db.get_conn() as conn:
+                with conn.cursor() as cur:
+                    cur.execute(sql_path.read_text())
+            logger.info("Applied 010_list_filter_indexes.sql migration")
+        else:
+            logger.warning("010_list_filter_indexes.sql not found at %s", sql_path)
+    except Exception as e:
+        logger.warning("Could not ensure list filter indexes: %s", e)
+
+
+def _ensure_contact_public_value():
+    """Run 011_contact_public_value.sql if contacts.contact_value_public doesn't exist yet."""
+    try:
+        with db.get_conn() as conn:
+            with conn.cursor() as cur:
+                cur.execute(
+                    "SELECT EXISTS (SELECT FROM information_schema.columns "
+                    "WHERE table_name = 'contacts' AND column_name = 'contact_value_public')"
+                )
+                exists = cur.fetchone()[0]
+                if exists:
+                    return
+
+        sql_path = ROOT / "agent-01-data-architecture" / "sql" / "011_contact_public_value.sql"
+        if sql_path.exists():
+            with db.get_conn() as conn:
+                with conn.cursor() as cur:
+                    cur.execute(sql_path.read_text())
+            logger.info("Applied 011_contact_public_value.sql migration")
+        else:
+            logger.warning("011_contact_public_value.sql not found at %s", sql_path)
+    except Exception as e:
+        logger.warning("Could not ensure contacts.contact_value_public column: %s", e)
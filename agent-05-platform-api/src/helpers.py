@@ -5,13 +5,15 @@ from __future__ import annotations
 import glob
 import json
 import logging
+import threading
+from collections import Counter
 from datetime import datetime
 from pathlib import Path
 from typing import Any
 
 from fastapi import HTTPException
 
-from . import db
+from . import db, response_cache
 from .db import extras
 
 logger = logging.getLogger(__name__)
@@ -74,6 +76,7 @@ def load_all_canonical() -> None:
     _RECORDS = unique
     _INDEX = {r["pharmacy_id"]: r for r in _RECORDS}
     logger.info("Total unique JSON records loaded: %d", len(_RECORDS))
+    response_cache.invalidate()
 
 
 def get_records() -> list[dict[str, Any]]:
@@ -130,16 +133,18 @@ DOWNGRADE_MAP = {
 # ---------------------------------------------------------------------------
 
 
+_LEVEL_LABELS = {
+    "L0_mapped": "Mapped",
+    "L1_contact_confirmed": "Contact Confirmed",
+    "L2_evidence_documented": "Evidence Documented",
+    "L3_regulator_verified": "Regulator Verified",
+    "L4_high_assurance": "High Assurance",
+}
+
+
 def level_label(level: str | None) -> str:
     """Human-readable label for a validation level."""
-    labels = {
-        "L0_mapped": "Mapped",
-        "L1_contact_confirmed": "Contact Confirmed",
-        "L2_evidence_documented": "Evidence Documented",
-        "L3_regulator_verified": "Regulator Verified",
-        "L4_high_assurance": "High Assurance",
-    }
-    return labels.get(level or "", level or "Unknown")
+    return _LEVEL_LABELS.get(level or "", level or "Unknown")
 
 
 def iso(dt) -> str | None:
@@ -208,8 +213,14 @@ def db_list_pharmacies(
     q: str | None,
     limit: int,
     offset: int,
+    redact_contacts: bool = False,
 ) -> dict | None:
-    """Query pharmacies from DB. Returns None if DB unavailable."""
+    """
+    Query pharmacies from DB. Returns None if DB unavailable.
+
+    With *redact_contacts* (public tier) the phone comes from the
+    precomputed contacts.contact_value_public column.
+    """
     if not db.is_available():
         return None
 
@@ -220,10 +231,10 @@ def db_list_pharmacies(
                 params: list[Any] = []
 
                 if state:
-                    conditions.append("pl.state ILIKE %s")
+                    conditions.append("lower(pl.state) = lower(%s)")
                     params.append(state)
                 if lga:
-                    conditions.append("pl.lga ILIKE %s")
+                    conditions.append("lower(pl.lga) = lower(%s)")
                     params.append(lga)
                 if facility_type:
                     conditions.append("pl.facility_type = %s::facility_type")
@@ -232,20 +243,22 @@ def db_list_pharmacies(
                     conditions.append("pl.primary_source = %s")
                     params.append(source_id)
                 if q:
+                    # served by the trigram GIN index (idx_pharmacy_locations_name_trgm)
                     conditions.append("pl.name ILIKE %s")
                     params.append(f"%{q}%")
 
                 where = (" WHERE " + " AND ".join(conditions)) if conditions else ""
+                phone_col = "c.contact_value_public" if redact_contacts else "c.contact_value"
 
-                cur.execute(f"SELECT count(*) FROM pharmacy_locations pl{where}", params)
-                total = cur.fetchone()["count"]
-
+                # count(*) OVER () is evaluated before LIMIT/OFFSET, so the page
+                # and the filtered total come back in a single round trip.
                 cur.execute(
                     f"""
                     SELECT pl.*,
                            ST_Y(pl.geolocation::geometry) AS latitude,
                            ST_X(pl.geolocation::geometry) AS longitude,
-                           c.contact_value AS phone
+                           {phone_col} AS phone,
+                           count(*) OVER () AS total_count
                     FROM pharmacy_locations pl
                     LEFT JOIN contacts c
                         ON c.pharmacy_id = pl.id
@@ -259,6 +272,15 @@ def db_list_pharmacies(
                 )
                 rows = cur.fetchall()
 
+                if rows:
+                    total = rows[0]["total_count"]
+                elif offset:
+                    # past the last page — no row carries the window count
+                    cur.execute(f"SELECT count(*) FROM pharmacy_locations pl{where}", params)
+                    total = cur.fetchone()["count"]
+                else:
+                    total = 0
+
         return {
             "meta": {"total": total, "limit": limit, "offset": offset},
             "data": [db_row_to_pharmacy(r) for r in rows],
@@ -327,67 +349,149 @@ def db_get_pharmacy(pharmacy_id: str) -> dict | None:
         return None
 
 
+# Per-combination counts; mv_pharmacy_stats (009) precomputes exactly this.
+_STATS_VIEW_SQL = """
+    SELECT state, primary_source, facility_type, current_validation_level, cnt
+    FROM mv_pharmacy_stats
+"""
+_STATS_LIVE_SQL = """
+    SELECT state,
+           coalesce(primary_source, 'Unknown') AS primary_source,
+           facility_type::text AS facility_type,
+           current_validation_level::text AS current_validation_level,
+           count(*) AS cnt
+    FROM pharmacy_locations
+    GROUP BY 1, 2, 3, 4
+"""
+
+# Single-record writes (verify, downgrade, verify-batch) refresh the view in
+# the background after this delay, so a burst of writes costs one refresh
+# and no stats read ever waits on one.
+STATS_REFRESH_DELAY = 30  # seconds
+_stats_refresh_timer: threading.Timer | None = None
+_stats_refresh_lock = threading.Lock()
+
+
+def _rollup_stats(rows) -> dict:
+    """Sum per-combination count rows into the /api/stats response shape."""
+    by_state: Counter = Counter()
+    by_source: Counter = Counter()
+    by_type: Counter = Counter()
+    by_level: Counter = Counter()
+    for r in rows:
+        cnt = r["cnt"]
+        by_state[r["state"]] += cnt
+        by_source[r["primary_source"]] += cnt
+        by_type[r["facility_type"]] += cnt
+        by_level[r["current_validation_level"]] += cnt
+
+    return {
+        "total": sum(by_state.values()),
+        "by_state": dict(by_state.most_common()),
+        "by_source": dict(by_source.most_common()),
+        "by_facility_type": dict(by_type.most_common()),
+        "by_validation_level": dict(by_level.most_common()),
+        "states_covered": len(by_state),
+    }
+
+
 def db_get_stats() -> dict | None:
-    """Aggregate stats from DB."""
+    """Aggregate stats from DB, read from mv_pharmacy_stats when it exists."""
     if not db.is_available():
         return None
 
     try:
         with db.get_conn() as conn:
             with conn.cursor(cursor_factory=extras.RealDictCursor) as cur:
-                cur.execute("SELECT count(*) AS total FROM pharmacy_locations")
-                total = cur.fetchone()["total"]
-
-                cur.execute(
-                    "SELECT state, count(*) AS cnt FROM pharmacy_locations GROUP BY state ORDER BY cnt DESC"
-                )
-                by_state = {r["state"]: r["cnt"] for r in cur.fetchall()}
+                cur.execute("SELECT to_regclass('mv_pharmacy_stats') IS NOT NULL AS has_view")
+                has_view = cur.fetchone()["has_view"]
+                cur.execute(_STATS_VIEW_SQL if has_view else _STATS_LIVE_SQL)
+                rows = cur.fetchall()
 
-                cur.execute(
-                    "SELECT primary_source, count(*) AS cnt FROM pharmacy_locations GROUP BY primary_source ORDER BY cnt DESC"
-                )
-                by_source = {r["primary_source"]: r["cnt"] for r in cur.fetchall()}
+        return _rollup_stats(rows)
+    except Exception as e:
+        logger.warning("DB stats failed: %s", e)
+        return None
 
-                cur.execute(
-                    "SELECT facility_type::text, count(*) AS cnt FROM pharmacy_locations GROUP BY facility_type ORDER BY cnt DESC"
-                )
-                by_type = {r["facility_type"]: r["cnt"] for r in cur.fetchall()}
 
-                cur.execute(
-                    "SELECT current_validation_level::text, count(*) AS cnt FROM pharmacy_locations GROUP BY current_validation_level ORDER BY cnt DESC"
-                )
-                by_level = {r["current_validation_level"]: r["cnt"] for r in cur.fetchall()}
+def refresh_stats_view() -> None:
+    """Refresh mv_pharmacy_stats after bulk writes.  Best-effort; logs on failure."""
+    if not db.is_available():
+        return
 
-        return {
-            "total": total,
-            "by_state": by_state,
-            "by_source": by_source,
-            "by_facility_type": by_type,
-            "by_validation_level": by_level,
-            "states_covered": len(by_state),
-        }
+    try:
+        with db.get_conn() as conn:
+            with conn.cursor(cursor_factory=extras.RealDictCursor) as cur:
+                cur.execute("SELECT to_regclass('mv_pharmacy_stats') IS NOT NULL AS has_view")
+                if cur.fetchone()["has_view"]:
+                    cur.execute("REFRESH MATERIALIZED VIEW CONCURRENTLY mv_pharmacy_stats")
     except Exception as e:
-        logger.warning("DB stats failed: %s", e)
-        return None
+        logger.warning("Could not refresh mv_pharmacy_stats: %s", e)
+    # /api/stats may have been cached from the pre-refresh view
+    response_cache.invalidate()
+
+
+def schedule_stats_refresh() -> None:
+    """
+    Refresh mv_pharmacy_stats on a background timer after a write.
+
+    Calls made while a refresh is already pending join it.  The pending
+    slot is cleared before the refresh runs, so a write that lands during
+    the refresh schedules another.
+    """
+    global _stats_refresh_timer  # noqa: PLW0603
+    if not db.is_available():
+        return
+    with _stats_refresh_lock:
+        if _stats_refresh_timer is not None:
+            return
+        timer = threading.Timer(STATS_REFRESH_DELAY, _run_scheduled_stats_refresh)
+        timer.daemon = True
+        _stats_refresh_timer = timer
+    timer.start()
+
+
+def _run_scheduled_stats_refresh() -> None:
+    global _stats_refresh_timer  # noqa: PLW0603
+    with _stats_refresh_lock:
+        _stats_refresh_timer = None
+    refresh_stats_view()
+
+
+# SQL mirror of level_label(), so the GeoJSON FeatureCollection can be
+# assembled entirely inside Postgres.
+_LEVEL_LABEL_SQL = (
+    "CASE pl.current_validation_level::text "
+    + " ".join(f"WHEN '{lvl}' THEN '{label}'" for lvl, label in _LEVEL_LABELS.items())
+    + " ELSE coalesce(pl.current_validation_level::text, 'Unknown') END"
+)
 
 
 def db_get_geojson(
     state: str | None,
     source_id: str | None,
     facility_type: str | None,
-) -> dict | None:
-    """GeoJSON FeatureCollection from DB."""
+    redact_contacts: bool = False,
+) -> str | None:
+    """
+    GeoJSON FeatureCollection from DB, serialized by Postgres.
+
+    Returns the JSON document as text so the route can send it without
+    building per-feature dicts.  Phones come from the precomputed
+    contacts.contact_value_public column when *redact_contacts* is set
+    (public tier).
+    """
     if not db.is_available():
         return None
 
     try:
         with db.get_conn() as conn:
-            with conn.cursor(cursor_factory=extras.RealDictCursor) as cur:
+            with conn.cursor() as cur:
                 conditions = ["pl.geolocation IS NOT NULL"]
                 params: list[Any] = []
 
                 if state:
-                    conditions.append("pl.state ILIKE %s")
+                    conditions.append("lower(pl.state) = lower(%s)")
                     params.append(state)
                 if source_id:
                     conditions.append("pl.primary_source = %s")
@@ -397,17 +501,30 @@ def db_get_geojson(
                     params.append(facility_type)
 
                 where = " WHERE " + " AND ".join(conditions)
+                # only the public tier needs the 011 column
+                phone_col = "c.contact_value_public" if redact_contacts else "c.contact_value"
 
                 cur.execute(
                     f"""
-                    SELECT pl.id, pl.name, pl.facility_type::text,
-                           pl.state, pl.lga, pl.primary_source,
-                           pl.current_validation_level::text,
-                           pl.operational_status::text,
-                           ST_Y(pl.geolocation::geometry) AS latitude,
-                           ST_X(pl.geolocation::geometry) AS longitude,
-                           c.contact_value AS phone,
-                           pl.address_line_1
+                    SELECT json_build_object(
+                        'type', 'FeatureCollection',
+                        'features', coalesce(json_agg(json_build_object(
+                            'type', 'Feature',
+                            'geometry', ST_AsGeoJSON(pl.geolocation::geometry)::json,
+                            'properties', json_build_object(
+                                'pharmacy_id', pl.id::text,
+                                'facility_name', pl.name,
+                                'facility_type', pl.facility_type::text,
+                                'state', pl.state,
+                                'lga', pl.lga,
+                                'source_id', pl.primary_source,
+                                'validation_label', {_LEVEL_LABEL_SQL},
+                                'operational_status', pl.operational_status::text,
+                                'phone', {phone_col},
+                                'address_line', pl.address_line_1
+                            )
+                        )), '[]'::json)
+                    )::text
                     FROM pharmacy_locations pl
                     LEFT JOIN contacts c
                         ON c.pharmacy_id = pl.id
@@ -417,28 +534,7 @@ def db_get_geojson(
                     """,
                     params,
                 )
-                rows = cur.fetchall()
-
-        features = []
-        for r in rows:
-            features.append({
-                "type": "Feature",
-                "geometry": {"type": "Point", "coordinates": [float(r["longitude"]), float(r["latitude"])]},
-                "properties": {
-                    "pharmacy_id": str(r["id"]),
-                    "facility_name": r["name"],
-                    "facility_type": r["facility_type"],
-                    "state": r["state"],
-                    "lga": r["lga"],
-                    "source_id": r["primary_source"],
-                    "validation_label": level_label(r["current_validation_level"]),
-                    "operational_status": r["operational_status"],
-                    "phone": r.get("phone"),
-                    "address_line": r.get("address_line_1"),
-                },
-            })
-
-        return {"type": "FeatureCollection", "features": features}
+                return cur.fetchone()[0]
     except Exception as e:
         logger.warning("DB geojson failed: %s", e)
         return None
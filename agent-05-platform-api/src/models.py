@@ -36,6 +36,26 @@ class VerifyRequest(BaseModel):
     )
 
 
+# Upper bound on items per POST /api/pharmacies/verify-batch
+MAX_BATCH_VERIFY = 100
+
+
+class BatchVerifyItem(VerifyRequest):
+    pharmacy_id: str = Field(
+        ...,
+        description="UUID of the pharmacy to verify",
+    )
+
+
+class BatchVerifyRequest(BaseModel):
+    items: list[BatchVerifyItem] = Field(
+        ...,
+        min_length=1,
+        max_length=MAX_BATCH_VERIFY,
+        description="Verifications to apply in one transaction",
+    )
+
+
 class TaskGenerateRequest(BaseModel):
     target_level: str = Field(
         ...,
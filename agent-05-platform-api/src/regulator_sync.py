@@ -28,6 +28,7 @@ from .helpers import (
     CROSSREF_MANUAL_REVIEW_THRESHOLD,
     ROOT,
     iso,
+    refresh_stats_view,
 )
 
 logger = logging.getLogger(__name__)
@@ -95,12 +96,32 @@ REGULATOR_COLUMN_MAP: dict[str, dict[str, list[str]]] = {
 # ---------------------------------------------------------------------------
 
 
-def _resolve_column(row: dict, candidates: list[str]) -> str | None:
-    """Return the value from the first matching column name, or None."""
-    for col in candidates:
-        val = row.get(col) or row.get(col.lower()) or row.get(col.upper())
-        if val is not None and str(val).strip():
-            return str(val).strip()
+def _column_lookup(header: list[str], candidates: list[str]) -> list[list[int]]:
+    """
+    Precompute header positions for a list of candidate column names.
+
+    One entry per candidate, holding the indices of the exact, lower- and
+    upper-case spellings present in the header, probed in that order
+    (last duplicate wins, as with csv.DictReader).
+    """
+    positions = {name: i for i, name in enumerate(header)}
+    return [
+        [positions[key] for key in (col, col.lower(), col.upper()) if key in positions]
+        for col in candidates
+    ]
+
+
+def _resolve_indexed(values: list[str], lookup: list[list[int]]) -> str | None:
+    """Return the stripped value of the first candidate column that is non-blank, or None."""
+    n = len(values)
+    for indices in lookup:
+        val = None
+        for i in indices:
+            if i < n and values[i]:
+                val = values[i]
+                break
+        if val is not None and val.strip():
+            return val.strip()
     return None
 
 
@@ -130,31 +151,52 @@ def parse_csv(file_content: bytes, regulator_source: str, max_records: int) -> l
         except UnicodeDecodeError:
             raise HTTPException(status_code=400, detail="Unable to decode CSV file")
 
-    reader = csv.DictReader(io.StringIO(text))
+    # csv.reader + one header lookup table instead of csv.DictReader, which
+    # builds a dict per row and re-probes three key spellings per field.
+    reader = csv.reader(io.StringIO(text))
+    header = next(reader, [])
+    width = len(header)
+    lookups = {
+        field: _column_lookup(header, col_map.get(field, []))
+        for field in ("name", "registration_id", "state", "lga", "address", "phone", "facility_category")
+    }
     records: list[dict] = []
 
-    for i, row in enumerate(reader):
+    i = 0
+    for values in reader:
+        if not values:
+            continue  # blank line (csv.DictReader skips these too)
         if i >= max_records:
             raise HTTPException(
                 status_code=400,
                 detail=f"CSV exceeds max_records limit ({max_records}). "
                 f"Split the file or increase the limit.",
             )
+        i += 1
 
-        raw_name = _resolve_column(row, col_map["name"])
+        raw_name = _resolve_indexed(values, lookups["name"])
         if not raw_name:
             continue  # skip rows without a name
 
+        # Same shape as a csv.DictReader row: short rows padded with None,
+        # surplus fields collected under the None key.
+        raw_data: dict = dict(zip(header, values))
+        if len(values) < width:
+            for key in header[len(values):]:
+                raw_data.setdefault(key, None)
+        elif len(values) > width:
+            raw_data[None] = values[width:]
+
         records.append(
             {
                 "raw_name": raw_name,
-                "raw_registration_id": _resolve_column(row, col_map["registration_id"]),
-                "raw_state": _resolve_column(row, col_map["state"]),
-                "raw_lga": _resolve_column(row, col_map.get("lga", [])),
-                "raw_address": _resolve_column(row, col_map.get("address", [])),
-                "raw_phone": _resolve_column(row, col_map.get("phone", [])),
-                "raw_facility_category": _resolve_column(row, col_map.get("facility_category", [])),
-                "raw_data": {k: v for k, v in row.items()},
+                "raw_registration_id": _resolve_indexed(values, lookups["registration_id"]),
+                "raw_state": _resolve_indexed(values, lookups["state"]),
+                "raw_lga": _resolve_indexed(values, lookups["lga"]),
+                "raw_address": _resolve_indexed(values, lookups["address"]),
+                "raw_phone": _resolve_indexed(values, lookups["phone"]),
+                "raw_facility_category": _resolve_indexed(values, lookups["facility_category"]),
+                "raw_data": raw_data,
             }
         )
 
@@ -221,40 +263,56 @@ def create_batch(
             return str(cur.fetchone()["id"])
 
 
+_STAGING_COPY_COLUMNS = (
+    "batch_id", "regulator_source", "raw_name", "raw_registration_id",
+    "raw_state", "raw_lga", "raw_address", "raw_phone",
+    "raw_facility_category", "raw_data", "created_by", "updated_by",
+)
+
+
+def _staging_copy_buffer(batch_id: str, records: list[dict], regulator_source: str, actor_id: str) -> io.StringIO:
+    """
+    Render staging rows as CSV for COPY ... FROM STDIN (FORMAT csv).
+
+    None is written as an unquoted empty field, which COPY reads as NULL.
+    parse_csv never yields empty strings for the raw_* fields, so no
+    value is lost to that mapping.
+    """
+    buf = io.StringIO()
+    writer = csv.writer(buf, lineterminator="\n")
+    writer.writerows(
+        (
+            batch_id,
+            regulator_source,
+            rec["raw_name"],
+            rec.get("raw_registration_id"),
+            rec.get("raw_state"),
+            rec.get("raw_lga"),
+            rec.get("raw_address"),
+            rec.get("raw_phone"),
+            rec.get("raw_facility_category"),
+            json.dumps(rec["raw_data"]),
+            actor_id,
+            actor_id,
+        )
+        for rec in records
+    )
+    buf.seek(0)
+    return buf
+
+
 def stage_records(batch_id: str, records: list[dict], regulator_source: str, actor_id: str) -> int:
     """
-    Insert parsed records into regulator_staging_records.
+    Bulk-load parsed records into regulator_staging_records with a single COPY.
     Returns count of records staged.
     """
+    buf = _staging_copy_buffer(batch_id, records, regulator_source, actor_id)
     with db.get_conn() as conn:
         with conn.cursor() as cur:
-            values = []
-            for rec in records:
-                values.append((
-                    batch_id,
-                    regulator_source,
-                    rec["raw_name"],
-                    rec.get("raw_registration_id"),
-                    rec.get("raw_state"),
-                    rec.get("raw_lga"),
-                    rec.get("raw_address"),
-                    rec.get("raw_phone"),
-                    rec.get("raw_facility_category"),
-                    json.dumps(rec["raw_data"]),
-                    actor_id,
-                    actor_id,
-                ))
-            extras.execute_batch(
-                cur,
-                """
-                INSERT INTO regulator_staging_records
-                    (batch_id, regulator_source, raw_name, raw_registration_id,
-                     raw_state, raw_lga, raw_address, raw_phone,
-                     raw_facility_category, raw_data, created_by, updated_by)
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                """,
-                values,
-                page_size=500,
+            cur.copy_expert(
+                f"COPY regulator_staging_records ({', '.join(_STAGING_COPY_COLUMNS)}) "
+                "FROM STDIN WITH (FORMAT csv)",
+                buf,
             )
     return len(records)
 
@@ -590,6 +648,9 @@ def approve_auto_matches(batch_id: str, actor_id: str, dry_run: bool = False) ->
                 (promoted, batch_id),
             )
 
+    if promoted:
+        refresh_stats_view()
+
     return {
         "promoted": promoted,
         "skipped": skipped,
@@ -0,0 +1,150 @@
+"""
+Nigeria Pharmacy Registry — In-Process Response Cache
+
+Caches the serialized bodies of the hot public read endpoints
+(/api/pharmacies, /api/stats, /api/geojson, /api/validation/summary,
+/api/validation/progress) so repeat map loads and dashboard refreshes skip
+the database and JSON serialization entirely.
+
+Every stored body gets a strong ETag and a Last-Modified date; get()
+answers a matching If-None-Match with 304. Endpoints whose body does not
+depend on the caller also pass a Cache-Control policy so browsers and
+proxies can reuse them.
+
+Keys: (path, sorted query params, auth tier). The tier is part of the key
+because contact redaction differs per tier — a public entry only ever holds
+redacted bodies and is never served to a higher tier, or vice versa.
+
+Invalidation: entries expire after CACHE_TTL seconds, and invalidate() bumps
+a global epoch and drops everything. An expired entry is kept for another
+STALE_TTL seconds: get() no longer returns it, but get_stale() does, so a
+handler whose recompute fails (database down, query error) can serve the
+last good body instead of an error. Write paths that change pharmacy
+records (verification, downgrade, regulator promotion, JSON reload) call it.
+A response computed under an older epoch is not stored, so a write that
+lands mid-request cannot be masked by a stale body.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+from email.utils import formatdate
+
+from fastapi import Request, Response
+
+CACHE_TTL = 300  # 5 minutes
+STALE_TTL = 3600  # how long past expiry an entry can still back get_stale()
+MAX_ENTRIES = 1024
+
+CacheKey = tuple[str, tuple[tuple[str, str], ...], str]
+
+# ---------------------------------------------------------------------------
+# Store
+# ---------------------------------------------------------------------------
+
+# key -> (body, media_type, cached_at, headers)
+_store: dict[CacheKey, tuple[bytes, str, float, dict[str, str]]] = {}
+_epoch = 0
+_lock = threading.Lock()
+
+
+def cache_key(request: Request, tier: str) -> CacheKey:
+    """Build the cache key for a request: path, sorted query items, tier."""
+    return (request.url.path, tuple(sorted(request.query_params.multi_items())), tier)
+
+
+def current_epoch() -> int:
+    """Epoch to capture before computing a response; pass it to put()."""
+    return _epoch
+
+
+def _etag(body: bytes) -> str:
+    return '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """RFC 9110 weak comparison against a (possibly comma-separated) If-None-Match."""
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag == "*" or tag.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+def _lookup(key: CacheKey, max_age: float) -> tuple[bytes, str, float, dict[str, str]] | None:
+    """Entry no older than max_age seconds; entries past the stale window are dropped."""
+    with _lock:
+        entry = _store.get(key)
+        if entry is None:
+            return None
+        age = time.time() - entry[2]
+        if age > CACHE_TTL + STALE_TTL:
+            del _store[key]
+            return None
+        return entry if age <= max_age else None
+
+
+def _respond(
+    entry: tuple[bytes, str, float, dict[str, str]],
+    if_none_match: str | None,
+) -> Response:
+    body, media_type, _, headers = entry
+    if if_none_match and _etag_matches(if_none_match, headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type=media_type, headers=headers)
+
+
+def get(key: CacheKey, if_none_match: str | None = None) -> Response | None:
+    """
+    Return a fresh Response for a cached body, or None on miss/expiry.
+
+    When if_none_match matches the stored ETag, the response is an empty 304.
+    """
+    entry = _lookup(key, CACHE_TTL)
+    return None if entry is None else _respond(entry, if_none_match)
+
+
+def get_stale(key: CacheKey, if_none_match: str | None = None) -> Response | None:
+    """
+    Like get(), but also returns an entry up to STALE_TTL seconds past expiry.
+
+    For handlers to fall back on when recomputing the response fails.
+    """
+    entry = _lookup(key, CACHE_TTL + STALE_TTL)
+    return None if entry is None else _respond(entry, if_none_match)
+
+
+def put(
+    key: CacheKey,
+    response: Response,
+    epoch: int,
+    *,
+    cache_control: str | None = None,
+) -> Response:
+    """Store a rendered response body and return the response with ETag, Last-Modified (and Cache-Control) set."""
+    if response.status_code != 200:
+        return response
+    body = bytes(response.body)
+    cached_at = time.time()
+    headers = {"ETag": _etag(body), "Last-Modified": formatdate(cached_at, usegmt=True)}
+    if cache_control:
+        headers["Cache-Control"] = cache_control
+    response.headers.update(headers)
+    with _lock:
+        if epoch != _epoch:
+            return response
+        if len(_store) >= MAX_ENTRIES and key not in _store:
+            # dicts keep insertion order — drop the oldest entry
+            del _store[next(iter(_store))]
+        _store[key] = (body, response.media_type or "application/json", cached_at, headers)
+    return response
+
+
+def invalidate() -> None:
+    """Drop all cached responses and reject in-flight stores from older epochs."""
+    global _epoch  # noqa: PLW0603
+    with _lock:
+        _epoch += 1
+        _store.clear()
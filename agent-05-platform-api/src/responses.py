@@ -0,0 +1,29 @@
+"""JSON response class backed by orjson."""
+
+from __future__ import annotations
+
+from decimal import Decimal
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+
+
+def _default(obj: Any) -> Any:
+    """Fallback encoder for types orjson doesn't handle natively (psycopg2 numerics)."""
+    if isinstance(obj, Decimal):
+        return float(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+class ORJSONResponse(JSONResponse):
+    """
+    Render plain dict/list content with orjson.
+
+    Return an instance from a handler to skip FastAPI's response-model
+    validation and encoding pass; the content must already be JSON-shaped
+    (datetimes and UUIDs are fine, orjson encodes them natively).
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
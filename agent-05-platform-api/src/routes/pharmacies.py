@@ -6,9 +6,9 @@ import logging
 from collections import Counter
 from typing import Any
 
-from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi import APIRouter, HTTPException, Query, Request, Response
 
-from .. import db
+from .. import db, response_cache
 from ..auth import ANONYMOUS, AuthContext, redact_contacts_in_response
 from ..db import extras
 from ..helpers import (
@@ -21,6 +21,7 @@ from ..helpers import (
     get_records,
     level_label,
 )
+from ..responses import ORJSONResponse
 
 logger = logging.getLogger(__name__)
 
@@ -37,14 +38,22 @@ async def list_pharmacies(
     q: str | None = Query(None, description="Search facility name (case-insensitive)"),
     limit: int = Query(100, ge=1, le=10000),
     offset: int = Query(0, ge=0),
-) -> dict[str, Any]:
+) -> Response:
     """List pharmacy records with optional filters. Contacts redacted for public tier."""
     auth: AuthContext = getattr(request.state, "auth", ANONYMOUS)
 
-    result = db_list_pharmacies(state, lga, facility_type, source_id, q, limit, offset)
+    key = response_cache.cache_key(request, auth.tier)
+    cached = response_cache.get(key, request.headers.get("if-none-match"))
+    if cached is not None:
+        return cached
+    epoch = response_cache.current_epoch()
+
+    result = db_list_pharmacies(
+        state, lga, facility_type, source_id, q, limit, offset,
+        redact_contacts=auth.tier == "public",
+    )
     if result is not None:
-        redact_contacts_in_response(result.get("data", []), auth)
-        return result
+        return response_cache.put(key, ORJSONResponse(result), epoch)
 
     # JSON fallback
     results = get_records()
@@ -65,13 +74,16 @@ async def list_pharmacies(
         results = [r for r in results if q_lower in (r.get("facility_name") or "").lower()]
 
     total = len(results)
-    page = [dict(r) for r in results[offset : offset + limit]]
-    redact_contacts_in_response(page, auth)
+    page = results[offset : offset + limit]
+    if auth.tier == "public":
+        # redaction mutates in place — copy so the shared records stay intact
+        page = [dict(r) for r in page]
+        redact_contacts_in_response(page, auth)
 
-    return {
+    return response_cache.put(key, ORJSONResponse({
         "meta": {"total": total, "limit": limit, "offset": offset},
         "data": page,
-    }
+    }), epoch)
 
 
 @router.get("/api/pharmacies/nearby")
@@ -92,16 +104,32 @@ async def nearby_pharmacies(
     try:
         with db.get_conn() as conn:
             with conn.cursor(cursor_factory=extras.RealDictCursor) as cur:
+                # Inlined rather than calling find_pharmacies_within_radius():
+                # the plpgsql function materializes every row in the radius
+                # before LIMIT applies, while here ST_DWithin and the KNN
+                # <-> ordering both use the GiST index and stop at LIMIT.
                 cur.execute(
                     """
-                    SELECT * FROM find_pharmacies_within_radius(%s, %s, %s)
+                    WITH center AS (
+                        SELECT ST_SetSRID(ST_MakePoint(%s, %s), 4326)::geography AS pt
+                    )
+                    SELECT pl.id, pl.name, pl.facility_type, pl.state, pl.lga,
+                           pl.current_validation_level, pl.operational_status,
+                           ST_Y(pl.geolocation::geometry) AS latitude,
+                           ST_X(pl.geolocation::geometry) AS longitude,
+                           round((ST_Distance(pl.geolocation, center.pt) / 1000.0)::numeric, 3)
+                               AS distance_km
+                    FROM pharmacy_locations pl, center
+                    WHERE pl.geolocation IS NOT NULL
+                      AND ST_DWithin(pl.geolocation, center.pt, %s)
+                    ORDER BY pl.geolocation <-> center.pt
                     LIMIT %s
                     """,
-                    (lat, lon, radius_km, limit),
+                    (lon, lat, radius_km * 1000, limit),
                 )
                 rows = cur.fetchall()
 
-        return {
+        return ORJSONResponse({
             "center": {"latitude": lat, "longitude": lon},
             "radius_km": radius_km,
             "count": len(rows),
@@ -120,7 +148,7 @@ async def nearby_pharmacies(
                 }
                 for r in rows
             ],
-        }
+        })
 
     except HTTPException:
         raise
@@ -130,7 +158,7 @@ async def nearby_pharmacies(
 
 
 @router.get("/api/pharmacies/{pharmacy_id}")
-async def get_pharmacy(request: Request, pharmacy_id: str) -> dict[str, Any]:
+async def get_pharmacy(request: Request, pharmacy_id: str) -> Response:
     """Get a single pharmacy record by ID. Contacts redacted for public tier."""
     auth: AuthContext = getattr(request.state, "auth", ANONYMOUS)
 
@@ -139,7 +167,7 @@ async def get_pharmacy(request: Request, pharmacy_id: str) -> dict[str, Any]:
         if result.get("data") is None:
             raise HTTPException(status_code=404, detail="Pharmacy not found")
         redact_contacts_in_response(result.get("data"), auth)
-        return result
+        return ORJSONResponse(result)
 
     # JSON fallback
     record = get_index().get(pharmacy_id)
@@ -147,24 +175,30 @@ async def get_pharmacy(request: Request, pharmacy_id: str) -> dict[str, Any]:
         raise HTTPException(status_code=404, detail="Pharmacy not found")
     data = dict(record)
     redact_contacts_in_response(data, auth)
-    return {"data": data}
+    return ORJSONResponse({"data": data})
 
 
-@router.get("/api/stats")
-async def get_stats() -> dict[str, Any]:
-    """Summary statistics for the registry."""
-    result = db_get_stats()
-    if result is not None:
-        return result
+# JSON fallback stats, keyed by the records list itself (identity + size) so a
+# reload (load_all_canonical rebinds _RECORDS) invalidates it.
+_fallback_stats: tuple[list[dict[str, Any]], int, dict[str, Any]] | None = None
+
+
+def _compute_fallback_stats(records: list[dict[str, Any]]) -> dict[str, Any]:
+    global _fallback_stats  # noqa: PLW0603
+
+    if (
+        _fallback_stats is not None
+        and _fallback_stats[0] is records
+        and _fallback_stats[1] == len(records)
+    ):
+        return _fallback_stats[2]
 
-    # JSON fallback
-    records = get_records()
     states = Counter(r.get("state") or "Unknown" for r in records)
     sources = Counter(r.get("source_id") or "Unknown" for r in records)
     types = Counter(r.get("facility_type") or "Unknown" for r in records)
     validation = Counter(r.get("validation_label") or "Unknown" for r in records)
 
-    return {
+    stats = {
         "total": len(records),
         "by_state": dict(states.most_common()),
         "by_source": dict(sources.most_common()),
@@ -172,6 +206,25 @@ async def get_stats() -> dict[str, Any]:
         "by_validation_level": dict(validation.most_common()),
         "states_covered": len(states),
     }
+    _fallback_stats = (records, len(records), stats)
+    return stats
+
+
+@router.get("/api/stats")
+async def get_stats(request: Request) -> Response:
+    """Summary statistics for the registry."""
+    key = response_cache.cache_key(request, "any")  # no contact data, shared across tiers
+    cached = response_cache.get(key, request.headers.get("if-none-match"))
+    if cached is not None:
+        return cached
+    epoch = response_cache.current_epoch()
+
+    result = db_get_stats()
+    if result is not None:
+        return response_cache.put(key, ORJSONResponse(result), epoch)
+
+    # JSON fallback
+    return response_cache.put(key, ORJSONResponse(_compute_fallback_stats(get_records())), epoch)
 
 
 @router.get("/api/geojson")
@@ -180,14 +233,19 @@ async def get_geojson(
     state: str | None = Query(None),
     source_id: str | None = Query(None),
     facility_type: str | None = Query(None),
-) -> dict[str, Any]:
+) -> Response:
     """Return records as GeoJSON FeatureCollection for map rendering. Contacts redacted for public."""
     auth: AuthContext = getattr(request.state, "auth", ANONYMOUS)
 
-    result = db_get_geojson(state, source_id, facility_type)
+    key = response_cache.cache_key(request, auth.tier)
+    cached = response_cache.get(key, request.headers.get("if-none-match"))
+    if cached is not None:
+        return cached
+    epoch = response_cache.current_epoch()
+
+    result = db_get_geojson(state, source_id, facility_type, redact_contacts=auth.tier == "public")
     if result is not None:
-        redact_contacts_in_response(result.get("features", []), auth)
-        return result
+        return response_cache.put(key, Response(content=result, media_type="application/json"), epoch)
 
     # JSON fallback
     results = get_records()
@@ -223,5 +281,8 @@ async def get_geojson(
                 "address_line": r.get("address_line"),
             },
         })
+    redact_contacts_in_response([f["properties"] for f in features], auth)
 
-    return {"type": "FeatureCollection", "features": features}
+    return response_cache.put(
+        key, ORJSONResponse({"type": "FeatureCollection", "features": features}), epoch
+    )
@@ -287,13 +287,13 @@ async def generate_queue(request: Request, req: TaskGenerateRequest):
         raise HTTPException(status_code=503, detail="Database unavailable")
 
     target = req.target_level
-    if target not in LEVEL_INDEX:
+    target_idx = LEVEL_INDEX.get(target)
+    if target_idx is None:
         raise HTTPException(
             status_code=400,
             detail=f"Invalid target_level '{target}'. Valid levels: {VALIDATION_LEVELS}",
         )
 
-    target_idx = LEVEL_INDEX[target]
     if target_idx == 0:
         raise HTTPException(status_code=400, detail="Cannot generate tasks for L0 — that's the initial state")
 
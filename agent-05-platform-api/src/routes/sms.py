@@ -4,16 +4,18 @@ from __future__ import annotations
 
 import json
 import logging
-import os
-from typing import Any
+from typing import Any, TypeVar
 
 from fastapi import APIRouter, Body, Depends, HTTPException, Query, Request
+from fastapi.exceptions import RequestValidationError
+from pydantic import BaseModel, ValidationError
 
 from .. import db
 from ..auth import ANONYMOUS, AuthContext, require_tier
 from ..db import extras
 from ..helpers import iso
 from ..models import SmsCampaignCreateRequest, SmsDeliveryWebhook, SmsReplyWebhook
+from ..responses import ORJSONResponse
 from ..sms_processor import (
     DEFAULT_MESSAGE_TEMPLATE,
     get_campaign_targets,
@@ -23,6 +25,7 @@ from ..sms_processor import (
     render_message,
     update_campaign_counts,
 )
+from ..webhook_auth import SMS_SECRET_DETAIL, sms_secret_ok
 
 logger = logging.getLogger(__name__)
 
@@ -35,11 +38,43 @@ router = APIRouter()
 
 
 def _require_webhook_secret(request: Request):
-    """Validate X-SMS-Webhook-Secret header against SMS_WEBHOOK_SECRET env var."""
-    webhook_secret = os.environ.get("SMS_WEBHOOK_SECRET", "")
-    provided = request.headers.get("X-SMS-Webhook-Secret", "")
-    if not webhook_secret or provided != webhook_secret:
-        raise HTTPException(status_code=401, detail="Invalid or missing webhook secret")
+    """
+    Validate X-SMS-Webhook-Secret header against SMS_WEBHOOK_SECRET env var.
+
+    webhook_secret_middleware already rejects bad secrets before the body is
+    parsed; this keeps the route safe if mounted without it.
+    """
+    if not sms_secret_ok(request.headers):
+        raise HTTPException(status_code=401, detail=SMS_SECRET_DETAIL)
+
+
+_WebhookModel = TypeVar("_WebhookModel", bound=BaseModel)
+
+
+async def _parse_webhook_body(request: Request, model: type[_WebhookModel]) -> _WebhookModel:
+    """
+    Decode and validate a webhook JSON body in one pass.
+
+    model_validate_json parses the raw bytes inside pydantic-core, skipping
+    the stdlib json.loads → dict → validate round trip FastAPI does for
+    body parameters.  Errors are re-raised as a normal 422.
+    """
+    body = await request.body()
+    try:
+        return model.model_validate_json(body)
+    except ValidationError as e:
+        errors = [{**err, "loc": ("body", *err["loc"])} for err in e.errors(include_url=False)]
+        raise RequestValidationError(errors, body=body)
+
+
+def _webhook_openapi(model: type[BaseModel]) -> dict[str, Any]:
+    """Document the JSON body of a webhook that reads it via _parse_webhook_body."""
+    return {
+        "requestBody": {
+            "required": True,
+            "content": {"application/json": {"schema": model.model_json_schema()}},
+        }
+    }
 
 
 def _require_db():
@@ -384,12 +419,11 @@ async def launch_campaign(request: Request, campaign_id: str):
             with conn.cursor(cursor_factory=extras.RealDictCursor) as cur:
                 values = []
                 for t in targets:
-                    msg_id = "placeholder"  # will use DB-generated UUID
                     rendered = render_message(
                         template,
                         t["pharmacy_name"],
                         t.get("address"),
-                        str(t["pharmacy_id"])[:8],
+                        t["pharmacy_id"],
                     )
                     values.append((
                         campaign_id,
@@ -685,7 +719,7 @@ async def retry_campaign(request: Request, campaign_id: str):
                         template,
                         t["pharmacy_name"],
                         t.get("pharmacy_address"),
-                        str(t["pharmacy_id"])[:8],
+                        t["pharmacy_id"],
                     )
                     cur.execute(
                         """
@@ -730,13 +764,15 @@ async def retry_campaign(request: Request, campaign_id: str):
 # ---------------------------------------------------------------------------
 
 
-@router.post("/api/sms/webhook/delivery")
-async def webhook_delivery(request: Request, payload: SmsDeliveryWebhook):
+@router.post("/api/sms/webhook/delivery", openapi_extra=_webhook_openapi(SmsDeliveryWebhook))
+async def webhook_delivery(request: Request):
     """Process delivery status reports from SMS provider. Auth: X-SMS-Webhook-Secret."""
     _require_webhook_secret(request)
-    return process_delivery_report(
+    _require_db()  # shed load during an outage before decoding the body
+    payload = await _parse_webhook_body(request, SmsDeliveryWebhook)
+    return ORJSONResponse(process_delivery_report(
         payload.provider_message_id, payload.status, payload.failure_reason
-    )
+    ))
 
 
 # ---------------------------------------------------------------------------
@@ -744,13 +780,15 @@ async def webhook_delivery(request: Request, payload: SmsDeliveryWebhook):
 # ---------------------------------------------------------------------------
 
 
-@router.post("/api/sms/webhook/reply")
-async def webhook_reply(request: Request, payload: SmsReplyWebhook):
+@router.post("/api/sms/webhook/reply", openapi_extra=_webhook_openapi(SmsReplyWebhook))
+async def webhook_reply(request: Request):
     """Process inbound SMS replies. Parses reply and auto-promotes to L1 if valid. Auth: X-SMS-Webhook-Secret."""
     _require_webhook_secret(request)
-    return process_inbound_reply(
+    _require_db()  # shed load during an outage before decoding the body
+    payload = await _parse_webhook_body(request, SmsReplyWebhook)
+    return ORJSONResponse(process_inbound_reply(
         payload.from_number, payload.message_text, payload.provider_message_id
-    )
+    ))
 
 
 # ---------------------------------------------------------------------------
@@ -8,11 +8,15 @@ shared processing functions in sms_processor.py.
 from __future__ import annotations
 
 import logging
-import os
+from typing import Any
+from urllib.parse import parse_qsl
 
-from fastapi import APIRouter, Form, HTTPException, Request
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.exceptions import RequestValidationError
 
+from ..responses import ORJSONResponse
 from ..sms_processor import process_delivery_report, process_inbound_reply
+from ..webhook_auth import AT_SECRET_DETAIL, at_secret_ok
 
 logger = logging.getLogger(__name__)
 
@@ -22,15 +26,23 @@ router = APIRouter()
 # AT status → internal status mapping
 # ---------------------------------------------------------------------------
 
-# Terminal statuses that we process
-_AT_STATUS_MAP: dict[str, str] = {
-    "Success": "delivered",
-    "Failed": "failed",
-    "Rejected": "failed",
+# AT status -> (internal status, is_intermediate). Intermediate statuses are
+# acknowledged and skipped (AT sends these before the final status).
+# One dict lookup per callback.
+_AT_DISPATCH: dict[str, tuple[str | None, bool]] = {
+    "Success": ("delivered", False),
+    "Failed": ("failed", False),
+    "Rejected": ("failed", False),
+    "Sent": (None, True),
+    "Buffered": (None, True),
+    "Submitted": (None, True),
 }
 
-# Intermediate statuses that we skip (AT sends these before final status)
-_AT_INTERMEDIATE = {"Sent", "Buffered", "Submitted"}
+# Derived views: terminal statuses that we process, and the skipped ones
+_AT_STATUS_MAP: dict[str, str] = {
+    k: internal for k, (internal, intermediate) in _AT_DISPATCH.items() if not intermediate
+}
+_AT_INTERMEDIATE = frozenset(k for k, (_, intermediate) in _AT_DISPATCH.items() if intermediate)
 
 
 # ---------------------------------------------------------------------------
@@ -44,14 +56,84 @@ def _require_at_webhook_secret(request: Request):
     If AT_WEBHOOK_SECRET is not set, webhook auth is bypassed (open mode).
     This allows Africa's Talking callbacks to work without a proxy that injects
     the header. Set AT_WEBHOOK_SECRET in production to enforce authentication.
+    webhook_secret_middleware runs the same check before the form is parsed.
     """
-    secret = os.environ.get("AT_WEBHOOK_SECRET", "")
-    if not secret:
-        # No secret configured — allow all requests (open mode)
-        return
-    provided = request.headers.get("X-AT-Webhook-Secret", "")
-    if provided != secret:
-        raise HTTPException(status_code=401, detail="Invalid or missing AT webhook secret")
+    if not at_secret_ok(request.headers):
+        raise HTTPException(status_code=401, detail=AT_SECRET_DETAIL)
+
+
+# ---------------------------------------------------------------------------
+# Form decoding
+# ---------------------------------------------------------------------------
+
+# field name -> (description, required)
+_DELIVERY_FIELDS: dict[str, tuple[str, bool]] = {
+    "id": ("AT message ID (ATXid_xxx)", True),
+    "status": ("AT delivery status", True),
+    "failureReason": ("Failure reason if failed", False),
+    "phoneNumber": ("Recipient phone number", False),
+}
+
+_REPLY_FIELDS: dict[str, tuple[str, bool]] = {
+    "from": ("Sender phone number", True),
+    "text": ("Message body", True),
+    "id": ("AT message ID", False),
+    "date": ("Timestamp from AT", False),
+    "linkId": ("AT link ID for premium SMS", False),
+}
+
+# AT sends at most a handful of keys; cap parsing of oversized junk bodies
+_MAX_FORM_FIELDS = 16
+
+
+async def _read_at_form(request: Request, fields: dict[str, tuple[str, bool]]) -> dict[str, str | None]:
+    """
+    Decode an AT urlencoded callback body with parse_qsl.
+
+    AT callbacks are a few short urlencoded keys, so a single parse_qsl call
+    replaces python-multipart's streaming form parser.  Mirrors Form()
+    semantics: an empty value counts as missing, missing required fields
+    raise a 422, missing optional fields come back as None.
+    """
+    body = await request.body()
+    try:
+        # latin-1 never fails; percent-escapes are decoded as UTF-8 by parse_qsl
+        pairs = parse_qsl(body.decode("latin-1"), max_num_fields=_MAX_FORM_FIELDS, encoding="utf-8")
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Too many form fields")
+    raw = dict(pairs)
+
+    values: dict[str, str | None] = {}
+    errors: list[dict[str, Any]] = []
+    for name, (_, required) in fields.items():
+        value = raw.get(name) or None
+        if value is None and required:
+            errors.append({"type": "missing", "loc": ("body", name), "msg": "Field required", "input": None})
+        values[name] = value
+    if errors:
+        raise RequestValidationError(errors)
+    return values
+
+
+def _form_openapi(fields: dict[str, tuple[str, bool]]) -> dict[str, Any]:
+    """Document an urlencoded body read via _read_at_form."""
+    return {
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/x-www-form-urlencoded": {
+                    "schema": {
+                        "type": "object",
+                        "properties": {
+                            name: {"type": "string", "description": desc}
+                            for name, (desc, _) in fields.items()
+                        },
+                        "required": [name for name, (_, req) in fields.items() if req],
+                    }
+                }
+            },
+        }
+    }
 
 
 # ---------------------------------------------------------------------------
@@ -59,14 +141,8 @@ def _require_at_webhook_secret(request: Request):
 # ---------------------------------------------------------------------------
 
 
-@router.post("/api/sms/at/delivery")
-async def at_delivery_webhook(
-    request: Request,
-    id: str = Form(..., description="AT message ID (ATXid_xxx)"),
-    status: str = Form(..., description="AT delivery status"),
-    failureReason: str | None = Form(None, description="Failure reason if failed"),
-    phoneNumber: str | None = Form(None, description="Recipient phone number"),
-):
+@router.post("/api/sms/at/delivery", openapi_extra=_form_openapi(_DELIVERY_FIELDS))
+async def at_delivery_webhook(request: Request):
     """
     Receive delivery status reports from Africa's Talking.
 
@@ -75,22 +151,26 @@ async def at_delivery_webhook(
     Intermediate statuses (Sent, Buffered) are acknowledged and skipped.
     """
     _require_at_webhook_secret(request)
-
-    # Skip intermediate statuses
-    if status in _AT_INTERMEDIATE:
-        return {"success": True, "skipped": True, "at_status": status}
+    form = await _read_at_form(request, _DELIVERY_FIELDS)
+    message_id = form["id"]
+    status = form["status"]
 
     # Map AT status to internal
-    internal_status = _AT_STATUS_MAP.get(status)
-    if internal_status is None:
-        logger.warning("Unknown AT delivery status: %s for message %s", status, id)
-        return {"success": False, "reason": "unknown_status", "at_status": status}
+    entry = _AT_DISPATCH.get(status)
+    if entry is None:
+        logger.warning("Unknown AT delivery status: %s for message %s", status, message_id)
+        return ORJSONResponse({"success": False, "reason": "unknown_status", "at_status": status})
+
+    internal_status, intermediate = entry
+    # Skip intermediate statuses
+    if intermediate:
+        return ORJSONResponse({"success": True, "skipped": True, "at_status": status})
 
-    return process_delivery_report(
-        provider_message_id=id,
+    return ORJSONResponse(process_delivery_report(
+        provider_message_id=message_id,
         status=internal_status,
-        failure_reason=failureReason,
-    )
+        failure_reason=form["failureReason"],
+    ))
 
 
 # ---------------------------------------------------------------------------
@@ -98,25 +178,18 @@ async def at_delivery_webhook(
 # ---------------------------------------------------------------------------
 
 
-@router.post("/api/sms/at/reply")
-async def at_reply_webhook(
-    request: Request,
-    # 'from' is a Python keyword, so we alias it
-    from_: str = Form(..., alias="from", description="Sender phone number"),
-    text: str = Form(..., description="Message body"),
-    id: str | None = Form(None, description="AT message ID"),
-    date: str | None = Form(None, description="Timestamp from AT"),
-    linkId: str | None = Form(None, description="AT link ID for premium SMS"),
-):
+@router.post("/api/sms/at/reply", openapi_extra=_form_openapi(_REPLY_FIELDS))
+async def at_reply_webhook(request: Request):
     """
     Receive inbound SMS replies from Africa's Talking.
 
     AT POSTs form-encoded data: from, text, id, date, linkId.
     """
     _require_at_webhook_secret(request)
+    form = await _read_at_form(request, _REPLY_FIELDS)
 
-    return process_inbound_reply(
-        from_number=from_,
-        message_text=text,
-        provider_message_id=id,
-    )
+    return ORJSONResponse(process_inbound_reply(
+        from_number=form["from"],
+        message_text=form["text"],
+        provider_message_id=form["id"],
+    ))
@@ -4,13 +4,14 @@ from __future__ import annotations
 
 import json
 import logging
+import uuid
 from collections import Counter
 from datetime import datetime, timedelta, timezone
-from typing import Any
+from typing import Any, Callable
 
-from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 
-from .. import db
+from .. import db, response_cache
 from ..auth import ANONYMOUS, AuthContext, require_tier
 from ..db import extras
 from ..evidence_validator import validate_evidence_detail
@@ -26,13 +27,43 @@ from ..helpers import (
     get_records,
     iso,
     level_label,
+    schedule_stats_refresh,
 )
-from ..models import DowngradeRequest, VerifyRequest
+from ..models import BatchVerifyItem, BatchVerifyRequest, DowngradeRequest, VerifyRequest
+from ..responses import ORJSONResponse
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Public dashboard counters: let browsers/proxies reuse them briefly
+VALIDATION_CACHE_CONTROL = "public, max-age=30, stale-while-revalidate=60"
+
+
+def _serve_validation_cached(request: Request, compute: Callable[..., ORJSONResponse]) -> Response:
+    """
+    Serve a public validation dashboard body through response_cache.
+
+    When an expired body is still held and recomputing fails (compute raises,
+    or its DB query errors), that body is served instead of an error or the
+    JSON fallback counts.
+    """
+    key = response_cache.cache_key(request, "any")  # same body for every tier
+    if_none_match = request.headers.get("if-none-match")
+    cached = response_cache.get(key, if_none_match)
+    if cached is not None:
+        return cached
+    epoch = response_cache.current_epoch()
+    stale = response_cache.get_stale(key, if_none_match)
+    try:
+        response = compute(db_error_fallback=stale is None)
+    except Exception:
+        if stale is None:
+            raise
+        logger.warning("Recomputing %s failed; serving stale body", request.url.path, exc_info=True)
+        return stale
+    return response_cache.put(key, response, epoch, cache_control=VALIDATION_CACHE_CONTROL)
+
 
 def execute_verification(pharmacy_id: str, req: VerifyRequest, auth: AuthContext) -> dict:
     """
@@ -48,8 +79,47 @@ def execute_verification(pharmacy_id: str, req: VerifyRequest, auth: AuthContext
             detail="Database unavailable — verification requires a database connection",
         )
 
+    target_idx, review_required = _check_verify_request(req)
+
+    try:
+        with db.get_conn() as conn:
+            with conn.cursor(cursor_factory=extras.RealDictCursor) as cur:
+                cur.execute(
+                    "SELECT current_validation_level::text FROM pharmacy_locations WHERE id = %s",
+                    (pharmacy_id,),
+                )
+                row = cur.fetchone()
+                if not row:
+                    raise HTTPException(status_code=404, detail="Pharmacy not found")
+
+                current_level = row["current_validation_level"]
+                _check_transition(current_level, target_idx, req)
+                (history_id,) = _record_verifications(
+                    cur, [(pharmacy_id, req, current_level)], auth,
+                    f"/api/pharmacies/{pharmacy_id}/verify",
+                )
+        response_cache.invalidate()
+        schedule_stats_refresh()
+
+        return _verification_result(pharmacy_id, current_level, req.target_level, history_id, review_required)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.exception("Verification failed for %s", pharmacy_id)
+        raise HTTPException(status_code=500, detail=f"Verification failed: {e}")
+
+
+def _check_verify_request(req: VerifyRequest) -> tuple[int, bool]:
+    """
+    Request-only checks (no DB): target level, required evidence, evidence
+    detail, regulator crossref threshold.
+
+    Returns (target level index, review_required). Raises HTTPException 400.
+    """
     target = req.target_level
-    if target not in LEVEL_INDEX:
+    target_idx = LEVEL_INDEX.get(target)
+    if target_idx is None:
         raise HTTPException(
             status_code=400,
             detail=f"Invalid target_level '{target}'. Valid levels: {VALIDATION_LEVELS}",
@@ -92,130 +162,271 @@ def execute_verification(pharmacy_id: str, req: VerifyRequest, auth: AuthContext
                 if score < CROSSREF_AUTO_APPROVE_THRESHOLD:
                     review_required = True
 
-    try:
-        with db.get_conn() as conn:
-            with conn.cursor(cursor_factory=extras.RealDictCursor) as cur:
-                cur.execute(
-                    "SELECT current_validation_level::text FROM pharmacy_locations WHERE id = %s",
-                    (pharmacy_id,),
-                )
-                row = cur.fetchone()
-                if not row:
-                    raise HTTPException(status_code=404, detail="Pharmacy not found")
+    return target_idx, review_required
 
-                current_level = row["current_validation_level"]
-                current_idx = LEVEL_INDEX.get(current_level, 0)
-                target_idx = LEVEL_INDEX[target]
-
-                if req.actor_type == "regulator_sync" and target == "L3_regulator_verified":
-                    if current_idx >= target_idx:
-                        raise HTTPException(
-                            status_code=400,
-                            detail=f"Cannot transition from {current_level} to {target} — already at or above target",
-                        )
-                elif target_idx != current_idx + 1:
-                    raise HTTPException(
-                        status_code=400,
-                        detail=f"Invalid transition: {current_level} → {target}. "
-                        f"Must advance one level at a time (next: {VALIDATION_LEVELS[current_idx + 1] if current_idx + 1 < len(VALIDATION_LEVELS) else 'max reached'})",
-                    )
 
-                evidence_ref = f"{req.evidence_type}:{req.capture_method or 'unspecified'}"
+def _check_transition(current_level: str, target_idx: int, req: VerifyRequest) -> None:
+    """Enforce one-step advancement (regulator_sync may jump to L3). Raises HTTPException 400."""
+    target = req.target_level
+    current_idx = LEVEL_INDEX.get(current_level, 0)
 
-                evidence_detail = req.evidence_detail or {}
-                evidence_detail["evidence_type"] = req.evidence_type
-                evidence_detail["capture_method"] = req.capture_method
-                evidence_detail["verified_at"] = datetime.now(timezone.utc).isoformat()
+    if req.actor_type == "regulator_sync" and target == "L3_regulator_verified":
+        if current_idx >= target_idx:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Cannot transition from {current_level} to {target} — already at or above target",
+            )
+    elif target_idx != current_idx + 1:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid transition: {current_level} → {target}. "
+            f"Must advance one level at a time (next: {VALIDATION_LEVELS[current_idx + 1] if current_idx + 1 < len(VALIDATION_LEVELS) else 'max reached'})",
+        )
 
-                cur.execute(
-                    """
-                    SELECT record_validation_change(
-                        %s::uuid, %s::validation_level,
-                        %s, %s,
-                        %s, %s, %s::jsonb
-                    ) AS history_id
-                    """,
-                    (
-                        pharmacy_id,
-                        target,
-                        req.actor_id,
-                        req.actor_type,
-                        evidence_ref,
-                        req.source_description,
-                        json.dumps(evidence_detail),
-                    ),
-                )
-                history_id = str(cur.fetchone()["history_id"])
 
-                cur.execute(
-                    """
-                    SELECT log_provenance(
-                        'pharmacy_location', %s::uuid, 'verify',
-                        %s, %s, NULL, NULL, NULL, %s::jsonb
-                    )
-                    """,
-                    (
-                        pharmacy_id,
-                        req.actor_id,
-                        req.actor_type,
-                        json.dumps({
-                            "old_level": current_level,
-                            "new_level": target,
-                            "evidence_type": req.evidence_type,
-                            "capture_method": req.capture_method,
-                            "history_id": history_id,
-                        }),
-                    ),
-                )
+def _record_verifications(
+    cur: Any,
+    changes: list[tuple[str, VerifyRequest, str]],
+    auth: AuthContext,
+    request_path: str,
+) -> list[str]:
+    """
+    Write the validation change, provenance and audit rows for each
+    (pharmacy_id, req, current_level).
 
-                cur.execute(
-                    """
-                    SELECT log_audit(
-                        'api_request', 'POST',
-                        %s, %s,
-                        'pharmacy_location', %s::uuid,
-                        %s, 'POST', NULL, 200, NULL,
-                        %s::jsonb
-                    )
-                    """,
-                    (
-                        auth.actor_id,
-                        auth.actor_type,
-                        pharmacy_id,
-                        f"/api/pharmacies/{pharmacy_id}/verify",
-                        json.dumps({
-                            "action": "verify",
-                            "old_level": current_level,
-                            "new_level": target,
-                        }),
-                    ),
-                )
+    Three set-based statements (unnest over per-change arrays) however many
+    changes there are. Returns the history ids in input order.
+    """
+    verified_at = datetime.now(timezone.utc).isoformat()
+    pharmacy_ids: list[str] = []
+    targets: list[str] = []
+    actor_ids: list[str] = []
+    actor_types: list[str] = []
+    evidence_refs: list[str] = []
+    source_descriptions: list[str | None] = []
+    evidence_details: list[str] = []
+    provenance_details: list[str] = []
+    audit_details: list[str] = []
+    for pharmacy_id, req, current_level in changes:
+        evidence_detail = req.evidence_detail or {}
+        evidence_detail["evidence_type"] = req.evidence_type
+        evidence_detail["capture_method"] = req.capture_method
+        evidence_detail["verified_at"] = verified_at
+
+        pharmacy_ids.append(pharmacy_id)
+        targets.append(req.target_level)
+        actor_ids.append(req.actor_id)
+        actor_types.append(req.actor_type)
+        evidence_refs.append(f"{req.evidence_type}:{req.capture_method or 'unspecified'}")
+        source_descriptions.append(req.source_description)
+        evidence_details.append(json.dumps(evidence_detail))
+        # history_id is added in SQL once record_validation_change has run
+        provenance_details.append(json.dumps({
+            "old_level": current_level,
+            "new_level": req.target_level,
+            "evidence_type": req.evidence_type,
+            "capture_method": req.capture_method,
+        }))
+        audit_details.append(json.dumps({
+            "action": "verify",
+            "old_level": current_level,
+            "new_level": req.target_level,
+        }))
+
+    cur.execute(
+        """
+        SELECT record_validation_change(
+            v.pharmacy_id, v.new_level,
+            v.actor_id, v.actor_type,
+            v.evidence_ref, v.source_description, v.evidence_detail
+        )::text AS history_id
+        FROM unnest(
+            %s::uuid[], %s::validation_level[],
+            %s::text[], %s::text[],
+            %s::text[], %s::text[], %s::jsonb[]
+        ) WITH ORDINALITY AS v(
+            pharmacy_id, new_level,
+            actor_id, actor_type,
+            evidence_ref, source_description, evidence_detail, ord
+        )
+        ORDER BY v.ord
+        """,
+        (
+            pharmacy_ids,
+            targets,
+            actor_ids,
+            actor_types,
+            evidence_refs,
+            source_descriptions,
+            evidence_details,
+        ),
+    )
+    history_ids = [str(r["history_id"]) for r in cur.fetchall()]
+
+    cur.execute(
+        """
+        SELECT log_provenance(
+            'pharmacy_location', v.pharmacy_id, 'verify',
+            v.actor_id, v.actor_type, NULL, NULL, NULL,
+            v.detail || jsonb_build_object('history_id', v.history_id)
+        )
+        FROM unnest(
+            %s::uuid[], %s::text[], %s::text[], %s::jsonb[], %s::text[]
+        ) AS v(pharmacy_id, actor_id, actor_type, detail, history_id)
+        """,
+        (pharmacy_ids, actor_ids, actor_types, provenance_details, history_ids),
+    )
+
+    cur.execute(
+        """
+        SELECT log_audit(
+            'api_request', 'POST',
+            %s, %s,
+            'pharmacy_location', v.pharmacy_id,
+            %s, 'POST', NULL, 200, NULL,
+            v.detail
+        )
+        FROM unnest(%s::uuid[], %s::jsonb[]) AS v(pharmacy_id, detail)
+        """,
+        (
+            auth.actor_id,
+            auth.actor_type,
+            request_path,
+            pharmacy_ids,
+            audit_details,
+        ),
+    )
+    return history_ids
+
+
+def _verification_result(
+    pharmacy_id: str,
+    current_level: str,
+    target: str,
+    history_id: str,
+    review_required: bool,
+) -> dict:
+    """Success payload, including the re-verification expiry."""
+    now = datetime.now(timezone.utc)
+    interval_days = REVERIFICATION_INTERVALS.get(target, 365)
+    expires_at = now + timedelta(days=interval_days)
+
+    result = {
+        "success": True,
+        "pharmacy_id": pharmacy_id,
+        "old_level": current_level,
+        "new_level": target,
+        "history_id": history_id,
+        "message": f"Pharmacy advanced from {level_label(current_level)} to {level_label(target)}",
+        "expires_at": expires_at.isoformat(),
+        "reverification_due_at": (expires_at - timedelta(days=GRACE_PERIOD_DAYS)).isoformat(),
+    }
+    if review_required:
+        result["review_required"] = True
+    return result
 
-        # Compute re-verification expiry
-        now = datetime.now(timezone.utc)
-        interval_days = REVERIFICATION_INTERVALS.get(target, 365)
-        expires_at = now + timedelta(days=interval_days)
 
-        result = {
-            "success": True,
-            "pharmacy_id": pharmacy_id,
-            "old_level": current_level,
-            "new_level": target,
-            "history_id": history_id,
-            "message": f"Pharmacy advanced from {level_label(current_level)} to {level_label(target)}",
-            "expires_at": expires_at.isoformat(),
-            "reverification_due_at": (expires_at - timedelta(days=GRACE_PERIOD_DAYS)).isoformat(),
-        }
-        if review_required:
-            result["review_required"] = True
-        return result
+def _batch_failure(pharmacy_id: str, exc: HTTPException) -> dict:
+    return {
+        "success": False,
+        "pharmacy_id": pharmacy_id,
+        "status_code": exc.status_code,
+        "detail": exc.detail,
+    }
 
-    except HTTPException:
-        raise
+
+def execute_verification_batch(items: list[BatchVerifyItem], auth: AuthContext) -> dict:
+    """
+    Verify many pharmacies in one transaction: one level lookup, then the
+    accepted changes written together by _record_verifications.
+
+    Each item gets the same checks as execute_verification; an item that
+    fails them is reported in its result slot (success=False, status_code,
+    detail) and the rest still apply. Raises HTTPException only for
+    batch-wide failures (no DB, database error — nothing is written).
+    """
+    if not db.is_available():
+        raise HTTPException(
+            status_code=503,
+            detail="Database unavailable — verification requires a database connection",
+        )
+
+    results: list[dict | None] = [None] * len(items)
+    # (item position, canonical uuid, target_idx, review_required)
+    pending: list[tuple[int, str, int, bool]] = []
+    seen: set[str] = set()
+    for pos, item in enumerate(items):
+        try:
+            try:
+                key = str(uuid.UUID(item.pharmacy_id))
+            except ValueError:
+                raise HTTPException(status_code=404, detail="Pharmacy not found")
+            if key in seen:
+                raise HTTPException(status_code=400, detail="Duplicate pharmacy_id in batch")
+            seen.add(key)
+            target_idx, review_required = _check_verify_request(item)
+        except HTTPException as exc:
+            results[pos] = _batch_failure(item.pharmacy_id, exc)
+            continue
+        pending.append((pos, key, target_idx, review_required))
+
+    # (item position, canonical uuid, current level, review_required)
+    accepted: list[tuple[int, str, str, bool]] = []
+    history_ids: list[str] = []
+    try:
+        if pending:
+            with db.get_conn() as conn:
+                with conn.cursor(cursor_factory=extras.RealDictCursor) as cur:
+                    cur.execute(
+                        """
+                        SELECT id::text AS id, current_validation_level::text AS level
+                        FROM pharmacy_locations
+                        WHERE id = ANY(%s::uuid[])
+                        """,
+                        ([key for _, key, _, _ in pending],),
+                    )
+                    current = {r["id"]: r["level"] for r in cur.fetchall()}
+
+                    for pos, key, target_idx, review_required in pending:
+                        item = items[pos]
+                        current_level = current.get(key)
+                        try:
+                            if current_level is None:
+                                raise HTTPException(status_code=404, detail="Pharmacy not found")
+                            _check_transition(current_level, target_idx, item)
+                        except HTTPException as exc:
+                            results[pos] = _batch_failure(item.pharmacy_id, exc)
+                            continue
+                        accepted.append((pos, key, current_level, review_required))
+
+                    if accepted:
+                        history_ids = _record_verifications(
+                            cur,
+                            [(key, items[pos], level) for pos, key, level, _ in accepted],
+                            auth,
+                            "/api/pharmacies/verify-batch",
+                        )
     except Exception as e:
-        logger.exception("Verification failed for %s", pharmacy_id)
+        logger.exception("Batch verification failed")
         raise HTTPException(status_code=500, detail=f"Verification failed: {e}")
 
+    for (pos, _, current_level, review_required), history_id in zip(accepted, history_ids):
+        results[pos] = _verification_result(
+            items[pos].pharmacy_id, current_level, items[pos].target_level, history_id, review_required,
+        )
+    applied = len(accepted)
+
+    if applied:
+        response_cache.invalidate()
+        schedule_stats_refresh()
+
+    return {
+        "total": len(items),
+        "succeeded": applied,
+        "failed": len(items) - applied,
+        "results": results,
+    }
+
 
 @router.post(
     "/api/pharmacies/{pharmacy_id}/verify",
@@ -227,6 +438,16 @@ async def verify_pharmacy(request: Request, pharmacy_id: str, req: VerifyRequest
     return execute_verification(pharmacy_id, req, auth)
 
 
+@router.post(
+    "/api/pharmacies/verify-batch",
+    dependencies=[Depends(require_tier("registry_write"))],
+)
+async def verify_pharmacies_batch(request: Request, req: BatchVerifyRequest):
+    """Advance up to MAX_BATCH_VERIFY pharmacies in one transaction. Requires: registry_write."""
+    auth: AuthContext = getattr(request.state, "auth", ANONYMOUS)
+    return execute_verification_batch(req.items, auth)
+
+
 @router.get(
     "/api/pharmacies/{pharmacy_id}/validation-history",
     dependencies=[Depends(require_tier("registry_read"))],
@@ -288,9 +509,35 @@ async def get_validation_history(pharmacy_id: str):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+# JSON fallback level counts, keyed by the records list itself (identity +
+# size) so a reload (load_all_canonical rebinds _RECORDS) invalidates it.
+_fallback_levels: tuple[list[dict[str, Any]], int, dict[str, int]] | None = None
+
+
+def _fallback_level_counts(records: list[dict[str, Any]]) -> dict[str, int]:
+    """Record count per validation level, sorted by level."""
+    global _fallback_levels  # noqa: PLW0603
+
+    if (
+        _fallback_levels is not None
+        and _fallback_levels[0] is records
+        and _fallback_levels[1] == len(records)
+    ):
+        return _fallback_levels[2]
+
+    levels = Counter(r.get("validation_level", "L0_mapped") for r in records)
+    by_level = dict(sorted(levels.items()))
+    _fallback_levels = (records, len(records), by_level)
+    return by_level
+
+
 @router.get("/api/validation/summary")
-async def get_validation_summary():
+async def get_validation_summary(request: Request):
     """Count records at each validation level. Works in both DB and JSON modes."""
+    return _serve_validation_cached(request, _validation_summary)
+
+
+def _validation_summary(*, db_error_fallback: bool = True) -> ORJSONResponse:
     if db.is_available():
         try:
             with db.get_conn() as conn:
@@ -307,7 +554,7 @@ async def get_validation_summary():
                     rows = cur.fetchall()
 
             total = sum(r["count"] for r in rows)
-            return {
+            return ORJSONResponse({
                 "total": total,
                 "mode": "database",
                 "levels": [
@@ -319,15 +566,17 @@ async def get_validation_summary():
                     }
                     for r in rows
                 ],
-            }
+            })
         except Exception as e:
+            if not db_error_fallback:
+                raise
             logger.warning("DB validation summary failed: %s", e)
 
     # JSON fallback
     records = get_records()
-    levels = Counter(r.get("validation_level", "L0_mapped") for r in records)
+    levels = _fallback_level_counts(records)
     total = len(records)
-    return {
+    return ORJSONResponse({
         "total": total,
         "mode": "json_fallback",
         "levels": [
@@ -337,9 +586,9 @@ async def get_validation_summary():
                 "count": cnt,
                 "percentage": round(cnt / total * 100, 1) if total > 0 else 0,
             }
-            for lvl, cnt in sorted(levels.items())
+            for lvl, cnt in levels.items()
         ],
-    }
+    })
 
 
 @router.get(
@@ -401,14 +650,14 @@ async def get_expiry_report():
                         else:
                             healthy_count += 1
 
-        return {
+        return ORJSONResponse({
             "generated_at": now.isoformat(),
             "expired_count": len(expired),
             "expired": expired,
             "expiring_soon_count": len(expiring_soon),
             "expiring_soon": expiring_soon,
             "healthy_count": healthy_count,
-        }
+        })
 
     except HTTPException:
         raise
@@ -518,6 +767,8 @@ def execute_downgrade(pharmacy_id: str, reason: str, actor_id: str) -> dict:
                         }),
                     ),
                 )
+        response_cache.invalidate()
+        schedule_stats_refresh()
 
         return {
             "success": True,
@@ -550,8 +801,12 @@ async def downgrade_pharmacy(pharmacy_id: str, req: DowngradeRequest):
 
 
 @router.get("/api/validation/progress")
-async def get_validation_progress():
+async def get_validation_progress(request: Request):
     """Verification funnel progress. Public access. Works in both DB and JSON modes."""
+    return _serve_validation_cached(request, _validation_progress)
+
+
+def _validation_progress(*, db_error_fallback: bool = True) -> ORJSONResponse:
     if db.is_available():
         try:
             now = datetime.now(timezone.utc)
@@ -573,23 +828,31 @@ async def get_validation_progress():
                     l0_count = by_level.get("L0_mapped", 0)
                     verified_above_l0 = total - l0_count
 
-                    # Recent verification activity
-                    activity = {}
-                    for days, label in [(7, "last_7_days"), (30, "last_30_days"), (90, "last_90_days")]:
-                        cutoff = now - timedelta(days=days)
-                        cur.execute(
-                            "SELECT count(*) AS cnt FROM validation_status_history WHERE changed_at > %s",
-                            (cutoff,),
-                        )
-                        activity[label] = cur.fetchone()["cnt"]
-
-                    # Pending tasks
+                    # Recent verification activity + pending tasks in one round trip
                     cur.execute(
-                        "SELECT count(*) AS cnt FROM verification_tasks WHERE status IN ('pending', 'assigned')"
+                        """
+                        SELECT count(*) FILTER (WHERE changed_at > %(d7)s)  AS last_7_days,
+                               count(*) FILTER (WHERE changed_at > %(d30)s) AS last_30_days,
+                               count(*)                                     AS last_90_days,
+                               (SELECT count(*) FROM verification_tasks
+                                WHERE status IN ('pending', 'assigned'))    AS pending_tasks
+                        FROM validation_status_history
+                        WHERE changed_at > %(d90)s
+                        """,
+                        {
+                            "d7": now - timedelta(days=7),
+                            "d30": now - timedelta(days=30),
+                            "d90": now - timedelta(days=90),
+                        },
                     )
-                    pending_tasks = cur.fetchone()["cnt"]
+                    row = cur.fetchone()
+                    activity = {
+                        label: row[label]
+                        for label in ("last_7_days", "last_30_days", "last_90_days")
+                    }
+                    pending_tasks = row["pending_tasks"]
 
-            return {
+            return ORJSONResponse({
                 "total_pharmacies": total,
                 "by_level": by_level,
                 "verified_above_L0": verified_above_l0,
@@ -597,19 +860,20 @@ async def get_validation_progress():
                 "recent_activity": activity,
                 "pending_tasks": pending_tasks,
                 "mode": "database",
-            }
+            })
         except Exception as e:
+            if not db_error_fallback:
+                raise
             logger.warning("DB validation progress failed: %s", e)
 
     # JSON fallback
     records = get_records()
     total = len(records)
-    levels = Counter(r.get("validation_level", "L0_mapped") for r in records)
-    by_level = dict(sorted(levels.items()))
+    by_level = _fallback_level_counts(records)
     l0_count = by_level.get("L0_mapped", 0)
     verified_above_l0 = total - l0_count
 
-    return {
+    return ORJSONResponse({
         "total_pharmacies": total,
         "by_level": by_level,
         "verified_above_L0": verified_above_l0,
@@ -617,4 +881,4 @@ async def get_validation_progress():
         "recent_activity": None,
         "pending_tasks": None,
         "mode": "json_fallback",
-    }
+    })
@@ -9,7 +9,11 @@ from __future__ import annotations
 
 import json
 import logging
+import string
+import time
+import uuid
 from datetime import datetime, timezone
+from functools import lru_cache
 
 from fastapi import HTTPException
 
@@ -28,26 +32,24 @@ DEFAULT_MESSAGE_TEMPLATE = (
 )
 
 # Reply parsing — generous matching
-_REPLY_OPERATING = {
+_REPLY_OPERATING = frozenset({
     "yes", "y", "1", "yep", "ok", "yeah", "yea",
     "affirmative", "true", "open", "operating",
-}
-_REPLY_CLOSED = {
+})
+_REPLY_CLOSED = frozenset({
     "no", "n", "2", "closed", "close", "nope", "shut",
     "not operating", "not open",
-}
-_REPLY_RELOCATED = {
+})
+_REPLY_RELOCATED = frozenset({
     "moved", "move", "3", "relocated", "relocate", "shifted",
-}
+})
 
-# Build lookup map
-REPLY_STATUS_MAP: dict[str, str] = {}
-for _word in _REPLY_OPERATING:
-    REPLY_STATUS_MAP[_word] = "operating"
-for _word in _REPLY_CLOSED:
-    REPLY_STATUS_MAP[_word] = "closed"
-for _word in _REPLY_RELOCATED:
-    REPLY_STATUS_MAP[_word] = "relocated"
+# Single lookup map: one hash probe per candidate instead of three set checks
+REPLY_STATUS_MAP: dict[str, str] = {
+    **dict.fromkeys(_REPLY_OPERATING, "operating"),
+    **dict.fromkeys(_REPLY_CLOSED, "closed"),
+    **dict.fromkeys(_REPLY_RELOCATED, "relocated"),
+}
 
 
 # ---------------------------------------------------------------------------
@@ -55,14 +57,49 @@ for _word in _REPLY_RELOCATED:
 # ---------------------------------------------------------------------------
 
 
-def render_message(template: str, pharmacy_name: str, address: str | None, msg_id: str) -> str:
-    """Substitute pharmacy details into the SMS template."""
-    msg_id_short = msg_id[:8] if msg_id else "00000000"
-    return template.format(
-        pharmacy_name=pharmacy_name,
-        address=address or "your location",
-        msg_id_short=msg_id_short,
-    )
+@lru_cache(maxsize=32)
+def _compile_template(template: str) -> str | None:
+    """
+    Translate a str.format template into an equivalent %-style template.
+
+    Parsed once per distinct template; ``fmt % mapping`` then renders without
+    re-parsing the braces.  Returns None when the template uses anything
+    beyond plain ``{name}`` fields (format specs, conversions, indexing),
+    in which case the caller falls back to str.format_map.
+    """
+    parts: list[str] = []
+    for literal, field, spec, conversion in string.Formatter().parse(template):
+        parts.append(literal.replace("%", "%%"))
+        if field is None:
+            continue
+        if spec or conversion or not field.isidentifier():
+            return None
+        parts.append(f"%({field})s")
+    return "".join(parts)
+
+
+def render_message(
+    template: str, pharmacy_name: str, address: str | None, msg_id: str | uuid.UUID
+) -> str:
+    """
+    Substitute pharmacy details into the SMS template.
+
+    *msg_id* may be a UUID straight from the DB row; its short reference is
+    the first 8 hex digits, the same as slicing its string form.
+    """
+    if isinstance(msg_id, uuid.UUID):
+        msg_id_short = msg_id.hex[:8]
+    else:
+        msg_id_short = msg_id[:8] if msg_id else "00000000"
+    values = {
+        "pharmacy_name": pharmacy_name,
+        "address": address or "your location",
+        "msg_id_short": msg_id_short,
+    }
+    compiled = _compile_template(template)
+    if compiled is None:
+        return template.format_map(values)
+    return compiled % values
 
 
 # ---------------------------------------------------------------------------
@@ -75,12 +112,14 @@ def parse_reply(reply_text: str) -> str | None:
     Parse an inbound SMS reply into an operating status.
 
     Returns 'operating', 'closed', 'relocated', or None (unparseable).
-    Strips whitespace, lowercases, checks full text then first word.
+    Strips whitespace, casefolds, checks full text then first word.
     """
-    if not reply_text or not reply_text.strip():
+    if not reply_text:
         return None
 
-    cleaned = reply_text.strip().lower()
+    cleaned = reply_text.strip().casefold()
+    if not cleaned:
+        return None
 
     # Try full text match
     result = REPLY_STATUS_MAP.get(cleaned)
@@ -88,8 +127,7 @@ def parse_reply(reply_text: str) -> str | None:
         return result
 
     # Try first word only (handles "Yes we are open", etc.)
-    first_word = cleaned.split()[0] if cleaned.split() else ""
-    return REPLY_STATUS_MAP.get(first_word)
+    return REPLY_STATUS_MAP.get(cleaned.split(None, 1)[0])
 
 
 # ---------------------------------------------------------------------------
@@ -306,6 +344,40 @@ def process_delivery_report(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+# Providers retry callbacks they consider unacknowledged. A replayed reply
+# would otherwise be matched against the *next* outstanding message for the
+# same phone, so recently processed replies are answered from memory.
+# Only provider-id'd callbacks are deduped: two identical texts without an
+# id (e.g. "YES" to consecutive prompts) are distinct replies.
+# (from_number, provider_message_id) -> (result, processed_at)
+_RECENT_REPLIES: dict[tuple[str, str], tuple[dict, float]] = {}
+_REPLY_DEDUP_TTL = 60  # seconds
+_REPLY_DEDUP_MAX = 10_000
+
+
+def _recent_reply_get(key: tuple[str, str]) -> dict | None:
+    """Return the stored result for a reply processed within the TTL."""
+    entry = _RECENT_REPLIES.get(key)
+    if entry is None:
+        return None
+    result, processed_at = entry
+    if time.time() - processed_at > _REPLY_DEDUP_TTL:
+        del _RECENT_REPLIES[key]
+        return None
+    return result
+
+
+def _recent_reply_set(key: tuple[str, str] | None, result: dict) -> dict:
+    """Remember a processed reply's result (unless key is None) and return it."""
+    if key is None:
+        return result
+    if len(_RECENT_REPLIES) >= _REPLY_DEDUP_MAX:
+        # dicts keep insertion order — drop the oldest entry
+        del _RECENT_REPLIES[next(iter(_RECENT_REPLIES))]
+    _RECENT_REPLIES[key] = (result, time.time())
+    return result
+
+
 def process_inbound_reply(
     from_number: str,
     message_text: str,
@@ -314,6 +386,8 @@ def process_inbound_reply(
     """
     Core inbound reply processing. Finds recent message for phone,
     parses reply, promotes to L1 if valid, updates message record.
+    A repeated provider_message_id within _REPLY_DEDUP_TTL gets the original
+    result.
     """
     if not db.is_available():
         raise HTTPException(
@@ -321,6 +395,12 @@ def process_inbound_reply(
             detail="Database unavailable — SMS campaigns require a database connection",
         )
 
+    dedup_key = (from_number, provider_message_id) if provider_message_id else None
+    if dedup_key is not None:
+        cached = _recent_reply_get(dedup_key)
+        if cached is not None:
+            return cached
+
     try:
         with db.get_conn() as conn:
             with conn.cursor(cursor_factory=extras.RealDictCursor) as cur:
@@ -367,13 +447,13 @@ def process_inbound_reply(
                     )
                     update_campaign_counts(campaign_id, cur)
 
-            return {
+            return _recent_reply_set(dedup_key, {
                 "success": True,
                 "message_id": msg_id,
                 "parsed": False,
                 "reply_text": message_text,
                 "message": "Reply received but could not be parsed",
-            }
+            })
 
         # Valid reply — promote to L1
         try:
@@ -426,7 +506,7 @@ def process_inbound_reply(
                 )
                 update_campaign_counts(campaign_id, cur)
 
-        return {
+        return _recent_reply_set(dedup_key, {
             "success": True,
             "message_id": msg_id,
             "parsed": True,
@@ -434,7 +514,7 @@ def process_inbound_reply(
             "promoted": promoted,
             "pharmacy_id": pharmacy_id,
             "history_id": history_id,
-        }
+        })
 
     except HTTPException:
         raise
@@ -450,7 +530,7 @@ def process_inbound_reply(
 
 def get_campaign_targets(filters: dict | None = None) -> list[dict]:
     """
-    Query L0 pharmacies that have a primary phone contact.
+    Query L0 pharmacies that have a primary phone contact, one per phone number.
     Excludes pharmacies already in an active campaign with pending/sent/delivered messages.
 
     Returns list of dicts: {pharmacy_id, pharmacy_name, address, phone_number, state, lga}
@@ -502,7 +582,21 @@ def get_campaign_targets(filters: dict | None = None) -> list[dict]:
                 """,
                 params,
             )
-            return [dict(r) for r in cur.fetchall()]
+            return _dedupe_by_phone(cur.fetchall())
+
+
+def _dedupe_by_phone(rows: list[dict]) -> list[dict]:
+    """
+    Keep the first target per phone number (whitespace-insensitive).
+
+    Replies are matched back by phone alone, so only one pharmacy per number
+    can ever be confirmed in a campaign — the others would just get a
+    duplicate SMS that is never resolved.
+    """
+    by_phone: dict[str, dict] = {}
+    for r in rows:
+        by_phone.setdefault("".join(r["phone_number"].split()), dict(r))
+    return list(by_phone.values())
 
 
 def get_retry_targets(campaign_id: str) -> list[dict]:
@@ -0,0 +1,102 @@
+"""
+Nigeria Pharmacy Registry — SMS Webhook Secret Checks
+
+Shared-secret authentication for provider callbacks:
+    /api/sms/webhook/*  — X-SMS-Webhook-Secret vs SMS_WEBHOOK_SECRET (required)
+    /api/sms/at/*       — X-AT-Webhook-Secret vs AT_WEBHOOK_SECRET
+                          (open mode when AT_WEBHOOK_SECRET is unset)
+
+The middleware rejects bad secrets before the route is entered, so FastAPI
+never reads or decodes the JSON/form body of unauthenticated callbacks.
+The route modules call the same check functions as a second line of defence.
+
+The secrets are read from the environment once and cached as SHA-256
+digests; call clear_secret_cache() after changing them at runtime. The
+provided header is hashed too, so compare_digest always sees two 32-byte
+values and the comparison time reveals neither content nor length.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import hmac
+import os
+from functools import lru_cache
+
+from fastapi import Request, Response
+from fastapi.responses import JSONResponse
+from starlette.datastructures import Headers
+from starlette.middleware.base import RequestResponseEndpoint
+
+SMS_WEBHOOK_PREFIX = "/api/sms/webhook/"
+AT_WEBHOOK_PREFIX = "/api/sms/at/"
+
+SMS_SECRET_DETAIL = "Invalid or missing webhook secret"
+AT_SECRET_DETAIL = "Invalid or missing AT webhook secret"
+
+# ---------------------------------------------------------------------------
+# Secret checks
+# ---------------------------------------------------------------------------
+
+
+def _digest(value: str) -> bytes:
+    return hashlib.sha256(value.encode()).digest()
+
+
+@lru_cache(maxsize=1)
+def _sms_secret() -> bytes | None:
+    """SHA-256 of SMS_WEBHOOK_SECRET, or None if unset."""
+    secret = os.environ.get("SMS_WEBHOOK_SECRET", "")
+    return _digest(secret) if secret else None
+
+
+@lru_cache(maxsize=1)
+def _at_secret() -> bytes | None:
+    """SHA-256 of AT_WEBHOOK_SECRET, or None if unset (open mode)."""
+    secret = os.environ.get("AT_WEBHOOK_SECRET", "")
+    return _digest(secret) if secret else None
+
+
+def clear_secret_cache() -> None:
+    """Re-read both webhook secrets from the environment on next use."""
+    _sms_secret.cache_clear()
+    _at_secret.cache_clear()
+
+
+def sms_secret_ok(headers: Headers) -> bool:
+    """True if X-SMS-Webhook-Secret matches SMS_WEBHOOK_SECRET (which must be set)."""
+    secret = _sms_secret()
+    if secret is None:
+        return False
+    provided = headers.get("X-SMS-Webhook-Secret", "")
+    # constant-time over equal-length digests: == would leak the matching prefix
+    return hmac.compare_digest(_digest(provided), secret)
+
+
+def at_secret_ok(headers: Headers) -> bool:
+    """True if X-AT-Webhook-Secret matches AT_WEBHOOK_SECRET, or no secret is configured."""
+    secret = _at_secret()
+    if secret is None:
+        # No secret configured — allow all requests (open mode)
+        return True
+    provided = headers.get("X-AT-Webhook-Secret", "")
+    return hmac.compare_digest(_digest(provided), secret)
+
+
+# ---------------------------------------------------------------------------
+# FastAPI middleware
+# ---------------------------------------------------------------------------
+
+
+async def webhook_secret_middleware(
+    request: Request, call_next: RequestResponseEndpoint
+) -> Response:
+    """Return 401 for webhook calls with a bad secret, before the body is read."""
+    path = request.url.path
+    if path.startswith(SMS_WEBHOOK_PREFIX):
+        if not sms_secret_ok(request.headers):
+            return JSONResponse(status_code=401, content={"detail": SMS_SECRET_DETAIL})
+    elif path.startswith(AT_WEBHOOK_PREFIX):
+        if not at_secret_ok(request.headers):
+            return JSONResponse(status_code=401, content={"detail": AT_SECRET_DETAIL})
+    return await call_next(request)
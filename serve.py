@@ -10,4 +10,9 @@ if __name__ == "__main__":
         host="0.0.0.0" if is_production else "127.0.0.1",
         port=int(os.environ.get("PORT", 3004 if is_production else 8000)),
         reload=not is_production,
+        # uvloop / httptools when installed (uvicorn[standard]), else asyncio / h11.
+        # Single worker on purpose: the rate limiter, auth key cache and
+        # response cache are in-process state.
+        loop="auto",
+        http="auto",
     )
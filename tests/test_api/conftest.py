@@ -2,6 +2,8 @@
 
 All tests run in JSON fallback mode (no database required).
 We seed helpers._RECORDS / _INDEX directly, and patch db.is_available() → False.
+The app and the per-tier clients are built once per session; the sample
+records are re-seeded before every test.
 
 Auth injection: we patch auth._cache_get so that magic test API keys
 instantly resolve to the desired AuthContext without DB lookups.
@@ -10,6 +12,7 @@ instantly resolve to the desired AuthContext without DB lookups.
 from __future__ import annotations
 
 from contextlib import contextmanager
+from functools import lru_cache
 from datetime import datetime, timezone
 from unittest.mock import patch
 
@@ -128,6 +131,21 @@ def _build_index(records):
     return {r["pharmacy_id"]: r for r in records}
 
 
+# ---------------------------------------------------------------------------
+# Markers
+# ---------------------------------------------------------------------------
+
+
+_FAST_TEST_NAMES = frozenset({"test_requires_auth", "test_auth_matrix"})
+
+
+def pytest_collection_modifyitems(items):
+    """Tag the auth checks as ``fast`` — they only assert 401/403/503 codes."""
+    for item in items:
+        if item.originalname in _FAST_TEST_NAMES:
+            item.add_marker(pytest.mark.fast)
+
+
 # ---------------------------------------------------------------------------
 # Magic test API keys → AuthContext mapping
 # ---------------------------------------------------------------------------
@@ -171,9 +189,9 @@ def _noop_rate_limit(client_key, limit):
     return True, limit, limit - 1, 60
 
 
-@pytest.fixture()
-def app():
-    """FastAPI app running in JSON fallback mode (no DB)."""
+@contextmanager
+def _patched_app():
+    """Yield the FastAPI app in JSON fallback mode (no DB), undoing patches on exit."""
     with (
         patch("agent_05_platform_api.src.db.is_available", return_value=False),
         patch("agent_05_platform_api.src.db.init_pool", return_value=False),
@@ -192,25 +210,54 @@ def app():
         # Set server_started_at on app.state (normally done in startup event)
         _app.state.server_started_at = datetime(2026, 2, 24, 0, 0, 0, tzinfo=timezone.utc)
 
+        try:
+            yield _app
+        finally:
+            # Cleanup
+            helpers._RECORDS = []
+            helpers._INDEX = {}
+
+
+@pytest.fixture(scope="session")
+def app():
+    """FastAPI app running in JSON fallback mode (no DB), shared by the whole session."""
+    with _patched_app() as _app:
         yield _app
 
-        # Cleanup
-        helpers._RECORDS = []
-        helpers._INDEX = {}
+
+@pytest.fixture(autouse=True)
+def _reseed_fallback_records():
+    """Restore the sample records before each test — some tests rebind them."""
+    from agent_05_platform_api.src import helpers, response_cache
+
+    helpers._RECORDS = list(SAMPLE_PHARMACIES)
+    helpers._INDEX = _build_index(helpers._RECORDS)
+    response_cache.invalidate()
+
+
+@pytest.fixture(autouse=True)
+def _clear_webhook_secret_cache():
+    """Tests patch SMS_WEBHOOK_SECRET / AT_WEBHOOK_SECRET per test; drop the cached values."""
+    from agent_05_platform_api.src import webhook_auth
+
+    webhook_auth.clear_secret_cache()
+    yield
+    webhook_auth.clear_secret_cache()
 
 
 # ---------------------------------------------------------------------------
-# Client fixtures — various auth tiers
+# Client fixtures — various auth tiers (session-scoped; TestClient is stateless
+# here since no test enters it as a context manager or relies on cookies)
 # ---------------------------------------------------------------------------
 
 
-@pytest.fixture()
+@pytest.fixture(scope="session")
 def client(app):
     """Unauthenticated (public tier) TestClient — no API key header."""
     return TestClient(app, raise_server_exceptions=False)
 
 
-@pytest.fixture()
+@pytest.fixture(scope="session")
 def read_client(app):
     """registry_read tier TestClient."""
     return TestClient(
@@ -220,7 +267,7 @@ def read_client(app):
     )
 
 
-@pytest.fixture()
+@pytest.fixture(scope="session")
 def write_client(app):
     """registry_write tier TestClient."""
     return TestClient(
@@ -230,7 +277,7 @@ def write_client(app):
     )
 
 
-@pytest.fixture()
+@pytest.fixture(scope="session")
 def admin_client(app):
     """admin tier TestClient."""
     return TestClient(
@@ -238,3 +285,123 @@ def admin_client(app):
         raise_server_exceptions=False,
         headers={"X-API-Key": "npr_test_admin_0000000000000000"},
     )
+
+
+# Expected status per client fixture for an admin-only, DB-only endpoint.
+ADMIN_AUTH_MATRIX = [
+    ("client", 401),
+    ("read_client", 403),
+    ("write_client", 403),
+    ("admin_client", 503),
+]
+
+
+def assert_auth_matrix(request, client_fixture: str, expected: int, method: str, url: str, **kwargs):
+    """Send one request as the named client fixture and check the status code.
+
+    Pair with ``@pytest.mark.parametrize("client_fixture,expected", ADMIN_AUTH_MATRIX)``.
+    """
+    c = request.getfixturevalue(client_fixture)
+    resp = c.request(method, url, **kwargs)
+    assert resp.status_code == expected, f"{client_fixture} {method} {url}: {resp.status_code}"
+
+
+# ---------------------------------------------------------------------------
+# Scripted database (for unit tests of the DB-mode code paths)
+# ---------------------------------------------------------------------------
+
+
+class FakeCursor:
+    """Stand-in cursor: records every statement and answers it via ``respond``.
+
+    ``respond(sql, params)`` returns the rows the statement yields. SQL
+    whitespace is collapsed first, so tests can match on fragments.
+    ``commits`` / ``rollbacks`` count how fake_db's connections were closed;
+    ``timers`` is the mock standing in for scheduled stats refreshes.
+    """
+
+    def __init__(self, respond=None):
+        self.respond = respond or (lambda sql, params: [])
+        self.executed: list[tuple[str, object]] = []
+        self.commits = 0
+        self.rollbacks = 0
+        self.timers = None
+        self._rows: list = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql, params=None):
+        sql = " ".join(sql.split())
+        self.executed.append((sql, params))
+        self._rows = list(self.respond(sql, params) or [])
+
+    def fetchone(self):
+        return self._rows[0] if self._rows else None
+
+    def fetchall(self):
+        return self._rows
+
+    def statements(self, fragment: str) -> list[tuple[str, object]]:
+        """Executed (sql, params) pairs whose SQL contains ``fragment``."""
+        return [(sql, params) for sql, params in self.executed if fragment in sql]
+
+
+@contextmanager
+def fake_db(cursor: FakeCursor):
+    """Run the block in DB mode, every db.get_conn() handing out ``cursor``."""
+
+    class _Conn:
+        def cursor(self, *args, **kwargs):
+            return cursor
+
+    @contextmanager
+    def _get_conn():
+        try:
+            yield _Conn()
+        except BaseException:
+            cursor.rollbacks += 1
+            raise
+        cursor.commits += 1
+
+    from agent_05_platform_api.src import helpers
+
+    # background stats refreshes are recorded on the mock, never started
+    with (
+        patch("agent_05_platform_api.src.db.is_available", return_value=True),
+        patch("agent_05_platform_api.src.db.get_conn", _get_conn),
+        patch.object(helpers, "threading") as threading_mock,
+    ):
+        cursor.timers = threading_mock.Timer
+        try:
+            yield cursor
+        finally:
+            helpers._stats_refresh_timer = None
+
+
+# ---------------------------------------------------------------------------
+# Session-cached responses
+# ---------------------------------------------------------------------------
+
+
+@pytest.fixture(scope="session")
+def read_503(read_client):
+    """Memoized ``read_client.get`` for DB-only endpoints that 503 in fallback mode.
+
+    Only use this for bodiless GETs — the response is cached per URL.
+    """
+
+    @lru_cache(maxsize=None)
+    def _get(url: str):
+        return read_client.get(url)
+
+    return _get
+
+
+@pytest.fixture(scope="session")
+def fhir_metadata(client):
+    """Parsed ``/api/fhir/metadata`` CapabilityStatement, fetched once per session."""
+    return client.get("/api/fhir/metadata").json()
@@ -13,9 +13,9 @@ class TestEvidence:
         resp = client.get(f"/api/pharmacies/{pid}/evidence")
         assert resp.status_code == 401
 
-    def test_returns_503_without_db(self, read_client):
+    def test_returns_503_without_db(self, read_503):
         pid = SAMPLE_PHARMACIES[0]["pharmacy_id"]
-        resp = read_client.get(f"/api/pharmacies/{pid}/evidence")
+        resp = read_503(f"/api/pharmacies/{pid}/evidence")
         assert resp.status_code == 503
 
 
@@ -26,8 +26,8 @@ class TestProvenance:
         resp = client.get("/api/provenance")
         assert resp.status_code == 401
 
-    def test_returns_503_without_db(self, read_client):
-        resp = read_client.get("/api/provenance")
+    def test_returns_503_without_db(self, read_503):
+        resp = read_503("/api/provenance")
         assert resp.status_code == 503
 
 
@@ -67,9 +67,9 @@ class TestTimeline:
         resp = client.get(f"/api/pharmacies/{pid}/timeline")
         assert resp.status_code == 401
 
-    def test_returns_503_without_db(self, read_client):
+    def test_returns_503_without_db(self, read_503):
         pid = SAMPLE_PHARMACIES[0]["pharmacy_id"]
-        resp = read_client.get(f"/api/pharmacies/{pid}/timeline")
+        resp = read_503(f"/api/pharmacies/{pid}/timeline")
         assert resp.status_code == 503
 
 
@@ -80,6 +80,6 @@ class TestAuditStats:
         resp = client.get("/api/audit/stats")
         assert resp.status_code == 401
 
-    def test_returns_503_without_db(self, read_client):
-        resp = read_client.get("/api/audit/stats")
+    def test_returns_503_without_db(self, read_503):
+        resp = read_503("/api/audit/stats")
         assert resp.status_code == 503
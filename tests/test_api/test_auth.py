@@ -2,15 +2,19 @@
 
 from __future__ import annotations
 
+import pytest
+
 from .conftest import SAMPLE_PHARMACIES
 
+pytestmark = pytest.mark.fast
+
 
 class TestPublicAccess:
     """Endpoints accessible without an API key."""
 
     def test_health_is_public(self, client):
         resp = client.get("/api/health")
-        assert resp.status_code in (200, 503)  # 503 in degraded mode
+        assert resp.status_code in {200, 503}  # 503 in degraded mode
 
     def test_pharmacies_list_is_public(self, client):
         resp = client.get("/api/pharmacies")
@@ -54,9 +58,9 @@ class TestRegistryReadAccess:
         resp = client.get("/api/health/data-quality")
         assert resp.status_code == 401
 
-    def test_data_quality_allowed_for_read(self, read_client):
+    def test_data_quality_allowed_for_read(self, read_503):
         # Will 503 due to no DB, but should not 401/403
-        resp = read_client.get("/api/health/data-quality")
+        resp = read_503("/api/health/data-quality")
         assert resp.status_code == 503  # allowed but DB unavailable
 
 
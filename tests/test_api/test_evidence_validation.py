@@ -2,8 +2,12 @@
 
 from __future__ import annotations
 
+import pytest
+
 from agent_05_platform_api.src.evidence_validator import validate_evidence_detail
 
+pytestmark = pytest.mark.fast
+
 
 # ---------------------------------------------------------------------------
 # Helpers — sample valid evidence dicts
@@ -52,123 +56,113 @@ def _valid_audit_evidence():
     }
 
 
-# ---------------------------------------------------------------------------
-# contact_confirmation
-# ---------------------------------------------------------------------------
-
-class TestContactConfirmationValidation:
-    def test_valid_passes(self):
-        errors = validate_evidence_detail("contact_confirmation", _valid_contact_evidence())
-        assert errors == []
-
-    def test_missing_contact_details(self):
-        errors = validate_evidence_detail("contact_confirmation", {})
-        assert len(errors) == 1
-        assert "contact_details is required" in errors[0]
-
-    def test_missing_required_fields(self):
-        detail = {"contact_details": {"respondent_name": "Ade"}}
-        errors = validate_evidence_detail("contact_confirmation", detail)
-        assert len(errors) == 1
-        assert "missing required fields" in errors[0]
-        assert "respondent_role" in errors[0]
-
-    def test_invalid_operating_status(self):
-        detail = _valid_contact_evidence()
-        detail["contact_details"]["operating_status_confirmed"] = "maybe"
-        errors = validate_evidence_detail("contact_confirmation", detail)
-        assert any("operating_status_confirmed" in e for e in errors)
-
-    def test_extra_fields_ignored(self):
-        detail = _valid_contact_evidence()
-        detail["contact_details"]["extra_field"] = "no problem"
-        errors = validate_evidence_detail("contact_confirmation", detail)
-        assert errors == []
-
-
-# ---------------------------------------------------------------------------
-# location_confirmation
-# ---------------------------------------------------------------------------
-
-class TestLocationConfirmationValidation:
-    def test_valid_passes(self):
-        errors = validate_evidence_detail("location_confirmation", _valid_location_evidence())
-        assert errors == []
-
-    def test_missing_location_details(self):
-        errors = validate_evidence_detail("location_confirmation", {})
-        assert len(errors) == 1
-        assert "location_details is required" in errors[0]
-
-    def test_missing_gps_fields(self):
-        detail = {"location_details": {"facility_operational": True, "signage_visible": True}}
-        errors = validate_evidence_detail("location_confirmation", detail)
-        assert any("missing required fields" in e for e in errors)
-
-    def test_latitude_out_of_nigeria_bounds(self):
-        detail = _valid_location_evidence()
-        detail["location_details"]["gps_latitude"] = 50.0  # way outside Nigeria
-        errors = validate_evidence_detail("location_confirmation", detail)
-        assert any("outside Nigeria bounds" in e for e in errors)
-
-    def test_longitude_out_of_nigeria_bounds(self):
-        detail = _valid_location_evidence()
-        detail["location_details"]["gps_longitude"] = 1.0  # west of Nigeria
-        errors = validate_evidence_detail("location_confirmation", detail)
-        assert any("outside Nigeria bounds" in e for e in errors)
-
-    def test_boundary_values_accepted(self):
-        detail = _valid_location_evidence()
-        detail["location_details"]["gps_latitude"] = 4.0  # min bound
-        detail["location_details"]["gps_longitude"] = 15.0  # max bound
-        errors = validate_evidence_detail("location_confirmation", detail)
-        assert errors == []
-
-
-# ---------------------------------------------------------------------------
-# regulator_crossref
-# ---------------------------------------------------------------------------
-
-class TestRegulatorCrossrefValidation:
-    def test_valid_passes(self):
-        errors = validate_evidence_detail("regulator_crossref", _valid_regulator_evidence())
-        assert errors == []
-
-    def test_missing_regulator_details(self):
-        errors = validate_evidence_detail("regulator_crossref", {})
-        assert len(errors) == 1
-        assert "regulator_details is required" in errors[0]
-
-    def test_missing_required_fields(self):
-        detail = {"regulator_details": {"regulator_source": "pcn_2025_q4"}}
-        errors = validate_evidence_detail("regulator_crossref", detail)
-        assert any("missing required fields" in e for e in errors)
-
-    def test_match_score_out_of_range(self):
-        detail = _valid_regulator_evidence()
-        detail["regulator_details"]["match_score"] = 1.5
-        errors = validate_evidence_detail("regulator_crossref", detail)
-        assert any("between 0.0 and 1.0" in e for e in errors)
-
-    def test_invalid_match_type(self):
-        detail = _valid_regulator_evidence()
-        detail["regulator_details"]["match_type"] = "fuzzy_match"
-        errors = validate_evidence_detail("regulator_crossref", detail)
-        assert any("match_type" in e for e in errors)
+def _with(evidence, section, **overrides):
+    """Return *evidence* with fields in its *section* sub-dict replaced."""
+    evidence[section].update(overrides)
+    return evidence
 
 
 # ---------------------------------------------------------------------------
-# in_person_audit
+# Table-driven cases: (evidence_type, evidence_detail, expected error substring,
+# expected error count — None when other errors may be reported too)
 # ---------------------------------------------------------------------------
 
-class TestInPersonAuditValidation:
-    def test_valid_passes(self):
-        errors = validate_evidence_detail("in_person_audit", _valid_audit_evidence())
-        assert errors == []
-
-    def test_missing_required_fields(self):
-        errors = validate_evidence_detail("in_person_audit", {"audit_date": "2026-02-20"})
-        assert any("missing required fields" in e for e in errors)
+CASES = [
+    pytest.param(
+        "contact_confirmation", {}, "contact_details is required", 1,
+        id="contact-missing-section",
+    ),
+    pytest.param(
+        "contact_confirmation", {"contact_details": {"respondent_name": "Ade"}}, "missing required fields", 1,
+        id="contact-missing-fields",
+    ),
+    pytest.param(
+        "contact_confirmation", {"contact_details": {"respondent_name": "Ade"}}, "respondent_role", None,
+        id="contact-missing-fields-named",
+    ),
+    pytest.param(
+        "contact_confirmation",
+        _with(_valid_contact_evidence(), "contact_details", operating_status_confirmed="maybe"),
+        "operating_status_confirmed", None,
+        id="contact-invalid-operating-status",
+    ),
+    pytest.param(
+        "location_confirmation", {}, "location_details is required", 1,
+        id="location-missing-section",
+    ),
+    pytest.param(
+        "location_confirmation",
+        {"location_details": {"facility_operational": True, "signage_visible": True}},
+        "missing required fields", None,
+        id="location-missing-gps",
+    ),
+    pytest.param(
+        "location_confirmation",
+        _with(_valid_location_evidence(), "location_details", gps_latitude=50.0),  # way outside Nigeria
+        "outside Nigeria bounds", None,
+        id="location-latitude-out-of-bounds",
+    ),
+    pytest.param(
+        "location_confirmation",
+        _with(_valid_location_evidence(), "location_details", gps_longitude=1.0),  # west of Nigeria
+        "outside Nigeria bounds", None,
+        id="location-longitude-out-of-bounds",
+    ),
+    pytest.param(
+        "regulator_crossref", {}, "regulator_details is required", 1,
+        id="regulator-missing-section",
+    ),
+    pytest.param(
+        "regulator_crossref",
+        {"regulator_details": {"regulator_source": "pcn_2025_q4"}},
+        "missing required fields", None,
+        id="regulator-missing-fields",
+    ),
+    pytest.param(
+        "regulator_crossref", _valid_regulator_evidence(score=1.5), "between 0.0 and 1.0", None,
+        id="regulator-score-out-of-range",
+    ),
+    pytest.param(
+        "regulator_crossref",
+        _with(_valid_regulator_evidence(), "regulator_details", match_type="fuzzy_match"),
+        "match_type", None,
+        id="regulator-invalid-match-type",
+    ),
+    pytest.param(
+        "in_person_audit", {"audit_date": "2026-02-20"}, "missing required fields", None,
+        id="audit-missing-fields",
+    ),
+]
+
+VALID_CASES = [
+    pytest.param("contact_confirmation", _valid_contact_evidence(), id="contact"),
+    pytest.param(
+        "contact_confirmation",
+        _with(_valid_contact_evidence(), "contact_details", extra_field="no problem"),
+        id="contact-extra-fields-ignored",
+    ),
+    pytest.param("location_confirmation", _valid_location_evidence(), id="location"),
+    pytest.param(
+        "location_confirmation",
+        _with(_valid_location_evidence(), "location_details", gps_latitude=4.0, gps_longitude=15.0),
+        id="location-boundary-values",
+    ),
+    pytest.param("regulator_crossref", _valid_regulator_evidence(), id="regulator"),
+    pytest.param("in_person_audit", _valid_audit_evidence(), id="audit"),
+]
+
+
+@pytest.mark.parametrize("etype,detail,expected_substring,expected_errors", CASES)
+def test_invalid_evidence_reports_error(etype, detail, expected_substring, expected_errors):
+    errors = validate_evidence_detail(etype, detail)
+    assert any(expected_substring in e for e in errors), errors
+    if expected_errors is not None:
+        assert len(errors) == expected_errors, errors
+
+
+@pytest.mark.parametrize("etype,detail", VALID_CASES)
+def test_valid_evidence_passes(etype, detail):
+    assert validate_evidence_detail(etype, detail) == []
 
 
 # ---------------------------------------------------------------------------
@@ -10,8 +10,8 @@ class TestExportCSV:
         resp = client.get("/api/export/pharmacies.csv")
         assert resp.status_code == 401
 
-    def test_returns_503_without_db(self, read_client):
-        resp = read_client.get("/api/export/pharmacies.csv")
+    def test_returns_503_without_db(self, read_503):
+        resp = read_503("/api/export/pharmacies.csv")
         assert resp.status_code == 503
 
 
@@ -22,8 +22,8 @@ class TestExportJSON:
         resp = client.get("/api/export/pharmacies.json")
         assert resp.status_code == 401
 
-    def test_returns_503_without_db(self, read_client):
-        resp = read_client.get("/api/export/pharmacies.json")
+    def test_returns_503_without_db(self, read_503):
+        resp = read_503("/api/export/pharmacies.json")
         assert resp.status_code == 503
 
 
@@ -34,8 +34,8 @@ class TestExportFhirNdjson:
         resp = client.get("/api/export/fhir/Location.ndjson")
         assert resp.status_code == 401
 
-    def test_returns_503_without_db(self, read_client):
-        resp = read_client.get("/api/export/fhir/Location.ndjson")
+    def test_returns_503_without_db(self, read_503):
+        resp = read_503("/api/export/fhir/Location.ndjson")
         assert resp.status_code == 503
 
 
@@ -46,6 +46,6 @@ class TestExportSummary:
         resp = client.get("/api/export/summary")
         assert resp.status_code == 401
 
-    def test_returns_503_without_db(self, read_client):
-        resp = read_client.get("/api/export/summary")
+    def test_returns_503_without_db(self, read_503):
+        resp = read_503("/api/export/summary")
         assert resp.status_code == 503
@@ -2,6 +2,76 @@
 
 from __future__ import annotations
 
+from types import MappingProxyType
+
+import pytest
+
+from agent_05_platform_api.src.routes.fhir import build_fhir_location, build_fhir_organization
+
+pytestmark = pytest.mark.fast
+
+
+# ---------------------------------------------------------------------------
+# Shared builder inputs — read-only, built once per module
+# ---------------------------------------------------------------------------
+
+_SAMPLE_LOCATION_ROW = MappingProxyType({
+    "id": "aaaaaaaa-0001-0001-0001-000000000001",
+    "name": "Test Pharmacy",
+    "facility_type": "pharmacy",
+    "operational_status": "operational",
+    "current_validation_level": "L0_mapped",
+    "address_line_1": "123 Main St",
+    "address_line_2": None,
+    "ward": "Ward A",
+    "lga": "Test LGA",
+    "state": "Lagos",
+    "country": "NG",
+    "postal_code": None,
+    "latitude": 6.5,
+    "longitude": 3.4,
+    "primary_source": "src-test",
+    "updated_at": "2026-02-20T10:00:00+00:00",
+})
+
+_SAMPLE_SPARSE_LOCATION_ROW = MappingProxyType({
+    "id": "test-id",
+    "name": "Test",
+    "facility_type": "pharmacy",
+    "operational_status": "operational",
+    "current_validation_level": "L0_mapped",
+    "address_line_1": None,
+    "address_line_2": None,
+    "ward": None,
+    "lga": None,
+    "state": None,
+    "country": "NG",
+    "postal_code": None,
+    "latitude": None,
+    "longitude": None,
+    "primary_source": None,
+    "updated_at": None,
+})
+
+_SAMPLE_CONTACTS = (
+    MappingProxyType({"contact_type": "phone", "contact_value": "+2341234567", "is_primary": True}),
+    MappingProxyType({"contact_type": "email", "contact_value": "test@test.ng", "is_primary": False}),
+)
+
+_SAMPLE_ORG_ROW = MappingProxyType({
+    "id": "test-org-id",
+    "name": "Test Org Pharmacy",
+    "facility_type": "ppmv",
+    "operational_status": "operational",
+    "address_line_1": "Addr 1",
+    "address_line_2": None,
+    "lga": "LGA",
+    "state": "Kano",
+    "country": "NG",
+    "postal_code": None,
+    "updated_at": None,
+})
+
 
 class TestFhirMetadata:
     """GET /api/fhir/metadata — CapabilityStatement, public."""
@@ -9,30 +79,28 @@ class TestFhirMetadata:
     def test_returns_capability_statement(self, client):
         resp = client.get("/api/fhir/metadata")
         assert resp.status_code == 200
+        assert resp.headers["content-type"].startswith("application/json")
         data = resp.json()
         assert data["resourceType"] == "CapabilityStatement"
         assert data["fhirVersion"] == "4.0.1"
         assert data["status"] == "active"
 
-    def test_declares_location_resource(self, client):
-        resp = client.get("/api/fhir/metadata")
-        rest = resp.json()["rest"][0]
+    def test_declares_location_resource(self, fhir_metadata):
+        rest = fhir_metadata["rest"][0]
         resource_types = [r["type"] for r in rest["resource"]]
         assert "Location" in resource_types
         assert "Organization" in resource_types
 
-    def test_declares_search_params(self, client):
-        resp = client.get("/api/fhir/metadata")
-        rest = resp.json()["rest"][0]
+    def test_declares_search_params(self, fhir_metadata):
+        rest = fhir_metadata["rest"][0]
         location = next(r for r in rest["resource"] if r["type"] == "Location")
         param_names = [p["name"] for p in location["searchParam"]]
         assert "name" in param_names
         assert "address-state" in param_names
         assert "_count" in param_names
 
-    def test_format_is_json(self, client):
-        resp = client.get("/api/fhir/metadata")
-        assert "json" in resp.json()["format"]
+    def test_format_is_json(self, fhir_metadata):
+        assert "json" in fhir_metadata["format"]
 
 
 class TestFhirLocationRead:
@@ -42,8 +110,8 @@ class TestFhirLocationRead:
         resp = client.get("/api/fhir/Location/aaaaaaaa-0001-0001-0001-000000000001")
         assert resp.status_code == 401
 
-    def test_returns_503_without_db(self, read_client):
-        resp = read_client.get("/api/fhir/Location/aaaaaaaa-0001-0001-0001-000000000001")
+    def test_returns_503_without_db(self, read_503):
+        resp = read_503("/api/fhir/Location/aaaaaaaa-0001-0001-0001-000000000001")
         assert resp.status_code == 503
 
 
@@ -54,8 +122,8 @@ class TestFhirLocationSearch:
         resp = client.get("/api/fhir/Location")
         assert resp.status_code == 401
 
-    def test_returns_503_without_db(self, read_client):
-        resp = read_client.get("/api/fhir/Location")
+    def test_returns_503_without_db(self, read_503):
+        resp = read_503("/api/fhir/Location")
         assert resp.status_code == 503
 
 
@@ -66,8 +134,8 @@ class TestFhirOrganizationRead:
         resp = client.get("/api/fhir/Organization/org-aaaaaaaa-0001-0001-0001-000000000001")
         assert resp.status_code == 401
 
-    def test_returns_503_without_db(self, read_client):
-        resp = read_client.get("/api/fhir/Organization/org-aaaaaaaa-0001-0001-0001-000000000001")
+    def test_returns_503_without_db(self, read_503):
+        resp = read_503("/api/fhir/Organization/org-aaaaaaaa-0001-0001-0001-000000000001")
         assert resp.status_code == 503
 
 
@@ -78,8 +146,8 @@ class TestFhirOrganizationSearch:
         resp = client.get("/api/fhir/Organization")
         assert resp.status_code == 401
 
-    def test_returns_503_without_db(self, read_client):
-        resp = read_client.get("/api/fhir/Organization")
+    def test_returns_503_without_db(self, read_503):
+        resp = read_503("/api/fhir/Organization")
         assert resp.status_code == 503
 
 
@@ -87,27 +155,7 @@ class TestFhirResourceBuilders:
     """Unit tests for FHIR Location/Organization builder functions."""
 
     def test_build_fhir_location_shape(self):
-        from agent_05_platform_api.src.routes.fhir import build_fhir_location
-
-        row = {
-            "id": "aaaaaaaa-0001-0001-0001-000000000001",
-            "name": "Test Pharmacy",
-            "facility_type": "pharmacy",
-            "operational_status": "operational",
-            "current_validation_level": "L0_mapped",
-            "address_line_1": "123 Main St",
-            "address_line_2": None,
-            "ward": "Ward A",
-            "lga": "Test LGA",
-            "state": "Lagos",
-            "country": "NG",
-            "postal_code": None,
-            "latitude": 6.5,
-            "longitude": 3.4,
-            "primary_source": "src-test",
-            "updated_at": "2026-02-20T10:00:00+00:00",
-        }
-        result = build_fhir_location(row, [], [])
+        result = build_fhir_location(_SAMPLE_LOCATION_ROW, [], [])
 
         assert result["resourceType"] == "Location"
         assert result["id"] == "aaaaaaaa-0001-0001-0001-000000000001"
@@ -121,31 +169,7 @@ class TestFhirResourceBuilders:
         assert any("pharmacy-id" in i["system"] for i in result["identifier"])
 
     def test_build_fhir_location_with_contacts(self):
-        from agent_05_platform_api.src.routes.fhir import build_fhir_location
-
-        row = {
-            "id": "test-id",
-            "name": "Test",
-            "facility_type": "pharmacy",
-            "operational_status": "operational",
-            "current_validation_level": "L0_mapped",
-            "address_line_1": None,
-            "address_line_2": None,
-            "ward": None,
-            "lga": None,
-            "state": None,
-            "country": "NG",
-            "postal_code": None,
-            "latitude": None,
-            "longitude": None,
-            "primary_source": None,
-            "updated_at": None,
-        }
-        contacts = [
-            {"contact_type": "phone", "contact_value": "+2341234567", "is_primary": True},
-            {"contact_type": "email", "contact_value": "test@test.ng", "is_primary": False},
-        ]
-        result = build_fhir_location(row, contacts, [])
+        result = build_fhir_location(_SAMPLE_SPARSE_LOCATION_ROW, _SAMPLE_CONTACTS, [])
 
         assert "telecom" in result
         assert len(result["telecom"]) == 2
@@ -154,22 +178,7 @@ class TestFhirResourceBuilders:
         assert phone["rank"] == 1
 
     def test_build_fhir_organization_shape(self):
-        from agent_05_platform_api.src.routes.fhir import build_fhir_organization
-
-        row = {
-            "id": "test-org-id",
-            "name": "Test Org Pharmacy",
-            "facility_type": "ppmv",
-            "operational_status": "operational",
-            "address_line_1": "Addr 1",
-            "address_line_2": None,
-            "lga": "LGA",
-            "state": "Kano",
-            "country": "NG",
-            "postal_code": None,
-            "updated_at": None,
-        }
-        result = build_fhir_organization(row, [], [])
+        result = build_fhir_organization(_SAMPLE_ORG_ROW, [], [])
 
         assert result["resourceType"] == "Organization"
         assert result["id"] == "org-test-org-id"
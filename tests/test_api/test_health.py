@@ -9,7 +9,7 @@ class TestHealthEndpoint:
     def test_returns_200_in_json_fallback(self, client):
         resp = client.get("/api/health")
         # In fallback mode (DB patched away) health reports degraded / 503
-        assert resp.status_code in (200, 503)
+        assert resp.status_code in {200, 503}
         data = resp.json()
         assert "status" in data
         assert "mode" in data
@@ -67,6 +67,6 @@ class TestDataQualityEndpoint:
         resp = client.get("/api/health/data-quality")
         assert resp.status_code == 401
 
-    def test_returns_503_without_db(self, read_client):
-        resp = read_client.get("/api/health/data-quality")
+    def test_returns_503_without_db(self, read_503):
+        resp = read_503("/api/health/data-quality")
         assert resp.status_code == 503
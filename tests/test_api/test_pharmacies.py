@@ -2,7 +2,11 @@
 
 from __future__ import annotations
 
-from .conftest import SAMPLE_PHARMACIES
+from unittest.mock import patch
+
+import pytest
+
+from .conftest import SAMPLE_PHARMACIES, FakeCursor, fake_db
 
 
 class TestListPharmacies:
@@ -91,6 +95,12 @@ class TestListPharmacies:
                 # Should be redacted: +234****5678 pattern
                 assert "****" in r["phone"]
 
+    def test_public_redaction_leaves_records_intact(self, client, read_client):
+        client.get("/api/pharmacies?state=Lagos")
+        resp = read_client.get("/api/pharmacies?state=Lagos")
+        phones = {r["phone"] for r in resp.json()["data"]}
+        assert "+2348012345678" in phones
+
 
 class TestGetPharmacy:
     """GET /api/pharmacies/{pharmacy_id}"""
@@ -150,6 +160,108 @@ class TestStats:
         assert by_type.get("ppmv") == 1
         assert by_type.get("hospital_pharmacy") == 1
 
+    def test_fallback_stats_recomputed_after_reload(self, client):
+        from agent_05_platform_api.src import helpers, response_cache
+
+        assert client.get("/api/stats").json()["total"] == 5
+        helpers._RECORDS = helpers._RECORDS[:2]
+        response_cache.invalidate()  # as load_all_canonical() does
+        assert client.get("/api/stats").json()["total"] == 2
+
+    def test_rollup_stats_from_view_rows(self):
+        from agent_05_platform_api.src.helpers import _rollup_stats
+
+        rows = [
+            {"state": "Lagos", "primary_source": "osm", "facility_type": "pharmacy",
+             "current_validation_level": "L0_mapped", "cnt": 3},
+            {"state": "Lagos", "primary_source": "grid3", "facility_type": "ppmv",
+             "current_validation_level": "L1_contact_confirmed", "cnt": 2},
+            {"state": "Kano", "primary_source": "osm", "facility_type": "pharmacy",
+             "current_validation_level": "L0_mapped", "cnt": 1},
+        ]
+        stats = _rollup_stats(rows)
+        assert stats["total"] == 6
+        assert stats["by_state"] == {"Lagos": 5, "Kano": 1}
+        assert stats["by_source"] == {"osm": 4, "grid3": 2}
+        assert stats["by_facility_type"] == {"pharmacy": 4, "ppmv": 2}
+        assert stats["states_covered"] == 2
+
+
+def _stats_view_cursor() -> FakeCursor:
+    def respond(sql, params):
+        if "to_regclass" in sql:
+            return [{"has_view": True}]
+        if "FROM mv_pharmacy_stats" in sql:
+            return [{"state": "Lagos", "primary_source": "osm", "facility_type": "pharmacy",
+                     "current_validation_level": "L0_mapped", "cnt": 3}]
+        return []
+
+    return FakeCursor(respond)
+
+
+class TestStatsViewRefresh:
+    """/api/stats only reads mv_pharmacy_stats; writes refresh it off the request path."""
+
+    REFRESH = "REFRESH MATERIALIZED VIEW CONCURRENTLY mv_pharmacy_stats"
+
+    def test_read_never_refreshes(self):
+        from agent_05_platform_api.src import helpers, response_cache
+
+        with fake_db(_stats_view_cursor()) as cur:
+            assert helpers.db_get_stats()["total"] == 3
+            response_cache.invalidate()
+            assert helpers.db_get_stats()["total"] == 3
+        assert cur.statements("REFRESH") == []
+
+    def test_refresh_stats_view(self):
+        from agent_05_platform_api.src import helpers, response_cache
+
+        epoch = response_cache.current_epoch()
+        with fake_db(_stats_view_cursor()) as cur:
+            helpers.refresh_stats_view()
+        assert len(cur.statements(self.REFRESH)) == 1
+        assert response_cache.current_epoch() != epoch
+
+    def test_scheduled_refreshes_coalesce(self):
+        from agent_05_platform_api.src import helpers
+
+        with fake_db(_stats_view_cursor()) as cur:
+            helpers.schedule_stats_refresh()
+            helpers.schedule_stats_refresh()
+            cur.timers.assert_called_once_with(
+                helpers.STATS_REFRESH_DELAY, helpers._run_scheduled_stats_refresh
+            )
+            cur.timers.return_value.start.assert_called_once()
+            assert cur.statements("REFRESH") == []
+
+            # the timer firing refreshes and frees the slot for the next write
+            helpers._run_scheduled_stats_refresh()
+            assert len(cur.statements(self.REFRESH)) == 1
+            helpers.schedule_stats_refresh()
+            assert cur.timers.call_count == 2
+
+    def test_verification_schedules_refresh(self, write_client):
+        def respond(sql, params):
+            if "FROM pharmacy_locations" in sql:
+                return [{"current_validation_level": "L0_mapped"}]
+            if "record_validation_change" in sql:
+                return [{"history_id": "hist-1"}]
+            return []
+
+        with fake_db(FakeCursor(respond)) as cur:
+            resp = write_client.post(
+                "/api/pharmacies/aaaaaaaa-0001-0001-0001-000000000001/verify",
+                json={
+                    "target_level": "L1_contact_confirmed",
+                    "evidence_type": "contact_confirmation",
+                    "actor_id": "test-verifier",
+                    "actor_type": "human_verifier",
+                },
+            )
+        assert resp.status_code == 200
+        cur.timers.assert_called_once()
+        assert cur.statements("REFRESH") == []
+
 
 class TestGeoJSON:
     """GET /api/geojson"""
@@ -182,3 +294,81 @@ class TestGeoJSON:
         assert len(features) == 2
         for f in features:
             assert f["properties"]["state"].lower() == "lagos"
+
+    def test_public_gets_redacted_phone_in_properties(self, client):
+        features = client.get("/api/geojson").json()["features"]
+        phones = [f["properties"]["phone"] for f in features if f["properties"]["phone"]]
+        assert phones
+        assert all("****" in p for p in phones)
+
+    def test_read_tier_gets_full_phone_in_properties(self, read_client):
+        features = read_client.get("/api/geojson").json()["features"]
+        phones = {f["properties"]["phone"] for f in features if f["properties"]["phone"]}
+        assert "+2348012345678" in phones
+
+
+class TestResponseCache:
+    def test_repeat_request_served_from_cache_until_invalidated(self, client):
+        from agent_05_platform_api.src import helpers, response_cache
+
+        assert client.get("/api/pharmacies").json()["meta"]["total"] == 5
+        helpers._RECORDS = helpers._RECORDS[:2]
+        assert client.get("/api/pharmacies").json()["meta"]["total"] == 5
+        response_cache.invalidate()
+        assert client.get("/api/pharmacies").json()["meta"]["total"] == 2
+
+    def test_query_params_are_part_of_key(self, client):
+        assert client.get("/api/pharmacies?state=Lagos").json()["meta"]["total"] == 2
+        assert client.get("/api/pharmacies?state=Kano").json()["meta"]["total"] == 1
+
+    def test_tiers_do_not_share_entries(self, client, read_client):
+        public = client.get("/api/pharmacies?state=Lagos").json()["data"]
+        full = read_client.get("/api/pharmacies?state=Lagos").json()["data"]
+        assert all("****" in r["phone"] for r in public if r.get("phone"))
+        assert "+2348012345678" in {r["phone"] for r in full}
+
+    @pytest.mark.parametrize("path", ["/api/pharmacies", "/api/stats", "/api/geojson"])
+    def test_conditional_get_returns_304(self, client, path):
+        etag = client.get(path).headers["etag"]
+        resp = client.get(path, headers={"If-None-Match": etag})
+        assert resp.status_code == 304
+        assert resp.content == b""
+        assert resp.headers["etag"] == etag
+
+    def test_stale_epoch_is_not_stored(self):
+        from starlette.requests import Request as StarletteRequest
+
+        from agent_05_platform_api.src import response_cache
+        from agent_05_platform_api.src.responses import ORJSONResponse
+
+        req = StarletteRequest({"type": "http", "path": "/api/stats", "query_string": b"", "headers": []})
+        key = response_cache.cache_key(req, "public")
+        epoch = response_cache.current_epoch()
+        response_cache.invalidate()
+        response_cache.put(key, ORJSONResponse({"total": 1}), epoch)
+        assert response_cache.get(key) is None
+
+
+class TestContactColumnByTier:
+    """Only redacted (public-tier) DB queries reference the 011 contact_value_public column."""
+
+    def _sql(self, call) -> str:
+        with fake_db(FakeCursor(lambda sql, params: [("{}",)])) as cur:
+            call()
+        return " ".join(sql for sql, _ in cur.executed)
+
+    @pytest.mark.parametrize("redact", [False, True])
+    def test_geojson(self, redact):
+        from agent_05_platform_api.src.helpers import db_get_geojson
+
+        sql = self._sql(lambda: db_get_geojson(None, None, None, redact_contacts=redact))
+        assert ("contact_value_public" in sql) is redact
+
+    @pytest.mark.parametrize("redact", [False, True])
+    def test_list(self, redact):
+        from agent_05_platform_api.src.helpers import db_list_pharmacies
+
+        sql = self._sql(
+            lambda: db_list_pharmacies(None, None, None, None, None, 10, 0, redact_contacts=redact)
+        )
+        assert ("contact_value_public" in sql) is redact
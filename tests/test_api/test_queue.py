@@ -2,6 +2,10 @@
 
 from __future__ import annotations
 
+import pytest
+
+from .conftest import ADMIN_AUTH_MATRIX, assert_auth_matrix
+
 
 class TestQueueList:
     """GET /api/queue — requires DB + registry_read."""
@@ -10,8 +14,8 @@ class TestQueueList:
         resp = client.get("/api/queue")
         assert resp.status_code == 401
 
-    def test_returns_503_without_db(self, read_client):
-        resp = read_client.get("/api/queue")
+    def test_returns_503_without_db(self, read_503):
+        resp = read_503("/api/queue")
         assert resp.status_code == 503
 
 
@@ -22,24 +26,8 @@ class TestQueueStats:
         resp = client.get("/api/queue/stats")
         assert resp.status_code == 401
 
-    def test_returns_503_without_db(self, read_client):
-        resp = read_client.get("/api/queue/stats")
-        assert resp.status_code == 503
-
-
-class TestQueueGenerate:
-    """POST /api/queue/generate — requires DB + admin."""
-
-    def test_requires_auth(self, client):
-        resp = client.post("/api/queue/generate", json={"target_level": "L1_contact_confirmed"})
-        assert resp.status_code == 401
-
-    def test_requires_admin(self, read_client):
-        resp = read_client.post("/api/queue/generate", json={"target_level": "L1_contact_confirmed"})
-        assert resp.status_code == 403
-
-    def test_returns_503_without_db(self, admin_client):
-        resp = admin_client.post("/api/queue/generate", json={"target_level": "L1_contact_confirmed"})
+    def test_returns_503_without_db(self, read_503):
+        resp = read_503("/api/queue/stats")
         assert resp.status_code == 503
 
 
@@ -82,33 +70,17 @@ class TestQueueSkip:
         assert resp.status_code == 401
 
 
-class TestQueueGenerateReverification:
-    """POST /api/queue/generate-reverification — requires admin + DB."""
-
-    def test_requires_auth(self, client):
-        resp = client.post("/api/queue/generate-reverification", json={})
-        assert resp.status_code == 401
-
-    def test_requires_admin(self, read_client):
-        resp = read_client.post("/api/queue/generate-reverification", json={})
-        assert resp.status_code == 403
-
-    def test_returns_503_without_db(self, admin_client):
-        resp = admin_client.post("/api/queue/generate-reverification", json={})
-        assert resp.status_code == 503
-
-
-class TestProcessDowngrades:
-    """POST /api/queue/process-downgrades — requires admin + DB."""
-
-    def test_requires_auth(self, client):
-        resp = client.post("/api/queue/process-downgrades")
-        assert resp.status_code == 401
-
-    def test_requires_admin(self, read_client):
-        resp = read_client.post("/api/queue/process-downgrades")
-        assert resp.status_code == 403
-
-    def test_returns_503_without_db(self, admin_client):
-        resp = admin_client.post("/api/queue/process-downgrades")
-        assert resp.status_code == 503
+class TestAdminQueueEndpoints:
+    """Admin-only queue jobs — requires admin + DB."""
+
+    @pytest.mark.parametrize("client_fixture,expected", ADMIN_AUTH_MATRIX)
+    @pytest.mark.parametrize(
+        "method,url,kwargs",
+        [
+            pytest.param("POST", "/api/queue/generate", {"json": {"target_level": "L1_contact_confirmed"}}, id="generate"),
+            pytest.param("POST", "/api/queue/generate-reverification", {"json": {}}, id="generate-reverification"),
+            pytest.param("POST", "/api/queue/process-downgrades", {}, id="process-downgrades"),
+        ],
+    )
+    def test_auth_matrix(self, request, client_fixture, expected, method, url, kwargs):
+        assert_auth_matrix(request, client_fixture, expected, method, url, **kwargs)
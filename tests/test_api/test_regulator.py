@@ -2,10 +2,50 @@
 
 from __future__ import annotations
 
+import hashlib
 import io
+from unittest.mock import patch
 
 import pytest
 
+from .conftest import ADMIN_AUTH_MATRIX, FakeCursor, assert_auth_matrix, fake_db
+
+
+_BATCH = "/api/regulator/batches/00000000-0000-0000-0000-000000000001"
+_UPLOAD_CSV = (
+    b"premises_name,registration_number,state,facility_category\n"
+    b"Test Pharmacy,PCN-001,Lagos,community_pharmacy\n"
+)
+
+# (method, url, request kwargs) for every admin-only regulator endpoint
+REGULATOR_ENDPOINTS = [
+    pytest.param(
+        "POST", "/api/regulator/upload?regulator_source=pcn",
+        {"files": {"file": ("test.csv", _UPLOAD_CSV, "text/csv")}},
+        id="upload",
+    ),
+    pytest.param("GET", "/api/regulator/batches", {}, id="batches"),
+    pytest.param("GET", _BATCH, {}, id="batch-detail"),
+    pytest.param("POST", f"{_BATCH}/approve", {"json": {"dry_run": False}}, id="batch-approve"),
+    pytest.param(
+        "POST", f"{_BATCH}/review/00000000-0000-0000-0000-000000000002",
+        {"json": {"action": "approve"}},
+        id="review",
+    ),
+    pytest.param("GET", "/api/regulator/unmatched", {}, id="unmatched"),
+]
+
+
+# ===================================================================
+# Auth matrix — every regulator endpoint requires admin + DB
+# ===================================================================
+
+
+@pytest.mark.parametrize("client_fixture,expected", ADMIN_AUTH_MATRIX)
+@pytest.mark.parametrize("method,url,kwargs", REGULATOR_ENDPOINTS)
+def test_auth_matrix(request, client_fixture, expected, method, url, kwargs):
+    assert_auth_matrix(request, client_fixture, expected, method, url, **kwargs)
+
 
 # ===================================================================
 # Upload endpoint — POST /api/regulator/upload
@@ -13,31 +53,7 @@ import pytest
 
 
 class TestRegulatorUpload:
-    """POST /api/regulator/upload — requires admin + DB."""
-
-    def test_requires_auth(self, client):
-        """Unauthenticated requests get 401."""
-        resp = client.post("/api/regulator/upload?regulator_source=pcn")
-        assert resp.status_code == 401
-
-    def test_requires_admin_not_read(self, read_client):
-        """registry_read tier gets 403."""
-        resp = read_client.post("/api/regulator/upload?regulator_source=pcn")
-        assert resp.status_code == 403
-
-    def test_requires_admin_not_write(self, write_client):
-        """registry_write tier gets 403."""
-        resp = write_client.post("/api/regulator/upload?regulator_source=pcn")
-        assert resp.status_code == 403
-
-    def test_returns_503_without_db(self, admin_client):
-        """Admin gets 503 in JSON fallback mode (no DB)."""
-        csv_content = b"premises_name,registration_number,state,facility_category\nTest Pharmacy,PCN-001,Lagos,community_pharmacy\n"
-        resp = admin_client.post(
-            "/api/regulator/upload?regulator_source=pcn",
-            files={"file": ("test.csv", io.BytesIO(csv_content), "text/csv")},
-        )
-        assert resp.status_code == 503
+    """POST /api/regulator/upload — request validation."""
 
     def test_invalid_regulator_source(self, admin_client):
         """Invalid regulator source returns 400 or 503 (no DB)."""
@@ -47,83 +63,24 @@ class TestRegulatorUpload:
             files={"file": ("test.csv", io.BytesIO(csv_content), "text/csv")},
         )
         # 400 for bad source or 503 for no DB (checked first)
-        assert resp.status_code in (400, 422, 503)
-
-
-# ===================================================================
-# Batches list — GET /api/regulator/batches
-# ===================================================================
-
-
-class TestRegulatorBatches:
-    """GET /api/regulator/batches — requires admin + DB."""
-
-    def test_requires_auth(self, client):
-        resp = client.get("/api/regulator/batches")
-        assert resp.status_code == 401
-
-    def test_requires_admin_not_read(self, read_client):
-        resp = read_client.get("/api/regulator/batches")
-        assert resp.status_code == 403
-
-    def test_requires_admin_not_write(self, write_client):
-        resp = write_client.get("/api/regulator/batches")
-        assert resp.status_code == 403
-
-    def test_returns_503_without_db(self, admin_client):
-        resp = admin_client.get("/api/regulator/batches")
-        assert resp.status_code == 503
-
-
-# ===================================================================
-# Batch detail — GET /api/regulator/batches/{batch_id}
-# ===================================================================
-
-
-class TestRegulatorBatchDetail:
-    """GET /api/regulator/batches/{batch_id} — requires admin + DB."""
-
-    def test_requires_auth(self, client):
-        resp = client.get("/api/regulator/batches/00000000-0000-0000-0000-000000000001")
-        assert resp.status_code == 401
-
-    def test_requires_admin(self, read_client):
-        resp = read_client.get("/api/regulator/batches/00000000-0000-0000-0000-000000000001")
-        assert resp.status_code == 403
-
-    def test_returns_503_without_db(self, admin_client):
-        resp = admin_client.get("/api/regulator/batches/00000000-0000-0000-0000-000000000001")
-        assert resp.status_code == 503
-
-
-# ===================================================================
-# Batch approve — POST /api/regulator/batches/{batch_id}/approve
-# ===================================================================
-
-
-class TestRegulatorBatchApprove:
-    """POST /api/regulator/batches/{batch_id}/approve — requires admin + DB."""
-
-    def test_requires_auth(self, client):
-        resp = client.post(
-            "/api/regulator/batches/00000000-0000-0000-0000-000000000001/approve",
-            json={"dry_run": False},
-        )
-        assert resp.status_code == 401
-
-    def test_requires_admin(self, write_client):
-        resp = write_client.post(
-            "/api/regulator/batches/00000000-0000-0000-0000-000000000001/approve",
-            json={"dry_run": False},
-        )
-        assert resp.status_code == 403
-
-    def test_returns_503_without_db(self, admin_client):
-        resp = admin_client.post(
-            "/api/regulator/batches/00000000-0000-0000-0000-000000000001/approve",
-            json={"dry_run": False},
-        )
-        assert resp.status_code == 503
+        assert resp.status_code in {400, 422, 503}
+
+    def test_hashes_the_upload_then_parses_it(self, admin_client):
+        from agent_05_platform_api.src.routes import regulator
+
+        with (
+            fake_db(FakeCursor()),
+            patch.object(regulator, "create_batch", return_value="batch-1") as create_batch,
+            patch.object(regulator, "stage_records"),
+            patch.object(regulator, "match_staged_records", return_value={"auto_matched": 0}),
+        ):
+            resp = admin_client.post(
+                "/api/regulator/upload?regulator_source=pcn",
+                files={"file": ("test.csv", _UPLOAD_CSV, "text/csv")},
+            )
+        assert resp.status_code == 200
+        assert resp.json()["record_count"] == 1
+        assert create_batch.call_args.kwargs["file_hash"] == hashlib.sha256(_UPLOAD_CSV).hexdigest()
 
 
 # ===================================================================
@@ -132,57 +89,15 @@ class TestRegulatorBatchApprove:
 
 
 class TestRegulatorReview:
-    """POST /api/regulator/batches/{batch_id}/review/{record_id} — requires admin + DB."""
-
-    def test_requires_auth(self, client):
-        resp = client.post(
-            "/api/regulator/batches/00000000-0000-0000-0000-000000000001/review/00000000-0000-0000-0000-000000000002",
-            json={"action": "approve"},
-        )
-        assert resp.status_code == 401
-
-    def test_requires_admin(self, write_client):
-        resp = write_client.post(
-            "/api/regulator/batches/00000000-0000-0000-0000-000000000001/review/00000000-0000-0000-0000-000000000002",
-            json={"action": "approve"},
-        )
-        assert resp.status_code == 403
-
-    def test_returns_503_without_db(self, admin_client):
-        resp = admin_client.post(
-            "/api/regulator/batches/00000000-0000-0000-0000-000000000001/review/00000000-0000-0000-0000-000000000002",
-            json={"action": "approve"},
-        )
-        assert resp.status_code == 503
+    """POST /api/regulator/batches/{batch_id}/review/{record_id} — request validation."""
 
     def test_invalid_action_returns_error(self, admin_client):
         """Invalid action returns 400 or 503."""
         resp = admin_client.post(
-            "/api/regulator/batches/00000000-0000-0000-0000-000000000001/review/00000000-0000-0000-0000-000000000002",
+            f"{_BATCH}/review/00000000-0000-0000-0000-000000000002",
             json={"action": "maybe"},
         )
-        assert resp.status_code in (400, 503)
-
-
-# ===================================================================
-# Unmatched — GET /api/regulator/unmatched
-# ===================================================================
-
-
-class TestRegulatorUnmatched:
-    """GET /api/regulator/unmatched — requires admin + DB."""
-
-    def test_requires_auth(self, client):
-        resp = client.get("/api/regulator/unmatched")
-        assert resp.status_code == 401
-
-    def test_requires_admin(self, read_client):
-        resp = read_client.get("/api/regulator/unmatched")
-        assert resp.status_code == 403
-
-    def test_returns_503_without_db(self, admin_client):
-        resp = admin_client.get("/api/regulator/unmatched")
-        assert resp.status_code == 503
+        assert resp.status_code in {400, 503}
 
 
 # ===================================================================
@@ -327,12 +242,65 @@ class TestCsvParsing:
         assert len(records) == 1
         assert records[0]["raw_name"] == "BOM Pharmacy"
 
+    def test_parse_csv_uppercase_headers_and_ragged_rows(self):
+        from agent_05_platform_api.src.regulator_sync import parse_csv
+
+        csv_bytes = (
+            b"PREMISES_NAME,REGISTRATION_NUMBER,STATE,PHONE\n"
+            b"Short Row Pharmacy,PCN-1\n"
+            b"\n"
+            b"Long Row Pharmacy,PCN-2,Oyo,0803,overflow\n"
+        )
+        records = parse_csv(csv_bytes, "pcn", max_records=100)
+        assert [r["raw_name"] for r in records] == ["Short Row Pharmacy", "Long Row Pharmacy"]
+        assert records[0]["raw_state"] is None
+        assert records[0]["raw_data"]["PHONE"] is None
+        assert records[1]["raw_phone"] == "0803"
+        assert records[1]["raw_data"][None] == ["overflow"]
+
 
 # ===================================================================
 # File hash — unit tests
 # ===================================================================
 
 
+class TestStagingCopyBuffer:
+    """Unit tests for the COPY payload used by stage_records."""
+
+    def test_round_trips_through_csv(self):
+        import csv
+        import json
+
+        from agent_05_platform_api.src.regulator_sync import (
+            _STAGING_COPY_COLUMNS,
+            _staging_copy_buffer,
+        )
+
+        records = [
+            {
+                "raw_name": 'Quote "and", comma Pharmacy',
+                "raw_registration_id": "PCN-1",
+                "raw_state": "Lagos",
+                "raw_lga": None,
+                "raw_address": "Line 1\nLine 2",
+                "raw_phone": None,
+                "raw_facility_category": None,
+                "raw_data": {"premises_name": 'Quote "and", comma Pharmacy'},
+            },
+        ]
+        buf = _staging_copy_buffer("batch-1", records, "pcn", "admin:test")
+        raw = buf.getvalue()
+        rows = list(csv.reader(buf))
+
+        assert len(rows) == 1
+        row = dict(zip(_STAGING_COPY_COLUMNS, rows[0]))
+        assert row["raw_name"] == 'Quote "and", comma Pharmacy'
+        assert row["raw_address"] == "Line 1\nLine 2"
+        assert json.loads(row["raw_data"]) == records[0]["raw_data"]
+        # None must be an unquoted empty field so COPY reads it as NULL
+        assert ',"",' not in raw
+
+
 class TestFileHash:
     """Unit tests for file hash computation."""
 
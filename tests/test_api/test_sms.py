@@ -2,210 +2,83 @@
 
 from __future__ import annotations
 
+import hashlib
+import hmac
 import os
+import uuid
 from unittest.mock import patch
 
 import pytest
+from starlette.datastructures import Headers
+from starlette.requests import Request
 
+from agent_05_platform_api.src import sms_processor, webhook_auth
+from agent_05_platform_api.src.evidence_validator import validate_evidence_detail
+from agent_05_platform_api.src.sms_processor import (
+    DEFAULT_MESSAGE_TEMPLATE,
+    build_sms_evidence,
+    parse_reply,
+    render_message,
+)
 
-# ===================================================================
-# Campaign CRUD — POST /api/sms/campaigns
-# ===================================================================
-
-
-class TestSmsCampaignCreate:
-    """POST /api/sms/campaigns — requires admin + DB."""
-
-    def test_requires_auth(self, client):
-        resp = client.post("/api/sms/campaigns", json={"campaign_name": "Test"})
-        assert resp.status_code == 401
-
-    def test_requires_admin_not_read(self, read_client):
-        resp = read_client.post("/api/sms/campaigns", json={"campaign_name": "Test"})
-        assert resp.status_code == 403
-
-    def test_requires_admin_not_write(self, write_client):
-        resp = write_client.post("/api/sms/campaigns", json={"campaign_name": "Test"})
-        assert resp.status_code == 403
-
-    def test_returns_503_without_db(self, admin_client):
-        resp = admin_client.post(
-            "/api/sms/campaigns",
-            json={"campaign_name": "Test Campaign"},
-        )
-        assert resp.status_code == 503
-
-    def test_validates_max_attempts_range(self, admin_client):
-        resp = admin_client.post(
-            "/api/sms/campaigns",
-            json={"campaign_name": "Test", "max_attempts": 10},
-        )
-        assert resp.status_code == 422  # pydantic validation (le=5)
-
-    def test_validates_retry_interval_range(self, admin_client):
-        resp = admin_client.post(
-            "/api/sms/campaigns",
-            json={"campaign_name": "Test", "retry_interval_hours": 5},
-        )
-        assert resp.status_code == 422  # pydantic validation (ge=12)
-
-
-# ===================================================================
-# Campaign List — GET /api/sms/campaigns
-# ===================================================================
-
-
-class TestSmsCampaignList:
-    """GET /api/sms/campaigns — requires admin + DB."""
-
-    def test_requires_auth(self, client):
-        resp = client.get("/api/sms/campaigns")
-        assert resp.status_code == 401
+from .conftest import ADMIN_AUTH_MATRIX, FakeCursor, assert_auth_matrix, fake_db
 
-    def test_requires_admin_not_read(self, read_client):
-        resp = read_client.get("/api/sms/campaigns")
-        assert resp.status_code == 403
 
-    def test_returns_503_without_db(self, admin_client):
-        resp = admin_client.get("/api/sms/campaigns")
-        assert resp.status_code == 503
-
-
-# ===================================================================
-# Campaign Detail — GET /api/sms/campaigns/{campaign_id}
-# ===================================================================
+_CAMPAIGN = "/api/sms/campaigns/some-id"
 
+# (method, url, request kwargs) for every admin-only campaign endpoint
+CAMPAIGN_ENDPOINTS = [
+    pytest.param("POST", "/api/sms/campaigns", {"json": {"campaign_name": "Test Campaign"}}, id="create"),
+    pytest.param("GET", "/api/sms/campaigns", {}, id="list"),
+    pytest.param("GET", _CAMPAIGN, {}, id="detail"),
+    pytest.param("POST", f"{_CAMPAIGN}/launch", {}, id="launch"),
+    pytest.param("GET", f"{_CAMPAIGN}/outbox", {}, id="outbox"),
+    pytest.param(
+        "POST", f"{_CAMPAIGN}/mark-sent",
+        {"json": {"message_ids": ["msg-001"], "provider_ids": None}},
+        id="mark-sent",
+    ),
+    pytest.param("POST", f"{_CAMPAIGN}/retry", {}, id="retry"),
+    pytest.param("GET", f"{_CAMPAIGN}/results", {}, id="results"),
+]
 
-class TestSmsCampaignDetail:
-    """GET /api/sms/campaigns/{campaign_id} — requires admin + DB."""
 
-    def test_requires_auth(self, client):
-        resp = client.get("/api/sms/campaigns/some-id")
-        assert resp.status_code == 401
-
-    def test_requires_admin(self, write_client):
-        resp = write_client.get("/api/sms/campaigns/some-id")
-        assert resp.status_code == 403
-
-    def test_returns_503_without_db(self, admin_client):
-        resp = admin_client.get("/api/sms/campaigns/some-id")
-        assert resp.status_code == 503
+def _sha256(value: str) -> bytes:
+    return hashlib.sha256(value.encode()).digest()
 
 
 # ===================================================================
-# Campaign Launch — POST /api/sms/campaigns/{campaign_id}/launch
+# Auth matrix — every campaign endpoint requires admin + DB
 # ===================================================================
 
 
-class TestSmsCampaignLaunch:
-    """POST /api/sms/campaigns/{campaign_id}/launch — requires admin + DB."""
+@pytest.mark.parametrize("client_fixture,expected", ADMIN_AUTH_MATRIX)
+@pytest.mark.parametrize("method,url,kwargs", CAMPAIGN_ENDPOINTS)
+def test_auth_matrix(request, client_fixture, expected, method, url, kwargs):
+    assert_auth_matrix(request, client_fixture, expected, method, url, **kwargs)
 
-    def test_requires_auth(self, client):
-        resp = client.post("/api/sms/campaigns/some-id/launch")
-        assert resp.status_code == 401
 
-    def test_requires_admin(self, write_client):
-        resp = write_client.post("/api/sms/campaigns/some-id/launch")
-        assert resp.status_code == 403
-
-    def test_returns_503_without_db(self, admin_client):
-        resp = admin_client.post("/api/sms/campaigns/some-id/launch")
-        assert resp.status_code == 503
-
-
-# ===================================================================
-# Outbox — GET /api/sms/campaigns/{campaign_id}/outbox
 # ===================================================================
-
-
-class TestSmsOutbox:
-    """GET /api/sms/campaigns/{campaign_id}/outbox — requires admin + DB."""
-
-    def test_requires_auth(self, client):
-        resp = client.get("/api/sms/campaigns/some-id/outbox")
-        assert resp.status_code == 401
-
-    def test_requires_admin(self, read_client):
-        resp = read_client.get("/api/sms/campaigns/some-id/outbox")
-        assert resp.status_code == 403
-
-    def test_returns_503_without_db(self, admin_client):
-        resp = admin_client.get("/api/sms/campaigns/some-id/outbox")
-        assert resp.status_code == 503
-
-
-# ===================================================================
-# Mark Sent — POST /api/sms/campaigns/{campaign_id}/mark-sent
+# Campaign CRUD — POST /api/sms/campaigns
 # ===================================================================
 
 
-class TestSmsMarkSent:
-    """POST /api/sms/campaigns/{campaign_id}/mark-sent — requires admin + DB."""
-
-    _body = {"message_ids": ["msg-001"], "provider_ids": None}
-
-    def test_requires_auth(self, client):
-        resp = client.post(
-            "/api/sms/campaigns/some-id/mark-sent",
-            json=self._body,
-        )
-        assert resp.status_code == 401
+class TestSmsCampaignCreate:
+    """POST /api/sms/campaigns — request validation."""
 
-    def test_requires_admin(self, write_client):
-        resp = write_client.post(
-            "/api/sms/campaigns/some-id/mark-sent",
-            json=self._body,
+    def test_validates_max_attempts_range(self, admin_client):
+        resp = admin_client.post(
+            "/api/sms/campaigns",
+            json={"campaign_name": "Test", "max_attempts": 10},
         )
-        assert resp.status_code == 403
+        assert resp.status_code == 422  # pydantic validation (le=5)
 
-    def test_returns_503_without_db(self, admin_client):
+    def test_validates_retry_interval_range(self, admin_client):
         resp = admin_client.post(
-            "/api/sms/campaigns/some-id/mark-sent",
-            json=self._body,
+            "/api/sms/campaigns",
+            json={"campaign_name": "Test", "retry_interval_hours": 5},
         )
-        assert resp.status_code == 503
-
-
-# ===================================================================
-# Retry — POST /api/sms/campaigns/{campaign_id}/retry
-# ===================================================================
-
-
-class TestSmsRetry:
-    """POST /api/sms/campaigns/{campaign_id}/retry — requires admin + DB."""
-
-    def test_requires_auth(self, client):
-        resp = client.post("/api/sms/campaigns/some-id/retry")
-        assert resp.status_code == 401
-
-    def test_requires_admin(self, write_client):
-        resp = write_client.post("/api/sms/campaigns/some-id/retry")
-        assert resp.status_code == 403
-
-    def test_returns_503_without_db(self, admin_client):
-        resp = admin_client.post("/api/sms/campaigns/some-id/retry")
-        assert resp.status_code == 503
-
-
-# ===================================================================
-# Results — GET /api/sms/campaigns/{campaign_id}/results
-# ===================================================================
-
-
-class TestSmsResults:
-    """GET /api/sms/campaigns/{campaign_id}/results — requires admin + DB."""
-
-    def test_requires_auth(self, client):
-        resp = client.get("/api/sms/campaigns/some-id/results")
-        assert resp.status_code == 401
-
-    def test_requires_admin(self, read_client):
-        resp = read_client.get("/api/sms/campaigns/some-id/results")
-        assert resp.status_code == 403
-
-    def test_returns_503_without_db(self, admin_client):
-        resp = admin_client.get("/api/sms/campaigns/some-id/results")
-        assert resp.status_code == 503
+        assert resp.status_code == 422  # pydantic validation (ge=12)
 
 
 # ===================================================================
@@ -250,6 +123,88 @@ class TestSmsDeliveryWebhook:
             )
             assert resp.status_code == 503
 
+    def test_bad_secret_rejected_before_body_is_read(self, client):
+        """The webhook middleware answers 401 without touching a large body."""
+        real_stream = Request.stream
+        reads = []
+
+        def spy(self):
+            reads.append(self.url.path)
+            return real_stream(self)
+
+        big_body = b'{"provider_message_id": "' + b"x" * (10 * 1024 * 1024) + b'", "status": "delivered"}'
+        with patch.dict(os.environ, {"SMS_WEBHOOK_SECRET": "test-secret-123"}), \
+                patch.object(Request, "stream", spy):
+            resp = client.post(
+                "/api/sms/webhook/delivery",
+                content=big_body,
+                headers={"X-SMS-Webhook-Secret": "wrong-secret", "Content-Type": "application/json"},
+            )
+        assert resp.status_code == 401
+        assert reads == []
+
+    @pytest.mark.parametrize("provided", ["test-secret-123", "test-secret-999"])
+    def test_comparison_is_constant_time(self, client, provided):
+        """Both matching and mismatching secrets go through hmac.compare_digest, as digests."""
+        calls = []
+        real = hmac.compare_digest
+
+        def spy(a, b):
+            calls.append((a, b))
+            return real(a, b)
+
+        with patch.dict(os.environ, {"SMS_WEBHOOK_SECRET": "test-secret-123"}), \
+                patch.object(hmac, "compare_digest", spy):
+            client.post(
+                "/api/sms/webhook/delivery",
+                json={"provider_message_id": "msg-001", "status": "delivered"},
+                headers={"X-SMS-Webhook-Secret": provided},
+            )
+        # middleware, then the route's own check when the secret matches
+        assert calls
+        assert set(calls) == {(_sha256(provided), _sha256("test-secret-123"))}
+
+    def test_secret_read_once_until_cache_cleared(self):
+        headers = Headers({"X-SMS-Webhook-Secret": "first"})
+        with patch.dict(os.environ, {"SMS_WEBHOOK_SECRET": "first"}):
+            assert webhook_auth.sms_secret_ok(headers)
+        with patch.dict(os.environ, {"SMS_WEBHOOK_SECRET": "second"}):
+            assert webhook_auth.sms_secret_ok(headers)  # still the cached value
+            webhook_auth.clear_secret_cache()
+            assert not webhook_auth.sms_secret_ok(headers)
+
+    def test_invalid_body_returns_422(self, client):
+        with patch.dict(os.environ, {"SMS_WEBHOOK_SECRET": "test-secret-123"}), \
+                patch("agent_05_platform_api.src.db.is_available", return_value=True):
+            missing = client.post(
+                "/api/sms/webhook/delivery",
+                json={"status": "delivered"},
+                headers={"X-SMS-Webhook-Secret": "test-secret-123"},
+            )
+            malformed = client.post(
+                "/api/sms/webhook/delivery",
+                content=b"{not json",
+                headers={"X-SMS-Webhook-Secret": "test-secret-123", "Content-Type": "application/json"},
+            )
+        assert missing.status_code == 422
+        assert missing.json()["detail"][0]["loc"] == ["body", "provider_message_id"]
+        assert malformed.status_code == 422
+
+    def test_db_checked_before_body_is_decoded(self, client):
+        """Without a DB the webhook answers 503 even for a body it could not parse."""
+        with patch.dict(os.environ, {"SMS_WEBHOOK_SECRET": "test-secret-123"}):
+            resp = client.post(
+                "/api/sms/webhook/delivery",
+                content=b"{not json",
+                headers={"X-SMS-Webhook-Secret": "test-secret-123", "Content-Type": "application/json"},
+            )
+        assert resp.status_code == 503
+
+    def test_body_schema_documented(self, client):
+        op = client.get("/openapi.json").json()["paths"]["/api/sms/webhook/delivery"]["post"]
+        schema = op["requestBody"]["content"]["application/json"]["schema"]
+        assert "provider_message_id" in schema["required"]
+
 
 # ===================================================================
 # Webhook — inbound reply
@@ -302,47 +257,33 @@ class TestReplyParsing:
     """Unit tests for parse_reply()."""
 
     def test_parse_yes_variants(self):
-        from agent_05_platform_api.src.sms_processor import parse_reply
-
         for word in ["YES", "yes", "Yes", "Y", "y", "1", "yep", "ok", "yeah", "yea"]:
             assert parse_reply(word) == "operating", f"Failed for '{word}'"
 
     def test_parse_no_variants(self):
-        from agent_05_platform_api.src.sms_processor import parse_reply
-
         for word in ["NO", "no", "No", "N", "n", "2", "CLOSED", "closed", "nope"]:
             assert parse_reply(word) == "closed", f"Failed for '{word}'"
 
     def test_parse_moved_variants(self):
-        from agent_05_platform_api.src.sms_processor import parse_reply
-
         for word in ["MOVED", "moved", "3", "relocated", "RELOCATED"]:
             assert parse_reply(word) == "relocated", f"Failed for '{word}'"
 
     def test_parse_with_whitespace(self):
-        from agent_05_platform_api.src.sms_processor import parse_reply
-
         assert parse_reply("  YES  ") == "operating"
         assert parse_reply("\nyes\n") == "operating"
         assert parse_reply("  no  ") == "closed"
 
     def test_parse_first_word_extraction(self):
-        from agent_05_platform_api.src.sms_processor import parse_reply
-
         assert parse_reply("Yes we are open") == "operating"
         assert parse_reply("No we closed last month") == "closed"
         assert parse_reply("Moved to new location") == "relocated"
 
     def test_parse_unknown_returns_none(self):
-        from agent_05_platform_api.src.sms_processor import parse_reply
-
         assert parse_reply("hello world") is None
         assert parse_reply("maybe") is None
         assert parse_reply("what is this") is None
 
     def test_parse_empty_returns_none(self):
-        from agent_05_platform_api.src.sms_processor import parse_reply
-
         assert parse_reply("") is None
         assert parse_reply("   ") is None
         assert parse_reply(None) is None
@@ -352,11 +293,6 @@ class TestMessageRendering:
     """Unit tests for render_message()."""
 
     def test_basic_rendering(self):
-        from agent_05_platform_api.src.sms_processor import (
-            DEFAULT_MESSAGE_TEMPLATE,
-            render_message,
-        )
-
         msg = render_message(
             DEFAULT_MESSAGE_TEMPLATE,
             "MedPlus Pharmacy",
@@ -368,29 +304,43 @@ class TestMessageRendering:
         assert "aaaaaaaa" in msg  # msg_id_short
 
     def test_handles_none_address(self):
-        from agent_05_platform_api.src.sms_processor import (
-            DEFAULT_MESSAGE_TEMPLATE,
-            render_message,
-        )
-
         msg = render_message(DEFAULT_MESSAGE_TEMPLATE, "Test Pharm", None, "abc12345")
         assert "Test Pharm" in msg
         assert "your location" in msg  # fallback for None address
 
     def test_custom_template(self):
-        from agent_05_platform_api.src.sms_processor import render_message
-
         template = "Is {pharmacy_name} open? Ref:{msg_id_short}"
         msg = render_message(template, "Kano PPMV", "5 Main St", "aabbccdd-1234")
         assert msg == "Is Kano PPMV open? Ref:aabbccdd"
 
+    def test_msg_id_short_is_first_eight_chars(self):
+        template = "Ref:{msg_id_short}"
+        assert render_message(template, "P", None, "aabbccdd-1234") == "Ref:aabbccdd"
+        assert render_message(template, "P", None, "aabbccddeeff") == "Ref:aabbccdd"
+        assert render_message(template, "P", None, "abc") == "Ref:abc"
+        assert render_message(template, "P", None, "") == "Ref:00000000"
+
+    def test_uuid_msg_id_matches_string_form(self):
+        msg_id = uuid.UUID("aabbccdd-0001-0001-0001-000000000001")
+        template = "Ref:{msg_id_short}"
+        assert render_message(template, "P", None, msg_id) == render_message(
+            template, "P", None, str(msg_id)
+        ) == "Ref:aabbccdd"
+
+    def test_matches_str_format(self):
+        values = {"pharmacy_name": "100% Pharm", "address": "5 Main St", "msg_id_short": "aabbccdd"}
+        for template in (
+            "{{Ref}} {pharmacy_name} 50% off at {address}",  # escaped braces, literal %
+            "{pharmacy_name!r} at {address:>12}",  # spec/conversion — format_map fallback
+        ):
+            msg = render_message(template, "100% Pharm", "5 Main St", "aabbccdd-1234")
+            assert msg == template.format(**values)
+
 
 class TestEvidenceConstruction:
     """Unit tests for build_sms_evidence()."""
 
     def test_evidence_has_required_contact_fields(self):
-        from agent_05_platform_api.src.sms_processor import build_sms_evidence
-
         evidence = build_sms_evidence(
             phone_number="+2348012345678",
             pharmacy_name="Test Pharmacy",
@@ -408,8 +358,6 @@ class TestEvidenceConstruction:
         assert cd["facility_name_confirmed"] == "Test Pharmacy"
 
     def test_evidence_has_sms_metadata(self):
-        from agent_05_platform_api.src.sms_processor import build_sms_evidence
-
         evidence = build_sms_evidence(
             phone_number="+2348012345678",
             pharmacy_name="Test Pharmacy",
@@ -425,9 +373,6 @@ class TestEvidenceConstruction:
         assert meta["phone_number"] == "+2348012345678"
 
     def test_evidence_passes_contact_validator(self):
-        from agent_05_platform_api.src.evidence_validator import validate_evidence_detail
-        from agent_05_platform_api.src.sms_processor import build_sms_evidence
-
         evidence = build_sms_evidence(
             phone_number="+2348012345678",
             pharmacy_name="Test Pharmacy",
@@ -440,9 +385,6 @@ class TestEvidenceConstruction:
         assert errors == [], f"Validation errors: {errors}"
 
     def test_evidence_passes_validator_for_closed(self):
-        from agent_05_platform_api.src.evidence_validator import validate_evidence_detail
-        from agent_05_platform_api.src.sms_processor import build_sms_evidence
-
         evidence = build_sms_evidence(
             phone_number="+2348012345678",
             pharmacy_name="Test Pharmacy",
@@ -455,9 +397,6 @@ class TestEvidenceConstruction:
         assert errors == []
 
     def test_evidence_passes_validator_for_relocated(self):
-        from agent_05_platform_api.src.evidence_validator import validate_evidence_detail
-        from agent_05_platform_api.src.sms_processor import build_sms_evidence
-
         evidence = build_sms_evidence(
             phone_number="+2348012345678",
             pharmacy_name="Test Pharmacy",
@@ -470,8 +409,6 @@ class TestEvidenceConstruction:
         assert errors == []
 
     def test_respondent_name_includes_phone(self):
-        from agent_05_platform_api.src.sms_processor import build_sms_evidence
-
         evidence = build_sms_evidence(
             phone_number="+2348099887766",
             pharmacy_name="Test",
@@ -481,3 +418,54 @@ class TestEvidenceConstruction:
             message_id="m1",
         )
         assert "+2348099887766" in evidence["contact_details"]["respondent_name"]
+
+
+class TestDeduplication:
+    """Unit tests for recipient and inbound-reply deduplication."""
+
+    def test_targets_deduped_by_phone_keeping_first(self):
+        rows = [
+            {"pharmacy_id": "a", "phone_number": "+2348012345678"},
+            {"pharmacy_id": "b", "phone_number": " +234 801 234 5678 "},
+            {"pharmacy_id": "c", "phone_number": "+2348099887766"},
+        ]
+        targets = sms_processor._dedupe_by_phone(rows)
+        assert [t["pharmacy_id"] for t in targets] == ["a", "c"]
+
+    def test_recent_reply_returned_within_ttl(self):
+        key = ("+2348012345678", "ATXid_dedup")
+        result = {"success": True, "message_id": "m1"}
+        try:
+            assert sms_processor._recent_reply_get(key) is None
+            assert sms_processor._recent_reply_set(key, result) is result
+            assert sms_processor._recent_reply_get(key) is result
+            with patch.object(sms_processor.time, "time", return_value=10**12):
+                assert sms_processor._recent_reply_get(key) is None
+        finally:
+            sms_processor._RECENT_REPLIES.pop(key, None)
+
+    def _reply_twice(self, provider_message_id):
+        def respond(sql, params):
+            if "FROM sms_messages sm" in sql:
+                return [{"id": "m1", "campaign_id": "c1", "pharmacy_id": "p1",
+                         "phone_number": "+2348012345678", "pharmacy_name": "MedPlus",
+                         "status": "delivered"}]
+            return []
+
+        with (
+            fake_db(FakeCursor(respond)) as cur,
+            patch.object(sms_processor, "promote_pharmacy_via_sms", return_value={"history_id": "h1"}),
+        ):
+            for _ in range(2):
+                sms_processor.process_inbound_reply("+2348012345678", "YES", provider_message_id)
+        return len(cur.statements("FROM sms_messages sm"))
+
+    def test_repeated_provider_id_answered_from_memory(self):
+        try:
+            assert self._reply_twice("ATXid_replay") == 1
+        finally:
+            sms_processor._RECENT_REPLIES.pop(("+2348012345678", "ATXid_replay"), None)
+
+    def test_same_text_without_provider_id_processed_twice(self):
+        assert self._reply_twice(None) == 2
+        assert not any(key[0] == "+2348012345678" for key in sms_processor._RECENT_REPLIES)
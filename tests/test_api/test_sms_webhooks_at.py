@@ -2,11 +2,19 @@
 
 from __future__ import annotations
 
+import hashlib
+import hmac
 import os
 from unittest.mock import patch
 
 import pytest
 
+from agent_05_platform_api.src.routes.sms_webhooks_at import _AT_INTERMEDIATE, _AT_STATUS_MAP
+
+
+def _sha256(value: str) -> bytes:
+    return hashlib.sha256(value.encode()).digest()
+
 
 # ===================================================================
 # AT Delivery Webhook — POST /api/sms/at/delivery
@@ -43,6 +51,27 @@ class TestAtDeliveryWebhook:
             )
         assert resp.status_code == 401
 
+    @pytest.mark.parametrize("provided", ["real-secret", "real-secreX"])
+    def test_comparison_is_constant_time(self, client, provided):
+        """Both matching and mismatching secrets go through hmac.compare_digest, as digests."""
+        calls = []
+        real = hmac.compare_digest
+
+        def spy(a, b):
+            calls.append((a, b))
+            return real(a, b)
+
+        with patch.dict(os.environ, {"AT_WEBHOOK_SECRET": "real-secret"}), \
+                patch.object(hmac, "compare_digest", spy):
+            client.post(
+                "/api/sms/at/delivery",
+                data={"id": "ATXid_123", "status": "Sent"},
+                headers={"X-AT-Webhook-Secret": provided},
+            )
+        # middleware, then the route's own check when the secret matches
+        assert calls
+        assert set(calls) == {(_sha256(provided), _sha256("real-secret"))}
+
     def test_skips_intermediate_status_sent(self, client):
         with patch.dict(os.environ, {"AT_WEBHOOK_SECRET": "at-test-secret"}):
             resp = client.post(
@@ -151,6 +180,22 @@ class TestAtDeliveryWebhook:
             )
         assert resp.status_code == 422
 
+    def test_blank_required_field_treated_as_missing(self, client):
+        with patch.dict(os.environ, {"AT_WEBHOOK_SECRET": "at-test-secret"}):
+            resp = client.post(
+                "/api/sms/at/delivery",
+                data={"id": "", "status": "Sent"},
+                headers={"X-AT-Webhook-Secret": "at-test-secret"},
+            )
+        assert resp.status_code == 422
+        assert resp.json()["detail"][0]["loc"] == ["body", "id"]
+
+    def test_form_fields_documented(self, client):
+        op = client.get("/openapi.json").json()["paths"]["/api/sms/at/delivery"]["post"]
+        schema = op["requestBody"]["content"]["application/x-www-form-urlencoded"]["schema"]
+        assert schema["required"] == ["id", "status"]
+        assert set(schema["properties"]) == {"id", "status", "failureReason", "phoneNumber"}
+
 
 # ===================================================================
 # AT Reply Webhook — POST /api/sms/at/reply
@@ -247,21 +292,20 @@ class TestAtStatusMapping:
     """Verify AT status values map correctly to internal statuses."""
 
     def test_success_maps_to_delivered(self):
-        from agent_05_platform_api.src.routes.sms_webhooks_at import _AT_STATUS_MAP
         assert _AT_STATUS_MAP["Success"] == "delivered"
 
     def test_failed_maps_to_failed(self):
-        from agent_05_platform_api.src.routes.sms_webhooks_at import _AT_STATUS_MAP
         assert _AT_STATUS_MAP["Failed"] == "failed"
 
     def test_rejected_maps_to_failed(self):
-        from agent_05_platform_api.src.routes.sms_webhooks_at import _AT_STATUS_MAP
         assert _AT_STATUS_MAP["Rejected"] == "failed"
 
     def test_sent_is_intermediate(self):
-        from agent_05_platform_api.src.routes.sms_webhooks_at import _AT_INTERMEDIATE
         assert "Sent" in _AT_INTERMEDIATE
 
     def test_buffered_is_intermediate(self):
-        from agent_05_platform_api.src.routes.sms_webhooks_at import _AT_INTERMEDIATE
         assert "Buffered" in _AT_INTERMEDIATE
+
+    def test_intermediate_and_terminal_are_disjoint(self):
+        assert isinstance(_AT_INTERMEDIATE, frozenset)
+        assert _AT_INTERMEDIATE.isdisjoint(_AT_STATUS_MAP)
@@ -2,23 +2,216 @@
 
 from __future__ import annotations
 
+import time
+from unittest.mock import patch
+
+import pytest
+
+from .conftest import ADMIN_AUTH_MATRIX, FakeCursor, assert_auth_matrix, fake_db
+
+
+# Expected status per client fixture for a registry_write, DB-only endpoint.
+WRITE_AUTH_MATRIX = [
+    ("client", 401),
+    ("read_client", 403),
+    ("write_client", 503),
+    ("admin_client", 503),
+]
+
+_VERIFY_BODY = {
+    "target_level": "L1_contact_confirmed",
+    "evidence_type": "contact_confirmation",
+    "actor_id": "test-verifier",
+    "actor_type": "human_verifier",
+}
+
 
 class TestVerifyEndpoint:
     """POST /api/pharmacies/{pharmacy_id}/verify — requires DB + registry_write."""
 
+    @pytest.mark.parametrize("client_fixture,expected", WRITE_AUTH_MATRIX)
+    def test_auth_matrix(self, request, client_fixture, expected):
+        assert_auth_matrix(
+            request, client_fixture, expected,
+            "POST", "/api/pharmacies/aaaaaaaa-0001-0001-0001-000000000001/verify",
+            json=_VERIFY_BODY,
+        )
+
     def test_requires_db(self, write_client):
         resp = write_client.post(
             "/api/pharmacies/aaaaaaaa-0001-0001-0001-000000000001/verify",
-            json={
-                "target_level": "L1_contact_confirmed",
-                "evidence_type": "contact_confirmation",
-                "actor_id": "test-verifier",
-                "actor_type": "human_verifier",
-            },
+            json=_VERIFY_BODY,
         )
         assert resp.status_code == 503
         assert "Database unavailable" in resp.json()["detail"]
 
+    def test_records_change_provenance_and_audit(self, write_client):
+        def respond(sql, params):
+            if "FROM pharmacy_locations" in sql:
+                return [{"current_validation_level": "L0_mapped"}]
+            if "record_validation_change" in sql:
+                return [{"history_id": "hist-1"}]
+            return []
+
+        with fake_db(FakeCursor(respond)) as cur:
+            resp = write_client.post(
+                "/api/pharmacies/aaaaaaaa-0001-0001-0001-000000000001/verify",
+                json=_VERIFY_BODY,
+            )
+        assert resp.status_code == 200
+        assert resp.json()["history_id"] == "hist-1"
+        for fragment in ("record_validation_change", "log_provenance", "log_audit"):
+            assert len(cur.statements(fragment)) == 1
+
+
+class TestVerifyBatchEndpoint:
+    """POST /api/pharmacies/verify-batch — requires DB + registry_write."""
+
+    @pytest.mark.parametrize("client_fixture,expected", WRITE_AUTH_MATRIX)
+    def test_auth_matrix(self, request, client_fixture, expected):
+        assert_auth_matrix(
+            request, client_fixture, expected,
+            "POST", "/api/pharmacies/verify-batch",
+            json={"items": [{**_VERIFY_BODY, "pharmacy_id": "aaaaaaaa-0001-0001-0001-000000000001"}]},
+        )
+
+    def test_rejects_empty_batch(self, write_client):
+        resp = write_client.post("/api/pharmacies/verify-batch", json={"items": []})
+        assert resp.status_code == 422
+
+    def test_rejects_oversized_batch(self, write_client):
+        from agent_05_platform_api.src.models import MAX_BATCH_VERIFY
+
+        items = [
+            {**_VERIFY_BODY, "pharmacy_id": f"aaaaaaaa-0001-0001-0001-{i:012d}"}
+            for i in range(MAX_BATCH_VERIFY + 1)
+        ]
+        resp = write_client.post("/api/pharmacies/verify-batch", json={"items": items})
+        assert resp.status_code == 422
+
+    def test_item_requires_pharmacy_id(self, write_client):
+        resp = write_client.post("/api/pharmacies/verify-batch", json={"items": [_VERIFY_BODY]})
+        assert resp.status_code == 422
+
+
+_PID_1 = "aaaaaaaa-0001-0001-0001-000000000001"
+_PID_2 = "aaaaaaaa-0001-0001-0001-000000000002"
+_PID_3 = "aaaaaaaa-0001-0001-0001-000000000003"
+_PID_UNKNOWN = "bbbbbbbb-0000-0000-0000-000000000000"
+
+
+def _batch_db(levels: dict[str, str], fail_on: str | None = None) -> FakeCursor:
+    """Cursor over pharmacies at the given levels; raises on SQL containing ``fail_on``."""
+
+    def respond(sql, params):
+        if fail_on and fail_on in sql:
+            raise RuntimeError("connection reset")
+        if "FROM pharmacy_locations" in sql:
+            return [{"id": pid, "level": levels[pid]} for pid in params[0] if pid in levels]
+        if "record_validation_change" in sql:
+            return [{"history_id": f"hist-{pid}"} for pid in params[0]]
+        return []
+
+    return FakeCursor(respond)
+
+
+class TestVerifyBatchLogic:
+    """POST /api/pharmacies/verify-batch against a scripted database."""
+
+    def _post(self, write_client, cur, *items):
+        with fake_db(cur):
+            return write_client.post(
+                "/api/pharmacies/verify-batch",
+                json={"items": [{**_VERIFY_BODY, "pharmacy_id": pid} for pid in items]},
+            )
+
+    @staticmethod
+    def _written(cur) -> list[str]:
+        (_, params), = cur.statements("record_validation_change")
+        return params[0]
+
+    def test_writes_are_set_based(self, write_client):
+        cur = _batch_db({_PID_1: "L0_mapped", _PID_2: "L0_mapped"})
+        resp = self._post(write_client, cur, _PID_1, _PID_2)
+        body = resp.json()
+        assert resp.status_code == 200
+        assert (body["succeeded"], body["failed"]) == (2, 0)
+        assert [r["history_id"] for r in body["results"]] == [f"hist-{_PID_1}", f"hist-{_PID_2}"]
+        # one lookup and three writes, whatever the batch size, in one transaction
+        assert len(cur.statements("FROM pharmacy_locations")) == 1
+        assert self._written(cur) == [_PID_1, _PID_2]
+        (_, prov), = cur.statements("log_provenance")
+        assert prov[0] == [_PID_1, _PID_2]
+        assert prov[4] == [f"hist-{_PID_1}", f"hist-{_PID_2}"]
+        (_, audit), = cur.statements("log_audit")
+        assert audit[3] == [_PID_1, _PID_2]
+        assert len(cur.executed) == 4
+        assert (cur.commits, cur.rollbacks) == (1, 0)
+
+    def test_duplicate_ids_rejected_after_first(self, write_client):
+        cur = _batch_db({_PID_1: "L0_mapped"})
+        resp = self._post(write_client, cur, _PID_1, _PID_1.upper())
+        first, dup = resp.json()["results"]
+        assert first["success"] is True
+        assert (dup["success"], dup["status_code"]) == (False, 400)
+        assert "Duplicate" in dup["detail"]
+        assert self._written(cur) == [_PID_1]
+
+    def test_one_failure_does_not_block_the_rest(self, write_client):
+        cur = _batch_db({_PID_1: "L0_mapped", _PID_2: "L0_mapped", _PID_3: "L0_mapped"})
+        with fake_db(cur):
+            resp = write_client.post(
+                "/api/pharmacies/verify-batch",
+                json={"items": [
+                    {**_VERIFY_BODY, "pharmacy_id": _PID_1},
+                    {**_VERIFY_BODY, "pharmacy_id": _PID_2, "evidence_type": "field_visit"},
+                    {**_VERIFY_BODY, "pharmacy_id": _PID_3},
+                ]},
+            )
+        body = resp.json()
+        assert (body["total"], body["succeeded"], body["failed"]) == (3, 2, 1)
+        assert [r["success"] for r in body["results"]] == [True, False, True]
+        assert body["results"][1]["status_code"] == 400
+        assert self._written(cur) == [_PID_1, _PID_3]
+
+    def test_unknown_pharmacy_reported_404(self, write_client):
+        cur = _batch_db({_PID_1: "L0_mapped"})
+        resp = self._post(write_client, cur, _PID_UNKNOWN, _PID_1)
+        missing, ok = resp.json()["results"]
+        assert (missing["success"], missing["status_code"]) == (False, 404)
+        assert ok["success"] is True
+        assert self._written(cur) == [_PID_1]
+
+    def test_malformed_uuid_never_reaches_the_database(self, write_client):
+        cur = _batch_db({_PID_1: "L0_mapped"})
+        resp = self._post(write_client, cur, "not-a-uuid", _PID_1)
+        bad, ok = resp.json()["results"]
+        assert (bad["success"], bad["status_code"]) == (False, 404)
+        assert ok["success"] is True
+        (_, lookup), = cur.statements("FROM pharmacy_locations")
+        assert lookup[0] == [_PID_1]
+
+    def test_invalid_transition_reported_400(self, write_client):
+        cur = _batch_db({_PID_1: "L1_contact_confirmed", _PID_2: "L0_mapped"})
+        resp = self._post(write_client, cur, _PID_1, _PID_2)
+        skipped, ok = resp.json()["results"]
+        assert (skipped["success"], skipped["status_code"]) == (False, 400)
+        assert "Invalid transition" in skipped["detail"]
+        assert ok["success"] is True
+        assert self._written(cur) == [_PID_2]
+
+    def test_nothing_written_when_every_item_fails(self, write_client):
+        cur = _batch_db({_PID_1: "L1_contact_confirmed"})
+        resp = self._post(write_client, cur, _PID_1, _PID_UNKNOWN)
+        assert resp.json()["succeeded"] == 0
+        assert cur.statements("record_validation_change") == []
+
+    def test_database_error_rolls_back_whole_batch(self, write_client):
+        cur = _batch_db({_PID_1: "L0_mapped", _PID_2: "L0_mapped"}, fail_on="log_audit")
+        resp = self._post(write_client, cur, _PID_1, _PID_2)
+        assert resp.status_code == 500
+        assert (cur.commits, cur.rollbacks) == (0, 1)
+
 
 class TestValidationHistory:
     """GET /api/pharmacies/{id}/validation-history — requires DB + registry_read."""
@@ -29,8 +222,8 @@ class TestValidationHistory:
         )
         assert resp.status_code == 401
 
-    def test_requires_db(self, read_client):
-        resp = read_client.get(
+    def test_requires_db(self, read_503):
+        resp = read_503(
             "/api/pharmacies/aaaaaaaa-0001-0001-0001-000000000001/validation-history"
         )
         assert resp.status_code == 503
@@ -59,6 +252,93 @@ class TestValidationSummary:
             assert "percentage" in lv
             assert 0 <= lv["percentage"] <= 100
 
+    def test_cache_headers(self, client):
+        resp = client.get("/api/validation/summary")
+        assert resp.headers["cache-control"] == "public, max-age=30, stale-while-revalidate=60"
+        assert resp.headers["etag"].startswith('"')
+
+    def test_conditional_get_returns_304(self, client):
+        etag = client.get("/api/validation/summary").headers["etag"]
+        resp = client.get("/api/validation/summary", headers={"If-None-Match": etag})
+        assert resp.status_code == 304
+        assert resp.content == b""
+        assert resp.headers["etag"] == etag
+
+    def test_etag_changes_after_invalidation(self, client):
+        from agent_05_platform_api.src import helpers, response_cache
+
+        etag = client.get("/api/validation/summary").headers["etag"]
+        helpers._RECORDS = helpers._RECORDS[:2]
+        response_cache.invalidate()
+        resp = client.get("/api/validation/summary", headers={"If-None-Match": etag})
+        assert resp.status_code == 200
+        assert resp.json()["total"] == 2
+
+    def test_last_modified_sent_with_etag(self, client):
+        resp = client.get("/api/validation/summary")
+        assert resp.headers["last-modified"].endswith(" GMT")
+        again = client.get("/api/validation/summary", headers={"If-None-Match": resp.headers["etag"]})
+        assert again.status_code == 304
+        assert again.headers["last-modified"] == resp.headers["last-modified"]
+
+
+def _expire_cache(seconds_past_ttl: float):
+    """Make every cached entry look ``seconds_past_ttl`` past CACHE_TTL."""
+    from agent_05_platform_api.src import response_cache
+
+    later = time.time() + response_cache.CACHE_TTL + seconds_past_ttl
+    return patch.object(response_cache, "time", **{"time.return_value": later})
+
+
+def _failing_db(sql, params):
+    raise RuntimeError("connection refused")
+
+
+class TestValidationStaleOnError:
+    """An expired dashboard body is served when recomputing it fails."""
+
+    @pytest.mark.parametrize("path", ["/api/validation/summary", "/api/validation/progress"])
+    def test_db_failure_serves_expired_body(self, client, path):
+        first = client.get(path)
+        with _expire_cache(1), fake_db(FakeCursor(_failing_db)):
+            resp = client.get(path)
+        assert resp.status_code == 200
+        assert resp.content == first.content
+        assert resp.headers["etag"] == first.headers["etag"]
+
+    def test_handler_error_serves_expired_body(self, client):
+        first = client.get("/api/validation/summary")
+        with _expire_cache(1), patch(
+            "agent_05_platform_api.src.routes.verification.get_records",
+            side_effect=RuntimeError("boom"),
+        ):
+            resp = client.get("/api/validation/summary")
+        assert resp.status_code == 200
+        assert resp.json() == first.json()
+
+    def test_db_failure_without_cached_body_falls_back_to_json(self, client):
+        with fake_db(FakeCursor(_failing_db)):
+            resp = client.get("/api/validation/summary")
+        assert resp.status_code == 200
+        assert resp.json()["mode"] == "json_fallback"
+
+    def test_entry_past_stale_window_is_recomputed(self, client):
+        from agent_05_platform_api.src import response_cache
+
+        client.get("/api/validation/summary")
+        with _expire_cache(response_cache.STALE_TTL + 1), fake_db(FakeCursor(_failing_db)):
+            resp = client.get("/api/validation/summary")
+        assert resp.json()["mode"] == "json_fallback"
+
+    def test_invalidated_body_is_not_served_stale(self, client):
+        from agent_05_platform_api.src import response_cache
+
+        client.get("/api/validation/summary")
+        response_cache.invalidate()
+        with fake_db(FakeCursor(_failing_db)):
+            resp = client.get("/api/validation/summary")
+        assert resp.json()["mode"] == "json_fallback"
+
 
 class TestValidationLadderRules:
     """Unit tests for validation business rules (tested via helpers/constants)."""
@@ -128,34 +408,21 @@ class TestExpiryReport:
         resp = client.get("/api/validation/expiry-report")
         assert resp.status_code == 401
 
-    def test_returns_503_without_db(self, read_client):
-        resp = read_client.get("/api/validation/expiry-report")
+    def test_returns_503_without_db(self, read_503):
+        resp = read_503("/api/validation/expiry-report")
         assert resp.status_code == 503
 
 
 class TestDowngradeEndpoint:
     """POST /api/pharmacies/{id}/downgrade — requires admin + DB."""
 
-    def test_requires_auth(self, client):
-        resp = client.post(
-            "/api/pharmacies/aaaaaaaa-0001-0001-0001-000000000001/downgrade",
+    @pytest.mark.parametrize("client_fixture,expected", ADMIN_AUTH_MATRIX)
+    def test_auth_matrix(self, request, client_fixture, expected):
+        assert_auth_matrix(
+            request, client_fixture, expected,
+            "POST", "/api/pharmacies/aaaaaaaa-0001-0001-0001-000000000001/downgrade",
             json={"reason": "Re-verification expired"},
         )
-        assert resp.status_code == 401
-
-    def test_requires_admin(self, read_client):
-        resp = read_client.post(
-            "/api/pharmacies/aaaaaaaa-0001-0001-0001-000000000001/downgrade",
-            json={"reason": "Re-verification expired"},
-        )
-        assert resp.status_code == 403
-
-    def test_returns_503_without_db(self, admin_client):
-        resp = admin_client.post(
-            "/api/pharmacies/aaaaaaaa-0001-0001-0001-000000000001/downgrade",
-            json={"reason": "Re-verification expired"},
-        )
-        assert resp.status_code == 503
 
 
 class TestDowngradeMap:
@@ -2,10 +2,12 @@
 
 import os
 import tempfile
+from unittest.mock import patch
 
 import pytest
 import yaml
 
+from agent_03_deduplication.algorithms import composite_scorer
 from agent_03_deduplication.algorithms.composite_scorer import (
     MatchResult,
     ScorerConfig,
@@ -41,6 +43,11 @@ class TestNormalizePhone:
         result = normalize_phone("12345")
         assert result == "12345"
 
+    def test_wrong_prefix_kept_whole(self):
+        """11 digits without a leading 0 is not a Nigerian local number."""
+        assert normalize_phone("18031234567") == "18031234567"
+        assert normalize_phone("+44 803 123 4567 8") == "4480312345678"
+
 
 # ---- phone_match_score ------------------------------------------------------
 
@@ -117,7 +124,7 @@ class TestScorerConfig:
             "boosts": {"same_lga": 0.10},
         }
         with tempfile.NamedTemporaryFile(mode="w", suffix=".yaml", delete=False) as f:
-            yaml.dump(data, f)
+            yaml.safe_dump(data, f)
             path = f.name
 
         try:
@@ -131,6 +138,26 @@ class TestScorerConfig:
         finally:
             os.unlink(path)
 
+    def test_from_yaml_memoized_until_file_changes(self):
+        with tempfile.NamedTemporaryFile(mode="w", suffix=".yaml", delete=False) as f:
+            yaml.safe_dump({"boosts": {"same_lga": 0.10}}, f)
+            path = f.name
+
+        try:
+            with patch.object(yaml, "load", wraps=yaml.load) as spy:
+                first = ScorerConfig.from_yaml(path)
+                second = ScorerConfig.from_yaml(path)
+                assert spy.call_count == 1
+                assert first == second and first is not second
+
+                with open(path, "w") as f:
+                    yaml.safe_dump({"boosts": {"same_lga": 0.25}}, f)
+                os.utime(path, ns=(0, os.stat(path).st_mtime_ns + 1_000_000))
+                assert ScorerConfig.from_yaml(path).same_lga_boost == 0.25
+                assert spy.call_count == 2
+        finally:
+            os.unlink(path)
+
     def test_from_project_yaml(self):
         """The actual merge_rules.yaml in the repo should load correctly."""
         config_path = os.path.join(
@@ -201,6 +228,13 @@ class TestComputeMatch:
         assert result.decision == "auto_merge"
         assert "regulator_id_match" in (result.override_reason or "")
 
+    def test_regulator_override_lists_matching_types_sorted(self):
+        ids = {"pcn_registration": "PCN/123", "nafdac_license": "A1-0001", "other": "x"}
+        a = _rec(pid="A", ext_ids=ids)
+        b = _rec(pid="B", ext_ids={k: f" {v.lower()} " for k, v in ids.items()})
+        result = compute_match(a, b)
+        assert result.override_reason == "regulator_id_match:nafdac_license,pcn_registration"
+
     def test_conflicting_external_ids_override(self):
         a = _rec(pid="A", ext_ids={"pcn_registration": "PCN/111"})
         b = _rec(pid="B", ext_ids={"pcn_registration": "PCN/999"})
@@ -254,6 +288,10 @@ class TestComputeMatch:
         result = compute_match(a, b)
         assert result.lga_boost_applied is False
 
+    def test_result_is_slotted(self):
+        result = compute_match(_rec(pid="A"), _rec(pid="B"))
+        assert not hasattr(result, "__dict__")
+
     def test_result_to_dict(self):
         a = _rec(pid="A")
         b = _rec(pid="B")
@@ -279,3 +317,52 @@ class TestScoreCandidatePairs:
 
     def test_empty_pairs(self):
         assert score_candidate_pairs([]) == []
+
+    def test_matches_per_pair_compute_match(self):
+        lagos = _rec(pid="A", name="Greenlife")
+        pairs = [
+            (lagos, _rec(pid="B", name="Greenlife")),
+            (lagos, _rec(pid="C", name="Greenlife", state="Kano")),
+            (lagos, _rec(pid="D", name="Zeta", lat=None, lon=None)),
+        ]
+        expected = sorted(
+            (compute_match(a, b) for a, b in pairs),
+            key=lambda r: r.match_confidence,
+            reverse=True,
+        )
+        assert score_candidate_pairs(pairs) == expected
+        blocked = [r for r in expected if r.record_b_id == "C"]
+        assert blocked[0].override_reason == "different_state_blocked"
+
+    def test_reused_object_id_does_not_reuse_prep(self):
+        """An id-less record freed mid-batch can hand its id to another; the cache must notice."""
+        pairs = [
+            (_rec(pid=None, name="Greenlife"), _rec(pid=None, name="Greenlife")),
+            (_rec(pid=None, name="Zeta Chemist"), _rec(pid=None, name="Zeta Chemist")),
+        ]
+        # every record reports the same id, as a recycled address would
+        with patch.object(composite_scorer, "id", create=True, new=lambda obj: 0):
+            results = score_candidate_pairs(pairs)
+        assert all(r.name_score == 1.0 for r in results)
+
+    def test_copies_sharing_pharmacy_id_prepared_once(self):
+        hub = _rec(pid="A", name="Greenlife")
+        pairs = [(dict(hub), _rec(pid=str(i), name="Greenlife")) for i in range(5)]
+        with patch.object(composite_scorer, "prepare_record", wraps=composite_scorer.prepare_record) as spy:
+            score_candidate_pairs(pairs)
+        assert spy.call_count == 6
+
+    def test_cross_state_pair_is_never_prepared(self):
+        pairs = [(_rec(pid="A", state="Lagos"), _rec(pid="B", state="Kano"))]
+        with patch.object(composite_scorer, "prepare_record", wraps=composite_scorer.prepare_record) as spy:
+            results = score_candidate_pairs(pairs)
+        assert spy.call_count == 0
+        assert results[0].decision == "no_match"
+        assert results[0].match_confidence == 0.0
+
+    def test_each_record_prepared_once(self):
+        hub = _rec(pid="A", name="Greenlife")
+        others = [_rec(pid=str(i), name="Greenlife") for i in range(5)]
+        with patch.object(composite_scorer, "prepare_record", wraps=composite_scorer.prepare_record) as spy:
+            score_candidate_pairs([(hub, other) for other in others])
+        assert spy.call_count == 6
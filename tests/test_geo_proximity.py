@@ -1,16 +1,20 @@
 """Tests for agent-03-deduplication — geospatial proximity module."""
 
 import math
+import random
 
 import pytest
 
 from agent_03_deduplication.algorithms.geo_proximity import (
     Coordinate,
     bounding_box_filter,
+    build_geo_index,
     compute_geo_proximity,
     find_nearby_candidates,
+    find_nearby_candidates_indexed,
     geo_proximity_score,
     haversine_km,
+    haversine_km_batch,
 )
 
 
@@ -38,6 +42,10 @@ class TestCoordinate:
         with pytest.raises(AttributeError):
             coord.latitude = 7.0  # type: ignore[misc]
 
+    def test_unpacks_as_lat_lon(self):
+        lat, lon = Coordinate(latitude=6.0, longitude=3.0)
+        assert (lat, lon) == (6.0, 3.0)
+
 
 # ---- haversine_km -----------------------------------------------------------
 
@@ -66,6 +74,30 @@ class TestHaversineKm:
         b = Coordinate(9.06, 7.49)
         assert haversine_km(a, b) == pytest.approx(haversine_km(b, a))
 
+    def test_small_separation_matches_full_formula(self):
+        """The equirectangular shortcut stays within a millimetre of Haversine."""
+        a = Coordinate(6.4281, 3.4219)
+        b = Coordinate(6.4681, 3.4619)
+        lat1, lat2 = math.radians(a.latitude), math.radians(b.latitude)
+        dlat = lat2 - lat1
+        dlon = math.radians(b.longitude - a.longitude)
+        h = math.sin(dlat / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin(dlon / 2) ** 2
+        full = 2 * 6371.0 * math.asin(math.sqrt(h))
+        assert haversine_km(a, b) == pytest.approx(full, abs=1e-6)
+
+
+class TestHaversineKmBatch:
+    def test_matches_scalar(self):
+        target = Coordinate(6.45, 3.40)
+        points = [(6.45, 3.40), (6.4510, 3.4205), (9.06, 7.49), (12.0, 8.5)]
+        lats = [p[0] for p in points]
+        lons = [p[1] for p in points]
+        expected = [haversine_km(target, Coordinate(lat, lon)) for lat, lon in points]
+        assert haversine_km_batch(target, lats, lons) == expected
+
+    def test_empty(self):
+        assert haversine_km_batch(Coordinate(6.45, 3.40), [], []) == []
+
 
 # ---- geo_proximity_score ----------------------------------------------------
 
@@ -201,3 +233,29 @@ class TestFindNearbyCandidates:
     def test_empty_candidates(self):
         target = Coordinate(6.45, 3.42)
         assert find_nearby_candidates(target, []) == []
+
+
+# ---- find_nearby_candidates_indexed -----------------------------------------
+
+
+class TestFindNearbyCandidatesIndexed:
+    def test_matches_linear_scan(self):
+        rng = random.Random(42)
+        candidates = [
+            {
+                "pharmacy_id": str(i),
+                "latitude": 6.45 + rng.uniform(-0.05, 0.05),
+                "longitude": 3.42 + rng.uniform(-0.05, 0.05),
+            }
+            for i in range(300)
+        ]
+        candidates.append({"pharmacy_id": "no-geo", "latitude": None, "longitude": 3.42})
+        index = build_geo_index(candidates)
+        for target in (Coordinate(6.45, 3.42), Coordinate(6.49, 3.38), Coordinate(9.06, 7.49)):
+            for radius in (0.5, 2.0, 5.0):
+                assert find_nearby_candidates_indexed(target, index, radius) == (
+                    find_nearby_candidates(target, candidates, radius)
+                )
+
+    def test_empty_index(self):
+        assert find_nearby_candidates_indexed(Coordinate(6.45, 3.42), build_geo_index([])) == []
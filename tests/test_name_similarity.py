@@ -1,10 +1,16 @@
 """Tests for agent-03-deduplication — name similarity module."""
 
+from unittest.mock import patch
+
 import pytest
 
+from agent_03_deduplication.algorithms import name_similarity
 from agent_03_deduplication.algorithms.name_similarity import (
     compute_name_similarity,
+    compute_name_similarity_matrix,
+    group_similar_names,
     levenshtein_similarity,
+    make_name_scorer,
     names_are_similar,
     normalize_name,
     quick_name_score,
@@ -48,6 +54,18 @@ class TestNormalizeName:
         # "medical" is stripped as a facility word, leaving "cafe"
         assert result == "cafe"
 
+    def test_memoized_on_raw_name(self):
+        normalize_name.cache_clear()
+        normalize_name("Emeka Pharmacy Ltd")
+        normalize_name("Emeka Pharmacy Ltd")
+        info = normalize_name.cache_info()
+        assert (info.hits, info.misses) == (1, 1)
+
+    def test_strips_accents_outside_latin1_table(self):
+        # Yoruba dot-below vowels fall outside _ACCENT_MAP and take the NFKD path
+        assert normalize_name("Ọlá Ẹniọlá Stores") == "ola eniola"
+        assert normalize_name("Àárẹ̀ Ñdá") == "aare nda"
+
     def test_strips_punctuation(self):
         # Apostrophe is stripped; "& sons" is stripped as a unit but
         # standalone "sons" survives since the regex matches "\b&\s*sons?\b"
@@ -168,16 +186,78 @@ class TestComputeNameSimilarity:
         )
         assert result["composite"] == result["levenshtein"]
 
+    def test_zero_weight_components_are_skipped(self):
+        with (
+            patch.object(name_similarity, "token_sort_similarity") as tsort,
+            patch.object(name_similarity, "token_set_similarity") as tset,
+        ):
+            result = compute_name_similarity(
+                "Emeka Pharmacy",
+                "Emeka Chemist",
+                levenshtein_weight=1.0,
+                token_sort_weight=0.0,
+                token_set_weight=0.0,
+            )
+        tsort.assert_not_called()
+        tset.assert_not_called()
+        assert result["token_sort"] == result["token_set"] == 0.0
+        assert result["composite"] == result["levenshtein"]
+
+    def test_identical_names_skip_rapidfuzz(self):
+        with (
+            patch.object(name_similarity, "fuzz") as fuzz,
+            patch.object(name_similarity, "Levenshtein") as lev,
+        ):
+            result = compute_name_similarity("Goodwill Pharmacy", "GOODWILL Chemist")
+        fuzz.token_sort_ratio.assert_not_called()
+        fuzz.token_set_ratio.assert_not_called()
+        lev.normalized_similarity.assert_not_called()
+        assert result["composite"] == 1.0
+
     def test_scores_are_bounded(self):
         result = compute_name_similarity("any name", "another name")
         for key in ("levenshtein", "token_sort", "token_set", "composite"):
             assert 0.0 <= result[key] <= 1.0
 
 
+class TestComputeNameSimilarityMatrix:
+    def test_matches_pairwise_composite(self):
+        names_a = ["Emeka Pharmacy", "Goodwill Chemist Ltd", "EMEKA pharmacy"]
+        names_b = ["Emeka Chemist", "Goodwill Pharmacy", ""]
+        matrix = compute_name_similarity_matrix(names_a, names_b)
+        assert matrix == [
+            [compute_name_similarity(a, b)["composite"] for b in names_b]
+            for a in names_a
+        ]
+
+    def test_shape_and_row_independence(self):
+        matrix = compute_name_similarity_matrix(["Emeka", "Emeka"], ["Emeka", "Bello"])
+        assert len(matrix) == 2 and all(len(row) == 2 for row in matrix)
+        matrix[0][0] = -1.0
+        assert matrix[1][0] == 1.0
+
+    def test_empty_inputs(self):
+        assert compute_name_similarity_matrix([], ["Emeka"]) == []
+        assert compute_name_similarity_matrix(["Emeka"], []) == [[]]
+
+
 # ---- convenience helpers ----------------------------------------------------
 
 
 class TestConvenienceHelpers:
+    def test_make_name_scorer_matches_composite(self):
+        weights = {"levenshtein_weight": 0.5, "token_sort_weight": 0.0, "token_set_weight": 0.5}
+        score = make_name_scorer(**weights)
+        pairs = [
+            ("Emeka Pharmacy", "Emeka Chemist"),
+            ("Goodwill Pharmacy Ikeja", "Goodwill"),
+            ("Adekunle Pharmacy", "Zainab Medical Store"),
+            ("", "Emeka"),
+        ]
+        for a, b in pairs:
+            assert score(a, b) == compute_name_similarity(a, b, **weights)["composite"]
+            assert quick_name_score(a, b) == compute_name_similarity(a, b)["composite"]
+
     def test_quick_name_score_returns_float(self):
         score = quick_name_score("Emeka Pharmacy", "Emeka Chemist")
         assert isinstance(score, float)
@@ -194,3 +274,50 @@ class TestConvenienceHelpers:
         assert not names_are_similar("Alpha", "Beta", threshold=0.99)
         # Very loose threshold
         assert names_are_similar("Goodwill", "Goodwill Ikeja", threshold=0.5)
+
+    def test_length_gap_rejects_without_scoring(self):
+        with patch.object(
+            name_similarity, "compute_normalized_name_similarity",
+            wraps=name_similarity.compute_normalized_name_similarity,
+        ) as spy:
+            assert not names_are_similar("Ade", "Adebayo Oluwaseun Memorial", threshold=0.7)
+        spy.assert_not_called()
+
+    def test_length_bound_agrees_with_full_score(self):
+        names = ["Ade", "Adebayo", "Ade Ikeja", "Goodwill", "Goodwill Ikeja Branch", "Zeta", ""]
+        for a in names:
+            for b in names:
+                for threshold in (0.3, 0.5, 0.7, 0.9):
+                    assert names_are_similar(a, b, threshold) == (quick_name_score(a, b) >= threshold)
+
+
+# ---- group_similar_names ----------------------------------------------------
+
+
+class TestGroupSimilarNames:
+    def test_labels_by_first_appearance(self):
+        names = [
+            "Goodwill Pharmacy Ikeja",
+            "Zainab Medical Store Kano",
+            "Goodwill Chemist Ikeja",
+            "GOODWILL PHARMACY IKEJA",
+        ]
+        assert group_similar_names(names) == [0, 1, 0, 0]
+
+    def test_grouping_is_transitive(self):
+        a, b, c = "Adebayo Ola", "Adebayo Olawale", "Adebayo Olawale Okon"
+        assert names_are_similar(a, b, threshold=0.8)
+        assert names_are_similar(b, c, threshold=0.8)
+        assert not names_are_similar(a, c, threshold=0.8)
+        assert group_similar_names([a, c, b], threshold=0.8) == [0, 0, 0]
+
+    def test_matches_pairwise_when_no_chains(self):
+        names = ["Emeka Pharmacy", "Emeka Chemist", "Bello Stores", "Zainab", ""]
+        labels = group_similar_names(names)
+        for i, a in enumerate(names):
+            for j, b in enumerate(names):
+                assert (labels[i] == labels[j]) == names_are_similar(a, b)
+
+    def test_empty(self):
+        assert group_similar_names([]) == []
+